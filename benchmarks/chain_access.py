@@ -0,0 +1,61 @@
+"""
+    chain_access
+    ~~~~~~~~~~~~
+
+    Benchmark that compares finding the root, leaf and depth of a chain from one of its nodes by following
+    `parent`/`child` links to reading them from the :class:`~pai_lang.syntax.Chain` of a
+    :class:`~pai_lang.syntax.ChainNode`.
+
+    Usage: python benchmarks/chain_access.py [--depth N] [--lookups N]
+"""
+
+import argparse
+import time
+
+from pai_lang import parser
+
+
+def walk(node):
+    """
+    Find the root, leaf and number of nodes of the chain of the given node by following its links.
+    """
+    root = node
+    depth = 1
+    while not root.is_root:
+        root = root.parent
+        depth += 1
+    leaf = node
+    while leaf.child is not None:
+        leaf = leaf.child
+        depth += 1
+    return root, leaf, depth
+
+
+def lookup(node):
+    """
+    Find the root, leaf and number of nodes of the chain of the given node from its chain.
+    """
+    chain = node.chain
+    return chain.root, chain.leaf, len(chain)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Compare link walking to chain lookups of root, leaf and depth.')
+    arg_parser.add_argument('--depth', type=int, default=16, help='number of nodes per chain')
+    arg_parser.add_argument('--lookups', type=int, default=200000, help='number of lookups per run')
+    args = arg_parser.parse_args()
+
+    data = ':'.join(['workspace', 'any'] * (args.depth - 1) + ['user', 'email', 'foo@bar.com'])
+    chain = parser.parse_chain(data)
+    nodes = [chain[i % len(chain)] for i in range(args.lookups)]
+
+    for name, function in (('walk links', walk), ('chain', lookup)):
+        start = time.perf_counter()
+        for node in nodes:
+            function(node)
+        elapsed = (time.perf_counter() - start) / len(nodes) * 1e9
+        print('{:>12} {:>8.1f} ns/lookup'.format(name, elapsed))
+
+
+if __name__ == '__main__':
+    main()
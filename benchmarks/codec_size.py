@@ -0,0 +1,62 @@
+"""
+    codec_size
+    ~~~~~~~~~~
+
+    Benchmark that compares the size and speed of :mod:`~pai_lang.codec` with pickle and JSON.
+
+    Usage: python benchmarks/codec_size.py [--count N]
+"""
+
+import argparse
+import json
+import pickle
+import time
+
+from pai_lang import codec, parser, syntax
+
+
+DEFAULT_COUNT = 100000
+
+EXPRESSIONS = [
+    'user:email:foo{}@bar.com',
+    'workspace:any:user:email:foo{}@bar.com',
+    'settings:any:workspace:any:user:email:foo{}@bar.com'
+]
+
+
+def timed(func, *args):
+    """
+    Call `func` with the given arguments and return its result and the elapsed seconds.
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Compare codec size and speed with pickle and JSON.')
+    arg_parser.add_argument('--count', type=int, default=DEFAULT_COUNT, help='number of chains to encode')
+    args = arg_parser.parse_args()
+
+    # Properties repeat every 1000 chains to resemble real traffic.
+    chains = parser.parse_many(EXPRESSIONS[i % len(EXPRESSIONS)].format(i % 1000) for i in range(args.count))
+    packed = [syntax.pack(nodes) for nodes in chains]
+
+    formats = [
+        ('codec', lambda: codec.dumps(packed), codec.loads),
+        ('pickle (nodes)', lambda: pickle.dumps(chains, pickle.HIGHEST_PROTOCOL), pickle.loads),
+        ('pickle (packed)', lambda: pickle.dumps(packed, pickle.HIGHEST_PROTOCOL),
+         lambda data: [syntax.unpack(chain) for chain in pickle.loads(data)]),
+        ('json (packed)', lambda: json.dumps(packed).encode('utf-8'),
+         lambda data: [syntax.unpack(chain) for chain in json.loads(data.decode('utf-8'))])
+    ]
+
+    print('{:<16} {:>12} {:>12} {:>12}'.format('format', 'bytes', 'dumps (s)', 'loads (s)'))
+    for name, dumps, loads in formats:
+        data, dumps_elapsed = timed(dumps)
+        _, loads_elapsed = timed(loads, data)
+        print('{:<16} {:>12} {:>12.3f} {:>12.3f}'.format(name, len(data), dumps_elapsed, loads_elapsed))
+
+
+if __name__ == '__main__':
+    main()
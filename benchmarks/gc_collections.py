@@ -0,0 +1,66 @@
+"""
+    gc_collections
+    ~~~~~~~~~~~~~~
+
+    Benchmark that measures garbage collections triggered per million parses for cyclic and acyclic node chains.
+
+    Usage: python benchmarks/gc_collections.py [--count N]
+"""
+
+import argparse
+import gc
+import time
+
+from pai_lang import parser, syntax
+
+
+DEFAULT_COUNT = 1000000
+
+EXPRESSIONS = [
+    'user:email:foo{}@bar.com',
+    'workspace:any:user:email:foo{}@bar.com',
+    'settings:any:workspace:any:user:email:foo{}@bar.com'
+]
+
+
+def measure(cls, count):
+    """
+    Parse `count` data strings, discarding each chain, and return the collections run per generation.
+
+    :param cls: Type of node to create
+    :param count: Number of data strings to parse
+    :return: A :class:`~tuple` of elapsed seconds and collections per generation, scaled to one million parses
+    """
+    data = [EXPRESSIONS[i % len(EXPRESSIONS)].format(i) for i in range(300)]
+    rounds = max(count // len(data), 1)
+    parse = parser.parse
+
+    gc.collect()
+    before = [stats['collections'] for stats in gc.get_stats()]
+    start = time.perf_counter()
+
+    for _ in range(rounds):
+        for item in data:
+            parse(item, cls)
+
+    elapsed = time.perf_counter() - start
+    after = [stats['collections'] for stats in gc.get_stats()]
+
+    scale = DEFAULT_COUNT / (rounds * len(data))
+    return elapsed * scale, [(b - a) * scale for a, b in zip(before, after)]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Measure garbage collections per million parses.')
+    arg_parser.add_argument('--count', type=int, default=DEFAULT_COUNT, help='number of data strings to parse')
+    args = arg_parser.parse_args()
+
+    print('{:<12} {:>10} {:>10} {:>10} {:>10}'.format('node', 'seconds', 'gen0', 'gen1', 'gen2'))
+    print('{:<12} {:>10} {:>10} {:>10} {:>10}'.format('', '(per 1M)', '(per 1M)', '(per 1M)', '(per 1M)'))
+    for cls in (syntax.Node, syntax.AcyclicNode):
+        elapsed, collections = measure(cls, args.count)
+        print('{:<12} {:>10.3f} {:>10.0f} {:>10.0f} {:>10.0f}'.format(cls.__name__, elapsed, *collections))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+    incremental_depth
+    ~~~~~~~~~~~~~~~~~
+
+    Benchmark that compares building a chain one hop at a time by re-parsing the whole data string after each
+    prefix to extending the last node with :func:`~pai_lang.parser.extend_gen`.
+
+    Usage: python benchmarks/incremental_depth.py [--max-depth N] [--repeat N]
+"""
+
+import argparse
+import time
+
+from pai_lang import parser
+
+
+def build_reparse(depth):
+    """
+    Prefix one hop at a time and parse the whole data string after each.
+    """
+    data = 'user:email:foo@bar.com'
+    nodes = parser.parse(data)
+    for i in range(depth):
+        data = 'node{}:any:{}'.format(i, data)
+        nodes = parser.parse(data)
+    return nodes
+
+
+def build_incremental(depth):
+    """
+    Prefix one hop at a time and only parse the new hop.
+    """
+    leaf = parser.parse('user:email:foo@bar.com')[-1]
+    for i in range(depth):
+        leaf, = parser.extend_gen(leaf, 'node{}:any'.format(i))
+    return leaf
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Compare re-parsing and incremental chain building.')
+    arg_parser.add_argument('--max-depth', type=int, default=512, help='deepest chain built')
+    arg_parser.add_argument('--repeat', type=int, default=20, help='number of chains built per depth')
+    args = arg_parser.parse_args()
+
+    print('{:>8} {:>14} {:>16}'.format('depth', 'reparse (ms)', 'incremental (ms)'))
+    depth = 8
+    while depth <= args.max_depth:
+        timings = []
+        for build in (build_reparse, build_incremental):
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                build(depth)
+            timings.append((time.perf_counter() - start) / args.repeat * 1e3)
+        print('{:>8} {:>14.3f} {:>16.3f}'.format(depth, *timings))
+        depth *= 4
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+    instrument_overhead
+    ~~~~~~~~~~~~~~~~~~~
+
+    Benchmark that measures the cost of the instrumentation hooks in :func:`~pai_lang.parser.parse` and
+    :func:`~pai_lang.parser.parse_many`. The disabled cost is relative to calling the pipeline without the hook and
+    the enabled cost is relative to the same function while disabled.
+
+    Usage: python benchmarks/instrument_overhead.py [--items N] [--repeat N]
+"""
+
+import argparse
+import random
+import time
+
+from pai_lang import instrument, parser, syntax
+
+
+def random_item(rng):
+    """
+    Create a data string of one to four nodes.
+    """
+    tokens = ['user', 'email', 'user{}@example.com'.format(rng.randint(0, 100000))]
+    for _ in range(rng.randint(0, 3)):
+        tokens = ['workspace', 'any'] + tokens
+    return ':'.join(tokens)
+
+
+def parse_unhooked(items):
+    """
+    Parse each item with the pipeline :func:`~pai_lang.parser.parse` calls, without its instrumentation check.
+    """
+    supports_fast_path, fast_parse, cls = parser._supports_fast_path, parser._fast_parse, syntax.Node
+    for data in items:
+        if supports_fast_path(data):
+            nodes, expected = fast_parse(data, cls=cls)
+            if expected:
+                raise parser._insufficient_tokens(expected)
+
+
+def parse_each(items):
+    """
+    Parse each item with :func:`~pai_lang.parser.parse`.
+    """
+    parse = parser.parse
+    for data in items:
+        parse(data)
+
+
+def parse_many(items):
+    """
+    Parse all items with :func:`~pai_lang.parser.parse_many`.
+    """
+    parser.parse_many(items)
+
+
+def best(function, items, repeat):
+    """
+    Return the fastest of `repeat` runs in microseconds per item.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(items)
+        timings.append(time.perf_counter() - start)
+    return min(timings) / len(items) * 1e6
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Measure the overhead of the parse instrumentation hooks.')
+    arg_parser.add_argument('--items', type=int, default=100000, help='number of items per run')
+    arg_parser.add_argument('--repeat', type=int, default=5, help='number of runs; the fastest is reported')
+    args = arg_parser.parse_args()
+
+    rng = random.Random(0)
+    items = [random_item(rng) for _ in range(args.items)]
+
+    unhooked = best(parse_unhooked, items, args.repeat)
+    disabled = best(parse_each, items, args.repeat)
+    print('{:>24} {:>8.3f} us/item'.format('parse (no hook)', unhooked))
+    print('{:>24} {:>8.3f} us/item {:>+7.1%}'.format('parse (disabled)', disabled, disabled / unhooked - 1))
+
+    for name, function in (('parse', parse_each), ('parse_many', parse_many)):
+        disabled = best(function, items, args.repeat)
+        with instrument.enabled():
+            enabled = best(function, items, args.repeat)
+        print('{:>24} {:>8.3f} us/item {:>+7.1%}'.format(name + ' (enabled)', enabled, enabled / disabled - 1))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+    lazy_depth
+    ~~~~~~~~~~
+
+    Benchmark that compares eager :func:`~pai_lang.parser.parse` to lazy :func:`~pai_lang.lazy.parse_lazy` across
+    chain depths for a consumer that only reads the root "node" and "edge", and for one that reads every value.
+
+    Usage: python benchmarks/lazy_depth.py [--iterations N] [--max-depth N]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from pai_lang import lazy, parser
+
+
+def expression(depth):
+    """
+    Create a data string of the given number of nodes.
+    """
+    children = ['node{}:edge{}'.format(i, i) for i in range(depth - 1, 0, -1)]
+    return ':'.join(children + ['user:email:foo@bar.com'])
+
+
+def read_root(chain):
+    """
+    Read the values a routing consumer needs.
+    """
+    root = chain[0]
+    return root.node, root.edge
+
+
+def read_all(chain):
+    """
+    Read every value of every node.
+    """
+    return [(node.node, node.edge, node.property) for node in chain]
+
+
+def measure(parse, read, data, iterations):
+    """
+    Return the time per call, in microseconds, and the bytes allocated per call.
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        read(parse(data))
+    elapsed = (time.perf_counter() - start) / iterations * 1e6
+
+    tracemalloc.start()
+    chains = [parse(data) for _ in range(100)]
+    for chain in chains:
+        read(chain)
+    allocated = tracemalloc.get_traced_memory()[0] / len(chains)
+    tracemalloc.stop()
+
+    return elapsed, allocated
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Compare eager and lazy parsing across chain depths.')
+    arg_parser.add_argument('--iterations', type=int, default=20000, help='number of strings parsed per run')
+    arg_parser.add_argument('--max-depth', type=int, default=32, help='deepest chain measured')
+    args = arg_parser.parse_args()
+
+    print('{:>6} {:>10} {:>12} {:>12} {:>12} {:>12}'.format('depth', 'read', 'eager (us)', 'lazy (us)',
+                                                            'eager (B)', 'lazy (B)'))
+    depth = 1
+    while depth <= args.max_depth:
+        data = expression(depth)
+        for name, read in (('root', read_root), ('all', read_all)):
+            eager_time, eager_bytes = measure(parser.parse, read, data, args.iterations)
+            lazy_time, lazy_bytes = measure(lazy.parse_lazy, read, data, args.iterations)
+            print('{:>6} {:>10} {:>12.2f} {:>12.2f} {:>12.0f} {:>12.0f}'.format(depth, name, eager_time, lazy_time,
+                                                                                eager_bytes, lazy_bytes))
+        depth *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+    limits_rejection
+    ~~~~~~~~~~~~~~~~
+
+    Benchmark that measures how long it takes to reject pathological data strings of growing size with
+    :class:`~pai_lang.syntax.Limits`, compared to parsing them without limits.
+
+    Usage: python benchmarks/limits_rejection.py [--max-hops N] [--max-token-length N]
+"""
+
+import argparse
+import time
+
+from pai_lang import parser, syntax
+
+
+SIZES = (10 ** 4, 10 ** 5, 10 ** 6)
+
+
+def elapsed_ms(function, data):
+    """
+    Return the milliseconds taken by calling the function with the data, ignoring the syntax error it raises.
+    """
+    start = time.perf_counter()
+    try:
+        function(data)
+    except syntax.SyntaxError:
+        pass
+    return (time.perf_counter() - start) * 1e3
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Measure the time to reject oversized input with limits.')
+    arg_parser.add_argument('--max-hops', type=int, default=32, help='maximum number of nodes per chain')
+    arg_parser.add_argument('--max-token-length', type=int, default=256, help='maximum length of a single value')
+    args = arg_parser.parse_args()
+
+    limits = syntax.Limits(max_hops=args.max_hops, max_token_length=args.max_token_length)
+
+    print('{:>12} {:>12} {:>12} {:>12}'.format('input', 'size', 'no limits', 'limits'))
+    for size in SIZES:
+        inputs = (
+            ('hops', 'n:any:' * (size // 6) + 'user:email:foo@bar.com'),
+            ('token', 'n' * size + ':any:user:email:foo@bar.com')
+        )
+        for name, data in inputs:
+            unlimited = elapsed_ms(parser.parse, data)
+            limited = elapsed_ms(lambda d: parser.parse(d, limits=limits), data)
+            print('{:>12} {:>12} {:>10.3f}ms {:>10.3f}ms'.format(name, len(data), unlimited, limited))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+    match_scaling
+    ~~~~~~~~~~~~~
+
+    Benchmark that measures how :class:`~pai_lang.match.PatternMatcher` scales with the number of patterns compared
+    to testing each pattern in turn.
+
+    Usage: python benchmarks/match_scaling.py [--max-patterns N] [--queries N]
+"""
+
+import argparse
+import random
+import time
+
+from pai_lang import match
+
+
+NODES = ['user', 'workspace', 'settings', 'team', 'project', 'channel', 'file', 'org']
+EDGES = ['any', 'id', 'email', 'member', 'owner', 'name']
+
+
+def random_pattern(rng):
+    """
+    Create a random pattern of one to three nodes with occasional wildcards.
+    """
+    values = []
+    for position in range(rng.randint(1, 3)):
+        node = rng.choice(NODES) if rng.random() > 0.05 else match.WILDCARD
+        edge = rng.choice(EDGES)
+        values.append((node, edge, '*' if rng.random() < 0.5 else str(rng.randint(0, 1000))) if not position
+                      else (node, edge, None))
+    return tuple(values)
+
+
+def random_expression(rng):
+    """
+    Create a random packed chain of one to three nodes without wildcards.
+    """
+    return tuple((rng.choice(NODES), rng.choice(EDGES), str(rng.randint(0, 1000)) if not position else None)
+                 for position in range(rng.randint(1, 3)))
+
+
+def linear_match(patterns, chain):
+    """
+    Test each pattern against the chain in turn.
+    """
+    matches = []
+    for pattern_id, pattern in enumerate(patterns):
+        if len(pattern) != len(chain):
+            continue
+        for (pn, pe, pp), (n, e, p) in zip(pattern, chain):
+            if pn != '*' and pn != n or pe not in ('*', 'any', e) or pp not in ('*', p):
+                break
+        else:
+            matches.append(pattern_id)
+    return matches
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Measure pattern matching cost as the pattern count grows.')
+    arg_parser.add_argument('--max-patterns', type=int, default=100000, help='largest number of patterns')
+    arg_parser.add_argument('--queries', type=int, default=2000, help='number of chains matched per run')
+    args = arg_parser.parse_args()
+
+    rng = random.Random(0)
+    queries = [random_expression(rng) for _ in range(args.queries)]
+
+    print('{:>10} {:>16} {:>16} {:>10}'.format('patterns', 'trie (us/match)', 'linear (us/match)', 'matches'))
+    count = 100
+    while count <= args.max_patterns:
+        patterns = [random_pattern(rng) for _ in range(count)]
+        matcher = match.PatternMatcher()
+        for pattern in patterns:
+            matcher.add(pattern)
+
+        start = time.perf_counter()
+        total = sum(len(matcher.match(query)) for query in queries)
+        trie = (time.perf_counter() - start) / len(queries) * 1e6
+
+        linear_queries = queries[:max(len(queries) * 1000 // count, 10)]
+        start = time.perf_counter()
+        for query in linear_queries:
+            linear_match(patterns, query)
+        linear = (time.perf_counter() - start) / len(linear_queries) * 1e6
+
+        print('{:>10} {:>16.1f} {:>16.1f} {:>10}'.format(count, trie, linear, total))
+        count *= 10
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+    resolve_batch
+    ~~~~~~~~~~~~~
+
+    Benchmark that compares resolving chains one at a time to batched resolution with
+    :func:`~pai_lang.resolve.resolve_many` against a backend with injected latency.
+
+    Usage: python benchmarks/resolve_batch.py [--chains N] [--distinct N] [--latency SECONDS]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from pai_lang import resolve
+
+
+def build_graph(rng, users):
+    """
+    Create a graph of users related to workspaces and workspaces to settings.
+    """
+    graph = resolve.MemoryGraph()
+    workspaces = max(users // 10, 1)
+    for i in range(users):
+        graph.add('u{}'.format(i), 'user', email='user{}@example.com'.format(i))
+    for i in range(workspaces):
+        graph.add('w{}'.format(i), 'workspace')
+        graph.add('s{}'.format(i), 'settings')
+        graph.relate('w{}'.format(i), 'config', 's{}'.format(i))
+    for i in range(users):
+        for _ in range(3):
+            graph.relate('u{}'.format(i), rng.choice(['member', 'owner']), 'w{}'.format(rng.randrange(workspaces)))
+    return graph
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Compare per-chain and batched resolution round-trips.')
+    arg_parser.add_argument('--chains', type=int, default=1000, help='number of chains resolved per run')
+    arg_parser.add_argument('--distinct', type=int, default=200, help='number of distinct root lookups')
+    arg_parser.add_argument('--latency', type=float, default=0.001, help='seconds of latency per backend call')
+    args = arg_parser.parse_args()
+
+    rng = random.Random(0)
+    graph = build_graph(rng, 10000)
+    templates = ['user:email:{}', 'workspace:any:user:email:{}', 'settings:any:workspace:member:user:email:{}']
+    emails = ['user{}@example.com'.format(rng.randrange(10000)) for _ in range(args.distinct)]
+    chains = [rng.choice(templates).format(rng.choice(emails)) for _ in range(args.chains)]
+
+    print('{:>12} {:>10} {:>10}'.format('mode', 'calls', 'seconds'))
+
+    backend = resolve.LatencyBackend(graph, args.latency)
+    start = time.perf_counter()
+    expected = [resolve.resolve(chain, backend) for chain in chains]
+    print('{:>12} {:>10} {:>10.3f}'.format('sequential', backend.calls, time.perf_counter() - start))
+
+    backend = resolve.LatencyBackend(graph, args.latency)
+    start = time.perf_counter()
+    assert resolve.resolve_many(chains, backend) == expected
+    print('{:>12} {:>10} {:>10.3f}'.format('batched', backend.calls, time.perf_counter() - start))
+
+    backend = resolve.AsyncLatencyBackend(graph, args.latency)
+    start = time.perf_counter()
+    assert asyncio.run(resolve.resolve_many_async(chains, backend)) == expected
+    print('{:>12} {:>10} {:>10.3f}'.format('async', backend.calls, time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main()
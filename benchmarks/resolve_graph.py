@@ -0,0 +1,86 @@
+"""
+    resolve_graph
+    ~~~~~~~~~~~~~
+
+    Benchmark that measures chain resolution against a :class:`~pai_lang.resolve.MemoryGraph` with millions of
+    relations, comparing "any" hops answered from the precomputed relation index to a search over every edge.
+
+    Usage: python benchmarks/resolve_graph.py [--users N] [--edges N] [--queries N]
+"""
+
+import argparse
+import random
+import time
+
+from pai_lang import resolve
+
+
+EDGES = ['member', 'owner', 'guest', 'admin']
+
+
+def build_graph(rng, users, edges):
+    """
+    Create a graph of users, workspaces and settings with the given number of user/workspace relations.
+    """
+    workspaces = max(users // 10, 1)
+    graph = resolve.MemoryGraph()
+    for i in range(users):
+        graph.add('u{}'.format(i), 'user', email='user{}@example.com'.format(i))
+    for i in range(workspaces):
+        graph.add('w{}'.format(i), 'workspace', name='workspace{}'.format(i))
+        graph.add('s{}'.format(i), 'settings', theme='dark')
+        graph.relate('w{}'.format(i), 'config', 's{}'.format(i))
+    for _ in range(edges):
+        graph.relate('u{}'.format(rng.randrange(users)), rng.choice(EDGES), 'w{}'.format(rng.randrange(workspaces)))
+    return graph
+
+
+def search_any(graph, node, sources):
+    """
+    Follow every edge from the given resources, as an "any" hop would without the relation index.
+    """
+    targets = set()
+    for source in sources:
+        for edge in EDGES + ['config']:
+            targets.update(graph.adjacency.get((source, edge, node), ()))
+    return targets
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Measure chain resolution cost against a large in-memory graph.')
+    arg_parser.add_argument('--users', type=int, default=200000, help='number of user resources')
+    arg_parser.add_argument('--edges', type=int, default=2000000, help='number of user/workspace relations')
+    arg_parser.add_argument('--queries', type=int, default=2000, help='number of chains resolved per run')
+    args = arg_parser.parse_args()
+
+    rng = random.Random(0)
+    start = time.perf_counter()
+    graph = build_graph(rng, args.users, args.edges)
+    print('built {!r} in {:.1f}s'.format(graph, time.perf_counter() - start))
+
+    emails = ['user{}@example.com'.format(rng.randrange(args.users)) for _ in range(args.queries)]
+    chains = {
+        'user:email': 'user:email:{}',
+        'workspace:member': 'workspace:member:user:email:{}',
+        'workspace:any': 'workspace:any:user:email:{}',
+        'settings:any:workspace:any': 'settings:any:workspace:any:user:email:{}'
+    }
+
+    print('{:>28} {:>14} {:>12}'.format('chain', 'us/resolve', 'resources'))
+    for name, template in chains.items():
+        expressions = [template.format(email) for email in emails]
+        start = time.perf_counter()
+        total = sum(len(resolve.resolve(expression, graph)) for expression in expressions)
+        elapsed = (time.perf_counter() - start) / len(expressions) * 1e6
+        print('{:>28} {:>14.1f} {:>12}'.format(name, elapsed, total))
+
+    start = time.perf_counter()
+    for email in emails:
+        users = graph.lookup('user', 'email', email)
+        search_any(graph, 'settings', search_any(graph, 'workspace', users))
+    elapsed = (time.perf_counter() - start) / len(emails) * 1e6
+    print('{:>28} {:>14.1f}'.format('(edge search, no index)', elapsed))
+
+
+if __name__ == '__main__':
+    main()
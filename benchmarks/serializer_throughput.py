@@ -0,0 +1,77 @@
+"""
+    serializer_throughput
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    Benchmark that compares writing chains to a file one line at a time, joining values by hand, to
+    :func:`~pai_lang.serializer.dump_many`, which also checks that every line parses back into its chain.
+
+    Usage: python benchmarks/serializer_throughput.py [--chains N] [--chunksize N]
+"""
+
+import argparse
+import itertools
+import os
+import random
+import tempfile
+import time
+
+from pai_lang import parser, serializer, syntax
+
+
+POOL_SIZE = 10000
+
+
+def random_chain(rng):
+    """
+    Create a chain of one to four nodes.
+    """
+    tokens = ['user', 'email', 'user{}@example.com'.format(rng.randint(0, 100000))]
+    for _ in range(rng.randint(0, 3)):
+        tokens = ['workspace', 'any'] + tokens
+    return parser.parse(':'.join(tokens))
+
+
+def dump_by_hand(chains, path):
+    """
+    Write each chain by walking its nodes leaf first and joining their values with ":".
+    """
+    with open(path, 'w') as f:
+        for nodes in chains:
+            values = []
+            for node in reversed(nodes):
+                values.append(node.node)
+                values.append(node.edge)
+            values.append(nodes[0].property)
+            f.write(':'.join(values) + '\n')
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Compare hand-joined writes to the bulk chain serializer.')
+    arg_parser.add_argument('--chains', type=int, default=1000000, help='number of chains written')
+    arg_parser.add_argument('--chunksize', type=int, default=1024, help='number of lines written at once')
+    args = arg_parser.parse_args()
+
+    rng = random.Random(0)
+    pool = [random_chain(rng) for _ in range(POOL_SIZE)]
+
+    writers = (
+        ('hand join', dump_by_hand),
+        ('dump_many', lambda chains, path: serializer.dump_many(chains, path, chunksize=args.chunksize))
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'chains.txt')
+        for name, write in writers:
+            chains = itertools.islice(itertools.cycle(pool), args.chains)
+            start = time.perf_counter()
+            write(chains, path)
+            elapsed = time.perf_counter() - start
+            size = os.path.getsize(path)
+            print('{:>10} {:>10.0f} chains/s {:>8.1f} MB/s'.format(name, args.chains / elapsed, size / elapsed / 1e6))
+
+        with open(path) as f:
+            assert syntax.pack(parser.parse(f.readline().rstrip())) == syntax.pack(pool[0])
+
+
+if __name__ == '__main__':
+    main()
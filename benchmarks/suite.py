@@ -0,0 +1,221 @@
+"""
+    suite
+    ~~~~~
+
+    Benchmark suite that times the parse pipeline, from node construction to the bulk paths, across synthetic
+    workload shapes and compares the results against a stored baseline.
+
+    Results are written as JSON mapping "benchmark/shape" to nanoseconds per item, the best of several runs.
+    When a baseline is given, every benchmark slower than the baseline by more than the tolerance is reported and
+    the suite exits with a non-zero status.
+
+    Usage: python benchmarks/suite.py [--count N] [--repeat N] [--filter TEXT] [--output FILE]
+        [--baseline FILE] [--tolerance FRACTION]
+"""
+
+import argparse
+import collections
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pai_lang import parser, syntax, visitor, vectorized  # noqa: E402
+from workload import SHAPES, generate  # noqa: E402
+
+
+def valid_items(items):
+    """
+    Return the items that parse to at least one node.
+    """
+    return [nodes for nodes in parser.parse_many(items, errors=parser.ERRORS_SKIP) if nodes]
+
+
+def bench_parse(items):
+    """
+    Parse each item with :func:`~pai_lang.parser.parse`.
+    """
+    parse = parser.parse
+    for data in items:
+        try:
+            parse(data)
+        except syntax.SyntaxError:
+            pass
+
+
+def bench_parse_gen(items):
+    """
+    Consume the nodes of each item from :func:`~pai_lang.parser.parse_gen`.
+    """
+    parse_gen = parser.parse_gen
+    for data in items:
+        try:
+            for _ in parse_gen(data):
+                pass
+        except syntax.SyntaxError:
+            pass
+
+
+def bench_parse_many(items):
+    """
+    Parse all items with :func:`~pai_lang.parser.parse_many`.
+    """
+    parser.parse_many(items, errors=parser.ERRORS_SKIP)
+
+
+def bench_validate_many(items):
+    """
+    Validate all items with :func:`~pai_lang.parser.validate_many`.
+    """
+    parser.validate_many(items)
+
+
+def bench_extend_store(items):
+    """
+    Tokenize all items into a :class:`~pai_lang.store.ChainStore` with the vectorized bulk path.
+    """
+    from pai_lang import store
+    vectorized.extend_store(store.ChainStore(), items, errors=parser.ERRORS_SKIP)
+
+
+def setup_visitor(items):
+    """
+    Create the right-to-left token lists the visitor consumes for each valid item.
+    """
+    return [list(reversed(data.split(syntax.DELIMITER))) for data in items
+            if not visitor.check_token_count(len(data.split(syntax.DELIMITER)))[0]]
+
+
+def bench_visitor(token_lists):
+    """
+    Create the nodes of each token list with :func:`~pai_lang.visitor.visit_root` and
+    :func:`~pai_lang.visitor.visit_child`.
+    """
+    visit_root, visit_child = visitor.visit_root, visitor.visit_child
+    for tokens in token_lists:
+        tokens = iter(tokens)
+        node = visit_root(tokens)
+        while node:
+            node = visit_child(tokens, node)
+
+
+def setup_syntax(items):
+    """
+    Create the packed form of each valid item.
+    """
+    return [syntax.pack(nodes) for nodes in valid_items(items)]
+
+
+def bench_syntax(chains):
+    """
+    Create the nodes of each packed chain with :func:`~pai_lang.syntax.root` and :func:`~pai_lang.syntax.child`.
+    """
+    root, child = syntax.root, syntax.child
+    for chain in chains:
+        node, edge, property = chain[0]
+        parent = root(node, edge, property)
+        for node, edge, _ in chain[1:]:
+            parent = child(node, edge, parent)
+
+
+# Benchmarks keyed by name: the function timed and an optional function preparing its input from the workload.
+BENCHMARKS = collections.OrderedDict([
+    ('parse', (bench_parse, None)),
+    ('parse_gen', (bench_parse_gen, None)),
+    ('parse_many', (bench_parse_many, None)),
+    ('validate_many', (bench_validate_many, None)),
+    ('visitor', (bench_visitor, setup_visitor)),
+    ('syntax', (bench_syntax, setup_syntax))
+])
+
+if vectorized.HAS_NUMPY:
+    BENCHMARKS['extend_store'] = (bench_extend_store, None)
+
+
+def measure(function, data, count, repeat):
+    """
+    Return the best time of `repeat` runs in nanoseconds per workload item.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(data)
+        best = min(best, time.perf_counter() - start)
+    return best / count * 1e9
+
+
+def run(count, repeat, name_filter=None):
+    """
+    Run every benchmark against every workload shape.
+
+    :return: A :class:`~dict` mapping "benchmark/shape" to nanoseconds per item
+    """
+    results = collections.OrderedDict()
+    for shape_name, shape in SHAPES.items():
+        items = generate(count, shape)
+        for name, (function, setup) in BENCHMARKS.items():
+            key = '{}/{}'.format(name, shape_name)
+            if name_filter and name_filter not in key:
+                continue
+            data = setup(items) if setup else items
+            results[key] = measure(function, data, count, repeat)
+            print('{:<36} {:>12.1f} ns/item'.format(key, results[key]), file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Find the benchmarks slower than their baseline by more than the given tolerance.
+
+    :return: List of `(key, baseline, result)` tuples
+    """
+    regressions = []
+    for key, result in results.items():
+        expected = baseline.get(key)
+        if expected and result > expected * (1 + tolerance):
+            regressions.append((key, expected, result))
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Run the parse pipeline benchmark suite.')
+    arg_parser.add_argument('--count', type=int, default=5000, help='number of data strings per workload')
+    arg_parser.add_argument('--repeat', type=int, default=5, help='number of runs per benchmark; the best is kept')
+    arg_parser.add_argument('--filter', default=None, help='only run benchmarks whose "name/shape" contains TEXT')
+    arg_parser.add_argument('--output', default=None, help='file to write the JSON results to')
+    arg_parser.add_argument('--baseline', default=None, help='JSON results to compare against')
+    arg_parser.add_argument('--tolerance', type=float, default=0.15, help='allowed slowdown as a fraction')
+    args = arg_parser.parse_args()
+
+    results = run(args.count, args.repeat, args.filter)
+    document = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'count': args.count,
+        'results': results
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(document, f, indent=2)
+    else:
+        json.dump(document, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        for key, expected, result in regressions:
+            change = result / expected - 1
+            print('REGRESSION {}: {:.1f} -> {:.1f} ns/item ({:+.0%})'.format(key, expected, result, change),
+                  file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
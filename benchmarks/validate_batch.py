@@ -0,0 +1,61 @@
+"""
+    validate_batch
+    ~~~~~~~~~~~~~~
+
+    Benchmark that compares validating batches with a high fraction of malformed items by catching the errors of
+    :func:`~pai_lang.parser.parse` to :func:`~pai_lang.parser.validate_many`.
+
+    Usage: python benchmarks/validate_batch.py [--items N] [--malformed FRACTION]
+"""
+
+import argparse
+import random
+import time
+
+from pai_lang import parser, syntax
+
+
+def random_item(rng, malformed):
+    """
+    Create a data string of one to four nodes, with a token removed when malformed.
+    """
+    tokens = ['user', 'email', 'user{}@example.com'.format(rng.randint(0, 100000))]
+    for _ in range(rng.randint(0, 3)):
+        tokens = ['workspace', 'any'] + tokens
+    if malformed:
+        del tokens[0]
+    return ':'.join(tokens)
+
+
+def validate_with_parse(items):
+    """
+    Validate each item by parsing it and catching the error.
+    """
+    status = []
+    for data in items:
+        try:
+            parser.parse(data)
+            status.append(True)
+        except syntax.SyntaxError:
+            status.append(False)
+    return status
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Compare exception based and exception-free validation.')
+    arg_parser.add_argument('--items', type=int, default=200000, help='number of items per batch')
+    arg_parser.add_argument('--malformed', type=float, default=0.5, help='fraction of malformed items')
+    args = arg_parser.parse_args()
+
+    rng = random.Random(0)
+    items = [random_item(rng, rng.random() < args.malformed) for _ in range(args.items)]
+
+    for name, validate in (('parse + except', validate_with_parse), ('validate_many', parser.validate_many)):
+        start = time.perf_counter()
+        validate(items)
+        elapsed = (time.perf_counter() - start) / len(items) * 1e6
+        print('{:>16} {:>8.2f} us/item'.format(name, elapsed))
+
+
+if __name__ == '__main__':
+    main()
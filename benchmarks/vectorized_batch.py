@@ -0,0 +1,57 @@
+"""
+    vectorized_batch
+    ~~~~~~~~~~~~~~~~
+
+    Benchmark that compares filling a :class:`~pai_lang.store.ChainStore` from parsed nodes to the vectorized
+    :func:`~pai_lang.vectorized.extend_store` path across batch sizes.
+
+    Usage: python benchmarks/vectorized_batch.py [--max-batch N]
+"""
+
+import argparse
+import random
+import time
+
+from pai_lang import parser, store, vectorized
+
+
+NODES = ['user', 'workspace', 'settings', 'team', 'project', 'channel', 'file', 'org']
+EDGES = ['any', 'id', 'email', 'member', 'owner', 'name']
+
+
+def random_expression(rng):
+    """
+    Create a random data string of one to four nodes.
+    """
+    children = ['{}:{}'.format(rng.choice(NODES), rng.choice(EDGES)) for _ in range(rng.randint(0, 3))]
+    return ':'.join(children + ['user:email:user{}@example.com'.format(rng.randint(0, 100000))])
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Compare per-expression and vectorized bulk parsing.')
+    arg_parser.add_argument('--max-batch', type=int, default=1000000, help='largest batch size')
+    args = arg_parser.parse_args()
+
+    if not vectorized.HAS_NUMPY:
+        arg_parser.error('numpy is required for this benchmark')
+
+    rng = random.Random(0)
+    print('{:>10} {:>16} {:>16} {:>8}'.format('batch', 'parse (us/item)', 'vector (us/item)', 'speedup'))
+    size = 1000
+    while size <= args.max_batch:
+        items = [random_expression(rng) for _ in range(size)]
+
+        start = time.perf_counter()
+        store.ChainStore(parser.parse_many(items))
+        eager = (time.perf_counter() - start) / size * 1e6
+
+        start = time.perf_counter()
+        vectorized.extend_store(store.ChainStore(), items)
+        vector = (time.perf_counter() - start) / size * 1e6
+
+        print('{:>10} {:>16.2f} {:>16.2f} {:>7.1f}x'.format(size, eager, vector, eager / vector))
+        size *= 10
+
+
+if __name__ == '__main__':
+    main()
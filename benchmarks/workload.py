@@ -0,0 +1,82 @@
+"""
+    workload
+    ~~~~~~~~
+
+    Synthetic workload generator used by the benchmark suite.
+
+    Usage: python benchmarks/workload.py [--count N] [--shape NAME]
+"""
+
+import argparse
+import collections
+import random
+
+
+# Parameters of a generated workload:
+#     min_depth/max_depth: Range of the number of nodes of each chain.
+#     token_length: Length of every generated "node", "edge" and "property" value.
+#     vocabulary: Number of distinct "node" and "edge" values.
+#     duplicate_ratio: Fraction of items that repeat an earlier item.
+#     malformed_ratio: Fraction of items missing a token.
+Shape = collections.namedtuple('Shape', ['min_depth', 'max_depth', 'token_length', 'vocabulary', 'duplicate_ratio',
+                                         'malformed_ratio'])
+
+
+SHAPES = collections.OrderedDict([
+    ('shallow', Shape(1, 2, 8, 100, 0.0, 0.0)),
+    ('mixed', Shape(1, 10, 8, 1000, 0.1, 0.05)),
+    ('deep', Shape(20, 50, 8, 1000, 0.0, 0.0)),
+    ('long-tokens', Shape(1, 5, 64, 1000, 0.0, 0.0)),
+    ('small-vocabulary', Shape(1, 5, 8, 10, 0.0, 0.0)),
+    ('duplicates', Shape(1, 5, 8, 1000, 0.9, 0.0)),
+    ('malformed', Shape(1, 5, 8, 1000, 0.0, 0.5))
+])
+
+
+def generate(count, shape, seed=0):
+    """
+    Create a list of data strings with the given shape.
+
+    :param count: Number of data strings
+    :param shape: A :class:`~Shape` instance
+    :param seed: Seed of the random number generator so workloads are identical across runs
+    :return: List of :class:`~str` instances
+    """
+    rng = random.Random(seed)
+    vocabulary = [token(rng, shape.token_length) for _ in range(shape.vocabulary)]
+    items = []
+
+    for _ in range(count):
+        if items and rng.random() < shape.duplicate_ratio:
+            items.append(rng.choice(items))
+            continue
+
+        depth = rng.randint(shape.min_depth, shape.max_depth)
+        tokens = [rng.choice(vocabulary) for _ in range(depth * 2 - 2)]
+        tokens += [rng.choice(vocabulary), rng.choice(vocabulary), token(rng, shape.token_length)]
+        if rng.random() < shape.malformed_ratio:
+            del tokens[0]
+        items.append(':'.join(tokens))
+
+    return items
+
+
+def token(rng, length):
+    """
+    Create a random lowercase token of the given length.
+    """
+    return ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(length))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Print a sample of a synthetic workload.')
+    arg_parser.add_argument('--count', type=int, default=10, help='number of data strings')
+    arg_parser.add_argument('--shape', choices=list(SHAPES), default='mixed', help='workload shape')
+    args = arg_parser.parse_args()
+
+    for item in generate(args.count, SHAPES[args.shape]):
+        print(item)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,13 +8,25 @@
     :license: Apache 2.0, see LICENSE for more details.
 """
 
+from . import cache
+from . import codec
+from . import index
+from . import instrument
+from . import interning
+from . import lazy
+from . import match
 from . import parser
 from .parser import *
+from . import resolve
+from . import serializer
+from .serializer import *
+from . import store
+from . import stream
 from . import syntax
 from .syntax import *
 
 
-__all__ = parser.__all__ + syntax.__all__
+__all__ = parser.__all__ + serializer.__all__ + syntax.__all__
 
 
 __version__ = '0.0.2'
@@ -0,0 +1,208 @@
+"""
+    pai_lang.aio
+    ~~~~~~~~~~~~
+
+    Module for parsing newline-delimited data strings from :mod:`~asyncio` streams.
+"""
+
+import asyncio
+
+from pai_lang import parser, stream, syntax
+
+
+__all__ = ['parse_stream']
+
+
+DEFAULT_BATCHSIZE = 1024
+DEFAULT_MAXSIZE = 8
+DEFAULT_READ_SIZE = 64 * 1024
+DEFAULT_EXECUTOR_THRESHOLD = 512
+
+
+async def parse_stream(source, errors=parser.ERRORS_RAISE, cls=syntax.Node, batchsize=DEFAULT_BATCHSIZE,
+                       maxsize=DEFAULT_MAXSIZE, executor=None, executor_threshold=DEFAULT_EXECUTOR_THRESHOLD,
+                       encoding=stream.DEFAULT_ENCODING, read_size=DEFAULT_READ_SIZE, limits=None):
+    """
+    Asynchronous generator function that yields the list of nodes parsed from each line of the given source.
+
+    A background task reads the source, reassembles lines split across chunks and puts batches of up to
+    `batchsize` lines on a queue holding at most `maxsize` batches. Once the queue is full the source is no
+    longer read until batches are consumed. Each batch is parsed in one step, giving control back to the event
+    loop between batches. When an `executor` is given, batches of at least `executor_threshold` lines are parsed
+    on it instead of the event loop thread.
+
+    Lines that fail to parse are handled based on the `errors` policy of :func:`~pai_lang.parser.parse_many_gen`
+    and are reported as a :class:`~pai_lang.stream.StreamSyntaxError` with their line number and offset. Lines
+    that exceed the `limits` are reported as a :class:`~pai_lang.stream.StreamLimitExceeded`. Lines longer than
+    `max_length` are rejected while they are read, so at most `max_length` of each line is held in memory; like
+    :class:`~bytes` data strings, their length is the number of bytes unless the chunks are :class:`~str`.
+
+    :param source: An :class:`~asyncio.StreamReader`, or any object with a `read` coroutine, or an asynchronous
+        iterable of :class:`~bytes` or :class:`~str` chunks
+    :param errors: Policy for lines that fail to parse: "raise", "skip" or "yield" the error in place
+    :param cls: Type of node to create; default: :class:`~pai_lang.syntax.Node`
+    :param batchsize: Maximum number of lines parsed as a single batch
+    :param maxsize: Maximum number of batches read ahead of the consumer
+    :param executor: Optional :class:`~concurrent.futures.Executor` used to parse large batches
+    :param executor_threshold: Minimum number of lines in a batch for it to be parsed on the `executor`
+    :param encoding: Encoding of :class:`~bytes` chunks
+    :param read_size: Maximum number of bytes requested per `read` call
+    :param limits: A :class:`~pai_lang.syntax.Limits` instance each line is checked against before parsing;
+        default: no limits
+    :return: Yields node lists, or errors, in the order lines were read
+    """
+    if errors not in parser.ERROR_POLICIES:
+        raise ValueError('errors must be one of {}; got {}'.format(parser.ERROR_POLICIES, errors))
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize)
+    max_length = None if limits is None else limits.max_length
+    producer = asyncio.ensure_future(_produce(_chunk_gen(source, read_size), queue, batchsize, encoding, max_length))
+
+    try:
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                break
+            if isinstance(batch, BaseException):
+                raise batch
+
+            if executor is not None and len(batch) >= executor_threshold:
+                results = await loop.run_in_executor(executor, stream._parse_chunk, batch, cls, limits)
+            else:
+                results = stream._parse_chunk(batch, cls, limits)
+
+            for result in stream._apply_errors(results, errors):
+                yield result
+
+            await asyncio.sleep(0)
+    finally:
+        producer.cancel()
+
+
+async def _chunk_gen(source, read_size):
+    """
+    Asynchronous generator function that yields chunks read from the given source until it is exhausted.
+    """
+    read = getattr(source, 'read', None)
+    if read is None:
+        async for chunk in source:
+            yield chunk
+        return
+
+    while True:
+        chunk = await read(read_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def _produce(chunks, queue, batchsize, encoding, max_length=None):
+    """
+    Read chunks, split them into `(lineno, offset, line)` tuples and put batches of them on the queue.
+
+    Only each new chunk is searched for newlines. The pieces of a line split across chunks are kept in a list and
+    joined once, when the line ends, so reading a long line costs time linear in its length. Once a partial line
+    is longer than `max_length` its pieces are dropped and only its length is kept; the
+    :class:`~pai_lang.syntax.LimitExceeded` it raises is put in place of the line once it ends.
+
+    The queue always receives `None` once the chunks are exhausted, or the exception raised while reading them.
+    """
+    # Room for a carriage return, so a line of `max_length` is kept whole.
+    max_size = None if max_length is None else max_length + 1
+    pieces = []
+    partial = 0
+    last = None
+    lineno = 0
+    offset = 0
+    batch = []
+
+    try:
+        async for chunk in chunks:
+            newline = b'\n' if isinstance(chunk, bytes) else '\n'
+            if newline not in chunk:
+                if chunk:
+                    partial, last = partial + len(chunk), chunk
+                    if max_size is not None and partial > max_size:
+                        pieces = None
+                    elif pieces is not None:
+                        pieces.append(chunk)
+                continue
+
+            lines = chunk.split(newline)
+            sizes = None
+            if partial:
+                head = lines[0]
+                sizes = partial + len(head)
+                if pieces is None:
+                    lines[0] = _length_exceeded(head or last, sizes, max_length)
+                else:
+                    pieces.append(head)
+                    lines[0] = chunk[:0].join(pieces)
+
+            tail = lines.pop()
+            pieces, partial, last = [], 0, None
+            if tail:
+                partial, last = len(tail), tail
+                pieces = None if max_size is not None and partial > max_size else [tail]
+
+            for line in lines:
+                lineno += 1
+                size = len(line) if sizes is None else sizes
+                sizes = None
+                start, offset = offset, offset + size + 1
+                line = _line_entry(line, encoding, max_length)
+                if line is not None:
+                    batch.append((lineno, start, line))
+                if len(batch) >= batchsize:
+                    await queue.put(batch)
+                    batch = []
+
+            # Flush whatever is ready so a slow source does not delay lines that were already read.
+            if batch:
+                await queue.put(batch)
+                batch = []
+
+        if partial:
+            if pieces is None:
+                line = _length_exceeded(last, partial, max_length)
+            else:
+                line = _line_entry(last[:0].join(pieces), encoding, max_length)
+            if line is not None:
+                await queue.put([(lineno + 1, offset, line)])
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        await queue.put(e)
+        return
+
+    await queue.put(None)
+
+
+def _line_entry(line, encoding, max_length):
+    """
+    Create the line, or error, put on the queue for the given line read from the source.
+
+    :param line: Line without its newline; a :class:`~pai_lang.syntax.LimitExceeded` is returned as-is
+    :param encoding: Encoding of :class:`~bytes` lines
+    :param max_length: Maximum length of a line or `None`
+    :return: The decoded line, the :class:`~pai_lang.syntax.SyntaxError` it raises when it is too long or cannot be
+        decoded, or `None` if it is empty
+    """
+    if isinstance(line, syntax.LimitExceeded):
+        return line
+    line = line.rstrip(b'\r' if isinstance(line, bytes) else '\r')
+    if max_length is not None and len(line) > max_length:
+        return parser._length_exceeded(len(line), max_length)
+    if not line:
+        return None
+    return stream._decode(line, encoding) if isinstance(line, bytes) else line
+
+
+def _length_exceeded(end, size, max_length):
+    """
+    Create the :class:`~pai_lang.syntax.LimitExceeded` of a line of `size` items, not counting a carriage return at
+    its `end`, that was dropped while reading it.
+    """
+    carriage = b'\r' if isinstance(end, bytes) else '\r'
+    return parser._length_exceeded(size - end.endswith(carriage), max_length)
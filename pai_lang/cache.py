@@ -0,0 +1,98 @@
+"""
+    pai_lang.cache
+    ~~~~~~~~~~~~~~
+
+    Module that implements a bounded, memoizing layer in front of :func:`~pai_lang.parser.parse`.
+"""
+
+import collections
+import threading
+
+from pai_lang import parser, syntax
+
+
+__all__ = ['CacheInfo', 'ParseCache']
+
+
+DEFAULT_MAXSIZE = 4096
+
+
+CacheInfo = collections.namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+
+class ParseCache:
+    """
+    Least-recently-used cache of parsed data strings.
+
+    Cached chains are stored as :class:`~pai_lang.syntax.FrozenNode` tuples created by
+    :func:`~pai_lang.syntax.freeze` so the same result can be handed to every caller without copying. Data strings
+    that fail to parse are not cached.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, parse=parser.parse):
+        if maxsize < 1:
+            raise ValueError('maxsize must be greater than zero')
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._parse = parse
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return '<{}(maxsize={}, currsize={}>'.format(self.__class__.__name__, self.maxsize, len(self))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, data):
+        return data in self._entries
+
+    def parse(self, data):
+        """
+        Return the frozen chain of nodes for the given data string, parsing it only when not already cached.
+
+        :param data: String to parse
+        :return: A :class:`~tuple` of :class:`~pai_lang.syntax.FrozenNode` instances
+        """
+        entries = self._entries
+
+        with self._lock:
+            nodes = entries.get(data)
+            if nodes is not None:
+                entries.move_to_end(data)
+                self.hits += 1
+                return nodes
+            self.misses += 1
+
+        nodes = syntax.freeze(self._parse(data))
+
+        with self._lock:
+            entries[data] = nodes
+            entries.move_to_end(data)
+            if len(entries) > self.maxsize:
+                entries.popitem(last=False)
+                self.evictions += 1
+
+        return nodes
+
+    def info(self):
+        """
+        Return the current statistics of this cache.
+
+        :return: A :class:`~pai_lang.cache.CacheInfo` instance
+        """
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._entries))
+
+    def clear(self):
+        """
+        Remove all entries from this cache and reset its statistics.
+
+        :return: `None`
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
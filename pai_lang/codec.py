@@ -0,0 +1,255 @@
+"""
+    pai_lang.codec
+    ~~~~~~~~~~~~~~
+
+    Module that implements a compact binary serialization format for parsed chains.
+
+    The format is a four byte header followed by a string table and the chains that reference it:
+
+        header: b'PAI' followed by a single byte format version
+        strings: varint count, then for each string its varint length and UTF-8 encoded bytes
+        chains: varint count, then for each chain its varint node count, the varint id of its root property
+            (zero for `None`, otherwise the string index plus one) and a varint node and edge id per node
+
+    All integers are unsigned LEB128 varints.
+"""
+
+import array
+
+from pai_lang import syntax
+
+
+__all__ = ['CodecError', 'Reader', 'dumps', 'loads']
+
+
+MAGIC = b'PAI'
+VERSION = 1
+HEADER = MAGIC + bytes([VERSION])
+
+
+class CodecError(ValueError):
+    """
+    Exception raised when a buffer does not contain a valid encoding of parsed chains.
+    """
+
+
+def dumps(chains):
+    """
+    Encode the given chains into the binary format.
+
+    :param chains: Iterable of chains, e.g. the output of :func:`~pai_lang.parser.parse_many`, or the packed
+        `(node, edge, property)` tuples created by :func:`~pai_lang.syntax.pack`
+    :return: A :class:`~bytes` instance
+    """
+    strings = {}
+    body = bytearray()
+    count = 0
+
+    def string_id(value):
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        return index
+
+    for chain in chains:
+        values = syntax.pack(chain)
+        if not values:
+            raise ValueError('chain must contain at least one node')
+
+        property = values[0][2]
+        _write_varint(body, len(values))
+        _write_varint(body, 0 if property is None else string_id(property) + 1)
+        for node, edge, _ in values:
+            _write_varint(body, string_id(node))
+            _write_varint(body, string_id(edge))
+        count += 1
+
+    data = bytearray(HEADER)
+    _write_varint(data, len(strings))
+    for value in strings:
+        encoded = value.encode('utf-8')
+        _write_varint(data, len(encoded))
+        data += encoded
+    _write_varint(data, count)
+    data += body
+
+    return bytes(data)
+
+
+def loads(data, cls=syntax.Node):
+    """
+    Decode all chains from the given buffer.
+
+    :param data: Object supporting the buffer protocol, e.g. :class:`~bytes` or :class:`~mmap.mmap`
+    :param cls: Type of node to create; default: :class:`~pai_lang.syntax.Node`
+    :return: List of node lists, root first, in the order they were encoded
+    """
+    return list(Reader(data).iter_chains(cls))
+
+
+class Reader:
+    """
+    Lazy reader of chains encoded by :func:`~pai_lang.codec.dumps`.
+
+    The buffer is accessed through a :class:`~memoryview` so it is never copied as a whole. Creating a reader
+    only records where each string is; strings are decoded the first time a chain referencing them is read.
+    The position of each chain is recorded the first time a chain is accessed by index.
+    """
+
+    def __init__(self, data):
+        self.buffer = memoryview(data).cast('B')
+        if self.buffer[:len(HEADER)].tobytes() != HEADER:
+            raise CodecError('buffer does not start with a valid header')
+
+        try:
+            count, position = _read_varint(self.buffer, len(HEADER))
+            self.string_starts = array.array('Q')
+            self.string_ends = array.array('Q')
+            for _ in range(count):
+                length, position = _read_varint(self.buffer, position)
+                self.string_starts.append(position)
+                position += length
+                self.string_ends.append(position)
+            if position > len(self.buffer):
+                raise IndexError(position)
+            self.count, self.chains_offset = _read_varint(self.buffer, position)
+        except IndexError:
+            raise CodecError('string table is truncated') from None
+
+        self._strings = [None] * count
+        self._chain_offsets = None
+
+    def __repr__(self):
+        return '<{}(chains={}, strings={}>'.format(self.__class__.__name__, self.count, len(self._strings))
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return self.iter_chains()
+
+    def __getitem__(self, index):
+        return syntax.unpack(self.packed(index))
+
+    def packed(self, index):
+        """
+        Decode the chain at the given index.
+
+        :param index: Index of the chain; negative values count from the end
+        :return: A :class:`~tuple` of `(node, edge, property)` tuples as created by :func:`~pai_lang.syntax.pack`
+        """
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError('chain index out of range')
+
+        if self._chain_offsets is None:
+            self._chain_offsets = self._scan()
+
+        return self._decode(self._chain_offsets[index])[0]
+
+    def iter_packed(self):
+        """
+        Generator function that decodes each chain in order.
+
+        :return: Yields :class:`~tuple` instances of `(node, edge, property)` tuples
+        """
+        position = self.chains_offset
+        for _ in range(self.count):
+            chain, position = self._decode(position)
+            yield chain
+
+    def iter_chains(self, cls=syntax.Node):
+        """
+        Generator function that decodes each chain in order into linked nodes.
+
+        :param cls: Type of node to create; default: :class:`~pai_lang.syntax.Node`
+        :return: Yields lists of `cls` instances, root first
+        """
+        unpack = syntax.unpack
+        for chain in self.iter_packed():
+            yield unpack(chain, cls)
+
+    def string(self, index):
+        """
+        Return the string at the given index of the string table, decoding it on first access.
+
+        :param index: Index within the string table
+        :return: A :class:`~str` instance
+        """
+        value = self._strings[index]
+        if value is None:
+            value = self._strings[index] = str(self.buffer[self.string_starts[index]:self.string_ends[index]], 'utf-8')
+        return value
+
+    def _decode(self, position):
+        """
+        Decode the chain starting at the given position.
+
+        :return: A :class:`~tuple` of the packed chain and the position following it
+        """
+        buffer, string = self.buffer, self.string
+        try:
+            count, position = _read_varint(buffer, position)
+            property_id, position = _read_varint(buffer, position)
+            property = string(property_id - 1) if property_id else None
+            chain = []
+            for i in range(count):
+                node_id, position = _read_varint(buffer, position)
+                edge_id, position = _read_varint(buffer, position)
+                chain.append((string(node_id), string(edge_id), property if not i else None))
+        except IndexError:
+            message = 'chain at offset {} is truncated or references an unknown string'.format(position)
+            raise CodecError(message) from None
+        return tuple(chain), position
+
+    def _scan(self):
+        """
+        Find the offset of each chain without decoding its strings.
+
+        :return: An :class:`~array.array` holding the offset of each chain, in order
+        """
+        buffer = self.buffer
+        offsets = array.array('Q')
+        position = self.chains_offset
+        try:
+            for _ in range(self.count):
+                offsets.append(position)
+                count, position = _read_varint(buffer, position)
+                _, position = _read_varint(buffer, position)
+                for _ in range(count * 2):
+                    _, position = _read_varint(buffer, position)
+        except IndexError:
+            raise CodecError('chain at offset {} is truncated'.format(offsets[-1])) from None
+        return offsets
+
+
+def _write_varint(buffer, value):
+    """
+    Append the given unsigned integer to the buffer as a LEB128 varint.
+    """
+    while value > 0x7f:
+        buffer.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(buffer, position):
+    """
+    Read a LEB128 varint from the buffer at the given position.
+
+    :return: A :class:`~tuple` of the value and the position following it
+    """
+    byte = buffer[position]
+    if byte < 0x80:
+        return byte, position + 1
+
+    value = 0
+    shift = 0
+    while True:
+        byte = buffer[position]
+        position += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
@@ -0,0 +1,212 @@
+"""
+    pai_lang.index
+    ~~~~~~~~~~~~~~
+
+    Module that implements an inverted index for looking up parsed chains by their nodes, edges and properties.
+"""
+
+import bisect
+
+from pai_lang import syntax
+
+
+__all__ = ['ExpressionIndex']
+
+
+# Prefixes of posting list keys for "node", "edge" and "node"/"edge" pair values.
+NODE_KEY = 'node'
+EDGE_KEY = 'edge'
+HOP_KEY = 'hop'
+
+_EMPTY = frozenset()
+
+
+class ExpressionIndex:
+    """
+    Inverted index over parsed chains.
+
+    Every chain added to the index is given an integer id. Posting lists map each `(position, node)`,
+    `(position, edge)` and `(position, node, edge)` value of a chain, where position zero is the root, to the
+    ids of the chains that contain it. Every value is also indexed with a position of `None` to find chains that
+    contain it at any position. Root properties are indexed by exact value. Prefix queries binary search the sorted
+    list of properties, which is only brought up to date by the first prefix query after chains are added or
+    removed, so adding chains costs the same regardless of the number of properties already indexed.
+
+    Queries intersect the posting lists of all terms, starting with the smallest, so their cost is bound by the
+    most selective term rather than the number of chains in the index.
+    """
+
+    def __init__(self):
+        self.chains = {}
+        self.postings = {}
+        self.properties = {}
+        self._sorted_properties = []
+        self._new_properties = []
+        self._properties_removed = False
+        self._next_id = 0
+
+    def __repr__(self):
+        return '<{}(chains={}, postings={}>'.format(self.__class__.__name__, len(self.chains), len(self.postings))
+
+    def __len__(self):
+        return len(self.chains)
+
+    def __contains__(self, chain_id):
+        return chain_id in self.chains
+
+    def __getitem__(self, chain_id):
+        return self.chains[chain_id]
+
+    @property
+    def sorted_properties(self):
+        """
+        Sorted list of the distinct root property values of all chains, excluding `None`.
+
+        Properties added since the list was last sorted are appended and the list sorted again, which is linear
+        for a list that is already mostly sorted. After a property is removed the list is rebuilt.
+        """
+        if self._properties_removed:
+            self._sorted_properties = sorted(property for property in self.properties if property is not None)
+            self._new_properties = []
+            self._properties_removed = False
+        elif self._new_properties:
+            self._sorted_properties += self._new_properties
+            self._sorted_properties.sort()
+            self._new_properties = []
+        return self._sorted_properties
+
+    def add(self, chain):
+        """
+        Add the given chain to the index.
+
+        :param chain: Iterable of nodes, root first, e.g. the output of :func:`~pai_lang.parser.parse`, or the packed
+            `(node, edge, property)` tuples created by :func:`~pai_lang.syntax.pack`
+        :return: Id of the chain within the index
+        """
+        packed = syntax.pack(chain)
+        if not packed:
+            raise ValueError('chain must contain at least one node')
+
+        chain_id = self._next_id
+        self._next_id += 1
+        self.chains[chain_id] = packed
+
+        postings = self.postings
+        for key in _keys(packed):
+            ids = postings.get(key)
+            if ids is None:
+                ids = postings[key] = set()
+            ids.add(chain_id)
+
+        property = packed[0][2]
+        ids = self.properties.get(property)
+        if ids is None:
+            ids = self.properties[property] = set()
+            if property is not None:
+                self._new_properties.append(property)
+        ids.add(chain_id)
+
+        return chain_id
+
+    def add_many(self, chains):
+        """
+        Add each chain from the given iterable to the index, e.g. the output of :func:`~pai_lang.parser.parse_many`.
+
+        :param chains: Iterable of chains accepted by :meth:`~pai_lang.index.ExpressionIndex.add`
+        :return: List of ids of the chains within the index
+        """
+        return [self.add(chain) for chain in chains]
+
+    def remove(self, chain_id):
+        """
+        Remove the chain with the given id from the index.
+
+        :param chain_id: Id of the chain returned by :meth:`~pai_lang.index.ExpressionIndex.add`
+        :return: The packed chain that was removed
+        """
+        packed = self.chains.pop(chain_id)
+
+        postings = self.postings
+        for key in _keys(packed):
+            ids = postings[key]
+            ids.discard(chain_id)
+            if not ids:
+                del postings[key]
+
+        property = packed[0][2]
+        ids = self.properties[property]
+        ids.discard(chain_id)
+        if not ids:
+            del self.properties[property]
+            if property is not None:
+                self._properties_removed = True
+
+        return packed
+
+    def query(self, hops=(), property=None, property_prefix=None):
+        """
+        Find the ids of all chains that match every given term.
+
+        Each hop term is a `(position, node, edge)` tuple where `None` matches any position, node or edge. For
+        example, `(0, 'user', 'email')` matches chains whose root is "user:email:*" and `(None, 'workspace', 'any')`
+        matches chains that traverse "workspace" via "any" at any position.
+
+        :param hops: Iterable of `(position, node, edge)` tuples
+        :param property: Root property value to match exactly
+        :param property_prefix: Prefix the root property value must start with
+        :return: A :class:`~set` of chain ids; all ids if no terms are given
+        """
+        candidates = []
+
+        for position, node, edge in hops:
+            if node is not None and edge is not None:
+                key = (HOP_KEY, position, node, edge)
+            elif node is not None:
+                key = (NODE_KEY, position, node)
+            elif edge is not None:
+                key = (EDGE_KEY, position, edge)
+            else:
+                raise ValueError('hop term must specify a node and/or edge')
+            candidates.append(self.postings.get(key, _EMPTY))
+
+        if property is not None:
+            candidates.append(self.properties.get(property, _EMPTY))
+
+        if property_prefix is not None:
+            candidates.append(self._prefix_ids(property_prefix))
+
+        if not candidates:
+            return set(self.chains)
+
+        candidates.sort(key=len)
+        result = set(candidates[0])
+        for ids in candidates[1:]:
+            if not result:
+                break
+            result.intersection_update(ids)
+        return result
+
+    def _prefix_ids(self, prefix):
+        """
+        Return the ids of chains whose root property starts with the given prefix.
+        """
+        sorted_properties, properties = self.sorted_properties, self.properties
+        ids = set()
+        index = bisect.bisect_left(sorted_properties, prefix)
+        while index < len(sorted_properties) and sorted_properties[index].startswith(prefix):
+            ids.update(properties[sorted_properties[index]])
+            index += 1
+        return ids
+
+
+def _keys(packed):
+    """
+    Create the set of posting list keys of the given packed chain.
+    """
+    keys = set()
+    for position, (node, edge, _) in enumerate(packed):
+        for pos in (position, None):
+            keys.add((NODE_KEY, pos, node))
+            keys.add((EDGE_KEY, pos, edge))
+            keys.add((HOP_KEY, pos, node, edge))
+    return keys
@@ -0,0 +1,361 @@
+"""
+    pai_lang.instrument
+    ~~~~~~~~~~~~~~~~~~~
+
+    Module for opt-in instrumentation of the parse pipeline.
+
+    While enabled, :func:`~pai_lang.parser.parse`, :func:`~pai_lang.parser.parse_gen`,
+    :func:`~pai_lang.parser.parse_many` and :func:`~pai_lang.parser.parse_many_gen` run the same fast and
+    generic paths with timed wrappers passed in place of the functions of each stage, count what they do and time:
+        "tokenize": Splitting the data string into tokens.
+        "slice": Consuming the tokens of each node with :func:`~pai_lang.visitor.visit_node`; generic path only.
+        "visit": Interning the values of each node.
+        "link": Creating and linking nodes with :func:`~pai_lang.syntax.root` and :func:`~pai_lang.syntax.child`.
+
+    Results and errors are the same as while disabled. While disabled, the only cost is a single `None` check per
+    call, or per batch for the bulk functions.
+"""
+
+import collections
+import contextlib
+import threading
+import time
+
+from pai_lang import interning, parser, syntax, visitor
+from pai_parser import parser as generic_parser
+
+
+__all__ = ['Histogram', 'Instrumentation', 'Sample', 'enable', 'disable', 'enabled']
+
+
+STAGES = ('tokenize', 'slice', 'visit', 'link')
+
+# Kinds of errors counted per data string that fails to parse.
+ERROR_ROOT_TOKENS = 'root_tokens'
+ERROR_CHILD_TOKENS = 'child_tokens'
+ERROR_INVALID_INPUT = 'invalid_input'
+ERROR_LIMIT = 'limit'
+
+
+# Measurements of a single parsed data string passed to the callback of an
+# :class:`~pai_lang.instrument.Instrumentation`:
+#     nodes: Number of nodes created.
+#     tokens: Number of tokens consumed.
+#     error: Kind of error raised or `None`.
+#     timings: :class:`~dict` mapping each stage to the nanoseconds spent in it.
+Sample = collections.namedtuple('Sample', ['nodes', 'tokens', 'error', 'timings'])
+
+
+class Histogram:
+    """
+    Histogram of latencies in nanoseconds with power of two buckets.
+
+    Bucket `i` counts values `v` with `v.bit_length() == i`, i.e. `2 ** (i - 1) <= v < 2 ** i`.
+    """
+
+    __slots__ = ['buckets', 'count', 'total']
+
+    def __init__(self):
+        self.buckets = [0] * 65
+        self.count = 0
+        self.total = 0
+
+    def __repr__(self):
+        return '<{}(count={}, total={}>'.format(self.__class__.__name__, self.count, self.total)
+
+    def record(self, value):
+        """
+        Add a value to the histogram.
+
+        :param value: Non-negative number of nanoseconds
+        :return: `None`
+        """
+        self.buckets[value.bit_length()] += 1
+        self.count += 1
+        self.total += value
+
+    def percentile(self, q):
+        """
+        Estimate the given percentile as the upper bound of the bucket it falls into.
+
+        :param q: Percentile between 0 and 100
+        :return: Number of nanoseconds; zero if the histogram is empty
+        """
+        rank = self.count * q / 100
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return (1 << index) - 1
+        return 0
+
+    def snapshot(self):
+        """
+        Return the state of the histogram as plain values.
+
+        :return: A :class:`~dict` with "count", "total" and the non-empty "buckets" by upper bound
+        """
+        return {
+            'count': self.count,
+            'total': self.total,
+            'buckets': {(1 << index) - 1: count for index, count in enumerate(self.buckets) if count}
+        }
+
+
+class Instrumentation:
+    """
+    Counters and per-stage latency histograms of the parse pipeline.
+
+    :param callback: Optional function called with a :class:`~pai_lang.instrument.Sample` for every data string
+        parsed, e.g. to export measurements to a metrics system
+    :param clock: Function returning the current time in nanoseconds; default: :func:`~time.perf_counter_ns`
+    """
+
+    def __init__(self, callback=None, clock=time.perf_counter_ns):
+        self.callback = callback
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __repr__(self):
+        return '<{}(expressions={}, nodes={}>'.format(self.__class__.__name__, self.expressions, self.nodes)
+
+    def reset(self):
+        """
+        Reset all counters and histograms.
+
+        :return: `None`
+        """
+        with self._lock:
+            self.expressions = 0
+            self.nodes = 0
+            self.tokens = 0
+            self.errors = collections.Counter()
+            self.histograms = {stage: Histogram() for stage in STAGES}
+
+    def snapshot(self):
+        """
+        Return the current counters and histograms as plain values.
+
+        :return: A :class:`~dict` with "expressions", "nodes", "tokens", "errors" and "stages"
+        """
+        with self._lock:
+            return {
+                'expressions': self.expressions,
+                'nodes': self.nodes,
+                'tokens': self.tokens,
+                'errors': dict(self.errors),
+                'stages': {stage: histogram.snapshot() for stage, histogram in self.histograms.items()}
+            }
+
+    def parse(self, data, cls=syntax.Node, limits=None):
+        """
+        Instrumented :func:`~pai_lang.parser.parse`.
+        """
+        stages = _Stages(self.clock)
+        nodes = []
+        try:
+            if limits is not None:
+                parser._check_limits(data, limits)
+            if parser._supports_fast_path(data):
+                nodes, expected = parser._fast_parse(data, cls=cls, split=stages.split, intern=stages.intern,
+                                                     root=stages.root, child=stages.child)
+                if expected:
+                    raise parser._insufficient_tokens(expected)
+            else:
+                for node in self._generic_parse_gen(data, cls, stages):
+                    nodes.append(node)
+        except Exception as e:
+            self._record(len(nodes), e, stages)
+            raise
+        self._record(len(nodes), None, stages)
+        return nodes
+
+    def parse_gen(self, data, cls=syntax.Node, limits=None):
+        """
+        Instrumented :func:`~pai_lang.parser.parse_gen`.
+
+        Limits are checked, and a violation recorded, when this method is called. Other measurements are recorded
+        once the generator is exhausted, raises or is closed; time spent by the consumer between nodes is not
+        included.
+        """
+        stages = _Stages(self.clock)
+        if limits is not None:
+            try:
+                parser._check_limits(data, limits)
+            except Exception as e:
+                self._record(0, e, stages)
+                raise
+
+        if parser._supports_fast_path(data):
+            nodes = parser._fast_parse_gen(data, cls=cls, split=stages.split, intern=stages.intern,
+                                           root=stages.root, child=stages.child)
+        else:
+            nodes = self._generic_parse_gen(data, cls, stages)
+        return self._recorded_gen(nodes, stages)
+
+    def _recorded_gen(self, nodes, stages):
+        """
+        Generator function that yields the given nodes and records their measurements once it is exhausted, raises
+        or is closed.
+        """
+        count = 0
+        error = None
+        try:
+            for node in nodes:
+                count += 1
+                yield node
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._record(count, error, stages)
+
+    def parse_many_gen(self, iterable, errors=parser.ERRORS_RAISE, cls=syntax.Node):
+        """
+        Instrumented :func:`~pai_lang.parser.parse_many_gen`.
+        """
+        yield from parser._parse_each_gen(iterable, errors, lambda data: self.parse(data, cls))
+
+    @staticmethod
+    def _generic_parse_gen(data, cls, stages):
+        """
+        Generator function that yields nodes parsed by the generic path of :func:`~pai_lang.parser.parse_gen` with
+        the timed wrappers of the given stages.
+        """
+        hooked = visitor.Visitor(stages.visit_node, stages.intern, stages.root, stages.child)
+        stages.start()
+        nodes = generic_parser.parse_gen(data, hooked, syntax.DELIMITER, syntax.GROUP_SIZE, syntax.RTL)
+        if cls is not syntax.Node:
+            nodes = parser._relink_gen(nodes, cls, stages.root, stages.child)
+        return parser._invalid_input_gen(nodes, data)
+
+    def _record(self, count, error, stages):
+        """
+        Record the measurements of a single data string.
+
+        :param count: Number of nodes created
+        :param error: Exception raised while parsing or `None`
+        :param stages: The :class:`~pai_lang.instrument._Stages` the data string was parsed with
+        :return: `None`
+        """
+        if error is None:
+            kind = None
+        elif isinstance(error, syntax.LimitExceeded):
+            kind = ERROR_LIMIT
+        elif isinstance(error, syntax.SyntaxError) and not isinstance(error, syntax.InvalidInput):
+            kind = ERROR_CHILD_TOKENS if count else ERROR_ROOT_TOKENS
+        else:
+            kind = ERROR_INVALID_INPUT
+
+        timings = stages.finish()
+        consumed = syntax.ROOT_NODE_SIZE + syntax.CHILD_NODE_SIZE * (count - 1) if count else 0
+
+        with self._lock:
+            self.expressions += 1
+            self.nodes += count
+            self.tokens += consumed
+            if kind is not None:
+                self.errors[kind] += 1
+            for stage, value in timings.items():
+                self.histograms[stage].record(value)
+
+        if self.callback is not None:
+            self.callback(Sample(count, consumed, kind, timings))
+
+
+class _Stages:
+    """
+    Timings of a single data string and the timed wrappers of the functions of each stage that record them.
+
+    The generic tokenizer runs inside :func:`~pai_parser.parser.parse_gen` before the first node is visited, so it
+    is timed from :meth:`~pai_lang.instrument._Stages.start` until the first call to `visit_node`.
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.timings = dict.fromkeys(STAGES, 0)
+        self.started = None
+        self.split = self._timed('tokenize', str.split)
+        self._visit_node = self._timed('slice', visitor.visit_node)
+        self.visit_node = self._timed_visit_node
+        self.intern = self._timed('visit', interning.DEFAULT_INTERN)
+        self.root = self._timed('link', syntax.root)
+        self.child = self._timed('link', syntax.child)
+
+    def start(self):
+        """
+        Start timing the tokenizer of the generic path.
+        """
+        self.started = self.clock()
+
+    def finish(self):
+        """
+        Stop timing the tokenizer of the generic path, if still running, and return the timings.
+        """
+        if self.started is not None:
+            self.timings['tokenize'] += self.clock() - self.started
+            self.started = None
+        return self.timings
+
+    def _timed(self, stage, function):
+        """
+        Wrap the given function to add the time spent in each call to the timing of the given stage.
+        """
+        clock, timings = self.clock, self.timings
+
+        def timed(*args):
+            began = clock()
+            try:
+                return function(*args)
+            finally:
+                timings[stage] += clock() - began
+
+        return timed
+
+    def _timed_visit_node(self, *args):
+        """
+        Timed :func:`~pai_lang.visitor.visit_node` that also stops timing the tokenizer on its first call.
+        """
+        if self.started is not None:
+            self.finish()
+        return self._visit_node(*args)
+
+
+def enable(callback=None):
+    """
+    Enable instrumentation of the parse pipeline, replacing any :class:`~pai_lang.instrument.Instrumentation`
+    already enabled.
+
+    :param callback: Optional function called with a :class:`~pai_lang.instrument.Sample` per data string
+    :return: The enabled :class:`~pai_lang.instrument.Instrumentation` instance
+    """
+    instrumentation = Instrumentation(callback)
+    parser._instrumentation = instrumentation
+    return instrumentation
+
+
+def disable():
+    """
+    Disable instrumentation of the parse pipeline.
+
+    :return: The :class:`~pai_lang.instrument.Instrumentation` instance that was enabled or `None`
+    """
+    instrumentation, parser._instrumentation = parser._instrumentation, None
+    return instrumentation
+
+
+@contextlib.contextmanager
+def enabled(callback=None):
+    """
+    Context manager that enables instrumentation for the duration of the block.
+
+    :param callback: Optional function called with a :class:`~pai_lang.instrument.Sample` per data string
+    :return: Yields the enabled :class:`~pai_lang.instrument.Instrumentation` instance
+    """
+    previous = parser._instrumentation
+    instrumentation = enable(callback)
+    try:
+        yield instrumentation
+    finally:
+        parser._instrumentation = previous
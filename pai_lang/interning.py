@@ -0,0 +1,85 @@
+"""
+    pai_lang.interning
+    ~~~~~~~~~~~~~~~~~~
+
+    Module for sharing a single instance of repeated values and chains across parsed data strings.
+"""
+
+import sys
+
+from pai_lang import syntax
+
+
+__all__ = ['Interner']
+
+
+# Function used by the parser and visitor to intern "node" and "edge" values.
+DEFAULT_INTERN = sys.intern
+
+
+class Interner:
+    """
+    Table of canonical strings and hash-consed chains.
+
+    Calling the interner with a string returns the first equal string it has seen, so it can be used anywhere
+    :func:`~sys.intern` is accepted, e.g. the `intern` argument of the :mod:`~pai_lang.visitor` functions.
+
+    :meth:`~pai_lang.interning.Interner.intern_chain` returns the first structurally equal chain it has seen as a
+    tuple of :class:`~pai_lang.syntax.FrozenNode` instances. Identical chains are then the same object, so
+    deduplicating or grouping them is an identity check.
+    """
+
+    def __init__(self):
+        self.strings = {}
+        self.chains = {}
+
+    def __repr__(self):
+        return '<{}(strings={}, chains={}>'.format(self.__class__.__name__, len(self.strings), len(self.chains))
+
+    def __call__(self, value):
+        return self.intern(value)
+
+    def intern(self, value):
+        """
+        Return the canonical instance of the given value.
+
+        :param value: Hashable value to intern
+        :return: The first instance equal to `value` passed to this interner
+        """
+        return self.strings.setdefault(value, value)
+
+    def intern_chain(self, nodes):
+        """
+        Return the canonical frozen chain structurally equal to the given chain.
+
+        :param nodes: Iterable of nodes, root first, or packed tuples created by :func:`~pai_lang.syntax.pack`
+        :return: A :class:`~tuple` of :class:`~pai_lang.syntax.FrozenNode` instances
+        """
+        intern = self.strings.setdefault
+        key = tuple((intern(node, node), intern(edge, edge), property)
+                    for node, edge, property in _values(nodes))
+
+        chain = self.chains.get(key)
+        if chain is None:
+            chain = self.chains[key] = syntax.freeze(key)
+        return chain
+
+    def clear(self):
+        """
+        Remove all interned values and chains.
+
+        :return: `None`
+        """
+        self.strings.clear()
+        self.chains.clear()
+
+
+def _values(nodes):
+    """
+    Generator function that yields the `(node, edge, property)` values of each node in the given chain.
+    """
+    for node in nodes:
+        if isinstance(node, tuple):
+            yield node
+        else:
+            yield node.node, node.edge, node.property
@@ -0,0 +1,259 @@
+"""
+    pai_lang.lazy
+    ~~~~~~~~~~~~~
+
+    Module for parsing data strings into chains that only slice the source string when values are accessed.
+"""
+
+from pai_lang import interning, parser, syntax
+
+
+__all__ = ['LazyChain', 'LazyNode', 'parse_lazy']
+
+
+# Marks a value of a :class:`~pai_lang.lazy.LazyNode` that has not been sliced from the source yet.
+_UNSET = object()
+
+
+def parse_lazy(data, limits=None):
+    """
+    Create a :class:`~pai_lang.lazy.LazyChain` for the given data string.
+
+    Only the offsets of the root node are located up front; a malformed root raises a
+    :class:`~pai_lang.syntax.SyntaxError` immediately while a malformed child raises when it is first reached.
+    Limits are checked up front, before the root is located.
+
+    :param data: String to parse
+    :param limits: A :class:`~pai_lang.syntax.Limits` instance the data string is checked against before parsing;
+        default: no limits
+    :return: A :class:`~pai_lang.lazy.LazyChain` instance
+    """
+    if limits is not None:
+        parser._check_limits(data, limits)
+    return LazyChain(data)
+
+
+class LazyChain:
+    """
+    Sequence of the nodes of a single data string, root first, created as they are reached.
+
+    The source string is scanned right-to-left for delimiters, one node at a time, so a consumer that only looks
+    at the root never scans past it and pays the same cost for a chain of any depth. Nodes are
+    :class:`~pai_lang.lazy.LazyNode` views that record the offsets of their values and slice them from the source
+    on first access. Consumers that read every value of every node are better served by
+    :func:`~pai_lang.parser.parse`.
+
+    Strings containing characters that the generic tokenizer treats specially, or that are not a :class:`~str`,
+    are parsed eagerly by :func:`~pai_lang.parser.parse` and hold :class:`~pai_lang.syntax.Node` instances.
+    Taking the length of, or a negative index into, a chain reaches every node.
+    """
+
+    __slots__ = ['source', '_nodes', '_end', '_done', '_error']
+
+    def __init__(self, data):
+        self.source = data
+        self._nodes = []
+        self._error = None
+
+        if parser._supports_fast_path(data):
+            self._end = len(data)
+            self._done = False
+            self._next()
+        else:
+            self._nodes = parser.parse(data)
+            self._end = 0
+            self._done = True
+
+    def __repr__(self):
+        return '<{}(source={!r}, reached={}>'.format(self.__class__.__name__, self.source, len(self._nodes))
+
+    def __len__(self):
+        self._reach(None)
+        return len(self._nodes)
+
+    def __bool__(self):
+        return bool(self._nodes)
+
+    def __iter__(self):
+        nodes, index = self._nodes, 0
+        while True:
+            if index >= len(nodes):
+                self._reach(index)
+                if index >= len(nodes):
+                    return
+            yield nodes[index]
+            index += 1
+
+    def __getitem__(self, index):
+        nodes = self._nodes
+        if isinstance(index, int) and 0 <= index < len(nodes):
+            return nodes[index]
+        if isinstance(index, slice):
+            self._reach(None)
+            return self._nodes[index]
+        if index < 0:
+            self._reach(None)
+            return self._nodes[index]
+
+        node = self.get(index)
+        if node is None:
+            raise IndexError('chain index out of range')
+        return node
+
+    def get(self, index):
+        """
+        Return the node at the given position, creating the nodes up to it if not already reached.
+
+        :param index: Non-negative position of the node; zero is the root
+        :return: The node or `None` if the chain has fewer nodes
+        """
+        nodes = self._nodes
+        if index >= len(nodes):
+            self._reach(index)
+        return nodes[index] if index < len(nodes) else None
+
+    def _reach(self, index):
+        """
+        Create nodes until the given position, or every node when `index` is `None`, has been reached.
+        """
+        nodes = self._nodes
+        while not self._done and (index is None or index >= len(nodes)):
+            self._next()
+        if self._error is not None and (index is None or index >= len(nodes)):
+            raise self._error
+
+    def _next(self):
+        """
+        Locate the values of the next node, right-to-left, and append it to the chain.
+        """
+        token = self._token
+        nodes = self._nodes
+
+        if not nodes:
+            property = token()
+            if property is None:
+                self._done = True
+                return
+            edge, node = token(), token()
+            if node is None:
+                raise self._fail(syntax.ROOT_NODE_SIZE)
+            nodes.append(LazyNode(self, 0, syntax.ROOT_SENTINEL, node + edge + property))
+            return
+
+        edge = token()
+        if edge is None:
+            self._done = True
+            return
+        node = token()
+        if node is None:
+            raise self._fail(syntax.CHILD_NODE_SIZE)
+        nodes.append(LazyNode(self, len(nodes), nodes[-1], node + edge))
+
+    def _fail(self, expected):
+        """
+        Record the :class:`~pai_lang.syntax.SyntaxError` for a node that is missing tokens.
+
+        :return: The :class:`~pai_lang.syntax.SyntaxError` to raise
+        """
+        self._done = True
+        self._error = parser._insufficient_tokens(expected)
+        return self._error
+
+    def _token(self):
+        """
+        Find the offsets of the next non-empty token to the left of the scan position.
+
+        :return: A :class:`~tuple` of the start and end offsets or `None` if the source is exhausted
+        """
+        source, end = self.source, self._end
+        while end > 0:
+            start = source.rfind(syntax.DELIMITER, 0, end) + 1
+            if start < end:
+                self._end = start - 1
+                return start, end
+            end = start - 1
+        self._end = 0
+        return None
+
+
+class LazyNode:
+    """
+    Read-only view of a single node of a :class:`~pai_lang.lazy.LazyChain`.
+
+    Views expose the same values, links and flags as a :class:`~pai_lang.syntax.Node`. The "node", "edge" and
+    "property" values are sliced from the source string the first time they are accessed and the child is only
+    created when the `child` link is followed.
+    """
+
+    __slots__ = ['chain', 'index', 'parent', '_offsets', '_node', '_edge', '_property']
+
+    def __init__(self, chain, index, parent, offsets):
+        self.chain = chain
+        self.index = index
+        self.parent = parent
+        self._offsets = offsets
+        self._node = self._edge = self._property = _UNSET
+
+    def __repr__(self):
+        return '<{}(node={}, edge={}, property={}>'.format(self.__class__.__name__, self.node,
+                                                           self.edge, self.property)
+
+    @property
+    def node(self):
+        """
+        The entity/resource this node represents.
+        """
+        value = self._node
+        if value is _UNSET:
+            offsets = self._offsets
+            value = self._node = interning.DEFAULT_INTERN(self.chain.source[offsets[0]:offsets[1]])
+        return value
+
+    @property
+    def edge(self):
+        """
+        The relationship between this node and its property, or its parent if a child.
+        """
+        value = self._edge
+        if value is _UNSET:
+            offsets = self._offsets
+            value = self._edge = interning.DEFAULT_INTERN(self.chain.source[offsets[2]:offsets[3]])
+        return value
+
+    @property
+    def child(self):
+        """
+        The child node of this node or `None` if the last node of the chain.
+        """
+        return self.chain.get(self.index + 1)
+
+    @property
+    def is_root(self):
+        """
+        Flag to determine if this node is a "root" node.
+
+        :return: `True` if a root node, `False` otherwise
+        """
+        return self.parent is syntax.ROOT_SENTINEL
+
+    @property
+    def is_child(self):
+        """
+        Flag to determine if this node is a "child" node.
+
+        :return: `True` if a child node, `False` otherwise
+        """
+        return not self.is_root
+
+    # Defined last as it shadows the builtin :class:`~property` decorator within the class body.
+    @property
+    def property(self):
+        """
+        The piece of information that identifies the entity/resource; `None` for child nodes.
+        """
+        value = self._property
+        if value is _UNSET:
+            offsets = self._offsets
+            value = self.chain.source[offsets[4]:offsets[5]] if len(offsets) > 4 else None
+            self._property = value
+        return value
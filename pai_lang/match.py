@@ -0,0 +1,149 @@
+"""
+    pai_lang.match
+    ~~~~~~~~~~~~~~
+
+    Module for matching parsed chains against many patterns at once.
+"""
+
+from pai_lang import parser, syntax
+
+
+__all__ = ['PatternMatcher']
+
+
+# Pattern value that matches any "node", "edge" or "property" value.
+WILDCARD = '*'
+
+# Pattern "edge" value that matches any edge, as users already write it to mean "any discoverable relation".
+ANY_EDGE = syntax.ANY_EDGE
+
+
+class _TrieNode:
+    """
+    Single level of the pattern trie; one level per "node", "edge" or "property" value of a chain.
+    """
+
+    __slots__ = ['children', 'wildcard', 'ids']
+
+    def __init__(self):
+        self.children = {}
+        self.wildcard = None
+        self.ids = None
+
+
+class PatternMatcher:
+    """
+    Matches chains against a set of registered patterns in a single pass.
+
+    Patterns are written in the same language as the chains they match, e.g. "workspace:any:user:email:*", and
+    match chains with the same number of nodes. A value of "*" in a pattern matches any "node", "edge" or
+    "property" and an "edge" of "any" matches any edge.
+
+    Patterns are compiled into a trie keyed by the values of each node in parser order, root first, which is
+    right-to-left within the source string. Matching walks the trie once per chain, following the exact and the
+    wildcard branch at each level, so its cost depends on the chain and on how many patterns share wildcards
+    rather than on the total number of patterns.
+    """
+
+    def __init__(self, any_edge=True):
+        self.any_edge = any_edge
+        self.patterns = {}
+        self._root = _TrieNode()
+        self._next_id = 0
+
+    def __repr__(self):
+        return '<{}(patterns={}>'.format(self.__class__.__name__, len(self.patterns))
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def add(self, pattern, pattern_id=None):
+        """
+        Register a pattern.
+
+        :param pattern: Pattern string, or a chain of nodes or packed tuples as created by :func:`~pai_lang.syntax.pack`
+        :param pattern_id: Id returned when the pattern matches; default: the lowest unused integer
+        :return: The id of the pattern
+        """
+        if pattern_id is None:
+            while self._next_id in self.patterns:
+                self._next_id += 1
+            pattern_id = self._next_id
+        elif pattern_id in self.patterns:
+            raise ValueError('pattern id {} is already registered'.format(pattern_id))
+
+        node = self._root
+        for value in self._values(pattern, True):
+            if value is None:
+                if node.wildcard is None:
+                    node.wildcard = _TrieNode()
+                node = node.wildcard
+            else:
+                child = node.children.get(value)
+                if child is None:
+                    child = node.children[value] = _TrieNode()
+                node = child
+
+        if node is self._root:
+            raise ValueError('pattern must contain at least one node')
+
+        if node.ids is None:
+            node.ids = []
+        node.ids.append(pattern_id)
+        self.patterns[pattern_id] = pattern
+        return pattern_id
+
+    def match(self, chain):
+        """
+        Find all patterns that match the given chain.
+
+        :param chain: String to parse, or a chain of nodes or packed tuples as created by :func:`~pai_lang.syntax.pack`
+        :return: List of ids of matching patterns
+        """
+        values = list(self._values(chain, False))
+        if not values:
+            return []
+
+        matches = []
+        end = len(values)
+
+        # Depth-first walk of every trie branch consistent with the chain values.
+        stack = [(self._root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if depth == end:
+                if node.ids:
+                    matches.extend(node.ids)
+                continue
+            if node.wildcard is not None:
+                stack.append((node.wildcard, depth + 1))
+            child = node.children.get(values[depth])
+            if child is not None:
+                stack.append((child, depth + 1))
+
+        return matches
+
+    def _values(self, chain, is_pattern):
+        """
+        Generator function that yields the "node", "edge" and, for roots, "property" value of each node of a chain.
+
+        Pattern wildcards are yielded as `None`.
+        """
+        if isinstance(chain, (str, bytes)):
+            chain = parser.parse(chain)
+
+        for position, item in enumerate(chain):
+            if isinstance(item, tuple):
+                node, edge, property = item
+            else:
+                node, edge, property = item.node, item.edge, item.property
+
+            if is_pattern:
+                node = None if node == WILDCARD else node
+                edge = None if edge == WILDCARD or (self.any_edge and edge == ANY_EDGE) else edge
+                property = None if property == WILDCARD else property
+
+            yield node
+            yield edge
+            if not position:
+                yield property
@@ -0,0 +1,95 @@
+"""
+    pai_lang.parallel
+    ~~~~~~~~~~~~~~~~~
+
+    Module for parsing large collections of data strings across multiple processes.
+"""
+
+import collections
+import concurrent.futures
+import itertools
+import os
+
+from pai_lang import parser, syntax
+
+
+__all__ = ['parse_corpus']
+
+
+DEFAULT_CHUNKSIZE = 1024
+DEFAULT_PREFETCH = 2
+
+
+def parse_corpus(iterable, workers=None, chunksize=DEFAULT_CHUNKSIZE, errors=parser.ERRORS_RAISE,
+                 prefetch=DEFAULT_PREFETCH, limits=None):
+    """
+    Generator function that parses data strings across a pool of worker processes.
+
+    Results are returned in the order items were read from the iterable. Each chain is returned in the packed
+    form created by :func:`~pai_lang.syntax.pack`, which avoids pickling linked nodes between processes; use
+    :func:`~pai_lang.syntax.unpack` to link them again. Items that fail to parse are handled using the same
+    `errors` policy as :func:`~pai_lang.parser.parse_many_gen`.
+
+    At most `workers * prefetch` chunks are in flight at once so memory stays bounded regardless of the size
+    of the iterable.
+
+    :param iterable: Iterable that yields strings to parse
+    :param workers: Number of worker processes; default: number of processors on the machine
+    :param chunksize: Number of items sent to a worker process at a time
+    :param errors: Policy for items that fail to parse: "raise", "skip" or "yield" the error in place
+    :param prefetch: Number of chunks per worker to submit ahead of the one being consumed
+    :param limits: A :class:`~pai_lang.syntax.Limits` instance each data string is checked against before parsing;
+        default: no limits
+    :return: Yields packed chains, or errors, in the order items were read
+    """
+    if errors not in parser.ERROR_POLICIES:
+        raise ValueError('errors must be one of {}; got {}'.format(parser.ERROR_POLICIES, errors))
+    if chunksize < 1:
+        raise ValueError('chunksize must be greater than zero')
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * max(prefetch, 1)
+    chunks = _chunk_gen(iterable, chunksize)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = collections.deque()
+
+        for chunk in itertools.islice(chunks, max_pending):
+            pending.append(executor.submit(_parse_chunk, chunk, errors, limits))
+
+        while pending:
+            results = pending.popleft().result()
+            chunk = next(chunks, None)
+            if chunk is not None:
+                pending.append(executor.submit(_parse_chunk, chunk, errors, limits))
+            yield from results
+
+
+def _chunk_gen(iterable, n):
+    """
+    Generator function that yields lists of up to `n` items from the given iterable.
+
+    :param iterable: Iterable to split
+    :param n: Maximum number of items per chunk
+    :return: Yields lists of items until the iterable is exhausted
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, n))
+        if not chunk:
+            break
+        yield chunk
+
+
+def _parse_chunk(chunk, errors, limits=None):
+    """
+    Parse a chunk of data strings within a worker process.
+
+    :param chunk: List of strings to parse
+    :param errors: Policy for items that fail to parse
+    :param limits: A :class:`~pai_lang.syntax.Limits` instance each data string is checked against, or `None`
+    :return: List of packed chains, or errors, for the chunk
+    """
+    pack = syntax.pack
+    return [result if isinstance(result, syntax.SyntaxError) else pack(result)
+            for result in parser.parse_many_gen(chunk, errors, limits=limits)]
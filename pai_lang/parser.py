@@ -5,28 +5,968 @@
     Module for parsing shell-safe strings based on the language as defined by :mod:`~pai.syntax`.
 """
 
-from pai_lang import syntax, visitor
-from pai_parser import parser
+import array
+import collections
 
+from pai_lang import interning, syntax, visitor
+from pai_parser import parser, tokenizer
 
-__all__ = ['parse', 'parse_gen']
 
+__all__ = ['Parser', 'ValidationResult', 'extend', 'extend_gen', 'parse', 'parse_chain', 'parse_gen', 'parse_many',
+           'parse_many_gen', 'validate_many']
 
-def parse(data):
+
+# Characters the :mod:`~shlex` based tokenizer of :mod:`~pai_parser` treats as quotes/comments. Data strings
+# containing any of these must take the generic path to keep identical tokenization.
+LEXER_SPECIAL_CHARS = ('\'', '"', '#')
+
+# Policies for handling a :class:`~pai_lang.syntax.SyntaxError` raised by a single item of a batch.
+ERRORS_RAISE = 'raise'
+ERRORS_SKIP = 'skip'
+ERRORS_YIELD = 'yield'
+ERROR_POLICIES = (ERRORS_RAISE, ERRORS_SKIP, ERRORS_YIELD)
+
+# Status codes reported by :func:`~pai_lang.parser.validate_many` for each item.
+STATUS_OK = 0
+STATUS_ROOT_TOKENS = 1
+STATUS_CHILD_TOKENS = 2
+STATUS_INVALID_INPUT = 3
+STATUS_LIMIT_EXCEEDED = 4
+
+
+# Result of :func:`~pai_lang.parser.validate_many`:
+#     status: :class:`~array.array` holding the status code of every item, in order.
+#     indices: :class:`~array.array` holding the index of every item that failed to validate.
+#     offsets: :class:`~array.array` holding, for every failed item, the number of tokens consumed, right-to-left,
+#     by the nodes created before the failure.
+ValidationResult = collections.namedtuple('ValidationResult', ['status', 'indices', 'offsets'])
+
+# The enabled :class:`~pai_lang.instrument.Instrumentation`, if any; see :mod:`~pai_lang.instrument`.
+_instrumentation = None
+
+
+def parse(data, cls=syntax.Node, limits=None):
     """
     Create a list of nodes created by the visitor from the parsed data string.
 
     :param data: String to parse
+    :param cls: Type of node to create, e.g. :class:`~pai_lang.syntax.AcyclicNode`; default: `Node`
+    :param limits: A :class:`~pai_lang.syntax.Limits` instance the data string is checked against before parsing;
+        default: no limits
     :return: List of nodes created by visitor
     """
-    return list(parse_gen(data))
+    if _instrumentation is not None:
+        return _instrumentation.parse(data, cls, limits)
+
+    if limits is not None:
+        _check_limits(data, limits)
+
+    if _supports_fast_path(data):
+        nodes, expected = _fast_parse(data, cls=cls)
+        if expected:
+            raise _insufficient_tokens(expected)
+        return nodes
+
+    return list(parse_gen(data, cls))
+
+
+def parse_chain(data, cls=syntax.ChainNode, limits=None):
+    """
+    Create a :class:`~pai_lang.syntax.Chain` of the nodes parsed from the data string.
+
+    :param data: String to parse
+    :param cls: Type of node to create; default: :class:`~pai_lang.syntax.ChainNode` so each node knows its chain
+        and position
+    :param limits: A :class:`~pai_lang.syntax.Limits` instance the data string is checked against before parsing;
+        default: no limits
+    :return: A :class:`~pai_lang.syntax.Chain` instance, root first
+    """
+    return syntax.Chain(parse(data, cls, limits))
 
 
-def parse_gen(data):
+def parse_gen(data, cls=syntax.Node, limits=None):
     """
     Generator function that yields nodes created by the visitor from the parsed data string.
 
+    Data strings that can be split on the delimiter alone are parsed by a single pass specialized for our
+    syntax. Everything else falls back to the generic :func:`~pai_parser.parser.parse_gen`.
+
+    Limits are checked when this function is called, before the first node is created.
+
     :param data: String to parse
+    :param cls: Type of node to create, e.g. :class:`~pai_lang.syntax.AcyclicNode`; default: `Node`
+    :param limits: A :class:`~pai_lang.syntax.Limits` instance the data string is checked against before parsing;
+        default: no limits
     :return: List of nodes created by visitor
     """
-    return parser.parse_gen(data, visitor, syntax.DELIMITER, syntax.GROUP_SIZE, syntax.RTL)
+    if _instrumentation is not None:
+        return _instrumentation.parse_gen(data, cls, limits)
+
+    if limits is not None:
+        _check_limits(data, limits)
+
+    if _supports_fast_path(data):
+        return _fast_parse_gen(data, cls=cls)
+
+    nodes = parser.parse_gen(data, visitor, syntax.DELIMITER, syntax.GROUP_SIZE, syntax.RTL)
+    if cls is not syntax.Node:
+        nodes = _relink_gen(nodes, cls)
+    return _invalid_input_gen(nodes, data)
+
+
+def parse_many(iterable, errors=ERRORS_RAISE, cls=syntax.Node, limits=None):
+    """
+    Create a list containing the list of nodes parsed from each data string in the given iterable.
+
+    :param iterable: Iterable that yields strings to parse
+    :param errors: Policy for items that fail to parse: "raise", "skip" or "yield" the error in place
+    :param cls: Type of node to create, e.g. :class:`~pai_lang.syntax.AcyclicNode`; default: `Node`
+    :param limits: A :class:`~pai_lang.syntax.Limits` instance each data string is checked against before parsing;
+        default: no limits
+    :return: List of node lists, one per (non-skipped) item, in the order they were read
+    """
+    return list(parse_many_gen(iterable, errors, cls, limits))
+
+
+def parse_many_gen(iterable, errors=ERRORS_RAISE, cls=syntax.Node, limits=None):
+    """
+    Generator function that yields the list of nodes parsed from each data string in the given iterable.
+
+    Setup that :func:`~pai_lang.parser.parse` performs per call is done once for the whole batch. Items
+    that fail to parse are handled based on the `errors` policy:
+        "raise": Raise the :class:`~pai_lang.syntax.SyntaxError` and stop.
+        "skip": Silently drop the item.
+        "yield": Yield the :class:`~pai_lang.syntax.SyntaxError` in place of the node list. Errors with the same
+        message are yielded as the same instance.
+
+    Items that cannot be tokenized, e.g. with an unclosed quote, raise a :class:`~pai_lang.syntax.InvalidInput`
+    and items that exceed the `limits` raise a :class:`~pai_lang.syntax.LimitExceeded`; both are handled by the
+    same policy. Batches with limits are parsed one item at a time with :func:`~pai_lang.parser.parse`.
+
+    :param iterable: Iterable that yields strings to parse
+    :param errors: Policy for items that fail to parse: "raise", "skip" or "yield" the error in place
+    :param cls: Type of node to create, e.g. :class:`~pai_lang.syntax.AcyclicNode`; default: `Node`
+    :param limits: A :class:`~pai_lang.syntax.Limits` instance each data string is checked against before parsing;
+        default: no limits
+    :return: Yields node lists, or errors, in the order items were read
+    """
+    if errors not in ERROR_POLICIES:
+        raise ValueError('errors must be one of {}; got {}'.format(ERROR_POLICIES, errors))
+
+    if limits is not None:
+        yield from _parse_each_gen(iterable, errors, lambda data: parse(data, cls, limits))
+        return
+
+    if _instrumentation is not None:
+        yield from _instrumentation.parse_many_gen(iterable, errors, cls)
+        return
+
+    raise_errors = errors == ERRORS_RAISE
+    yield_errors = errors == ERRORS_YIELD
+    error_cache = {}
+
+    supports_fast_path = _supports_fast_path
+    fast_parse = _fast_parse
+    generic_parse_gen = parser.parse_gen
+    delimiter, group_size, rtl = syntax.DELIMITER, syntax.GROUP_SIZE, syntax.RTL
+    relink = cls is not syntax.Node
+
+    for data in iterable:
+        if supports_fast_path(data):
+            nodes, expected = fast_parse(data, cls=cls)
+            if not expected:
+                yield nodes
+                continue
+            if raise_errors:
+                raise _insufficient_tokens(expected)
+            if yield_errors:
+                error = error_cache.get(expected)
+                if error is None:
+                    error = error_cache[expected] = _insufficient_tokens(expected)
+                yield error
+            continue
+
+        try:
+            nodes = generic_parse_gen(data, visitor, delimiter, group_size, rtl)
+            yield list(_invalid_input_gen(_relink_gen(nodes, cls) if relink else nodes, data))
+        except syntax.SyntaxError as e:
+            if raise_errors:
+                raise
+            if yield_errors:
+                yield error_cache.setdefault(str(e), e)
+
+
+def extend(chain, prefix):
+    """
+    Create the chain of nodes for the given prefix prepended to the data string an existing chain was parsed from.
+
+    Only the tokens of the prefix are parsed; the nodes of the existing chain are shared with the returned list,
+    not copied, e.g. extending the chain of "user:email:x" by "workspace:any" returns the chain of
+    "workspace:any:user:email:x".
+
+    Each call copies the list of nodes of `chain`, so building a chain of N nodes one prefix at a time costs O(N)
+    per step; :func:`~pai_lang.parser.extend_gen` only creates the new nodes and builds it in O(N) total. A chain of
+    mutable nodes can only be extended once, see :func:`~pai_lang.parser.extend_gen`.
+
+    :param chain: List of nodes, root first, e.g. the output of :func:`~pai_lang.parser.parse`
+    :param prefix: String holding the "node" and "edge" of each new child, e.g. "settings:any:workspace:any"
+    :return: List of nodes, root first
+    """
+    nodes = list(chain)
+    if not nodes:
+        raise ValueError('chain must contain at least one node')
+    nodes.extend(extend_gen(nodes[-1], prefix))
+    return nodes
+
+
+def extend_gen(leaf, prefix):
+    """
+    Generator function that yields the nodes parsed from the given prefix as children of an existing node.
+
+    This is the incremental form of :func:`~pai_lang.parser.extend`: a builder that keeps the last node of its
+    chain, and only parses each new prefix, builds a chain of N nodes in O(N) total.
+
+    New nodes are of the same type as `leaf`. Mutable nodes are linked as the child of their parent, including
+    `leaf`, so a mutable `leaf` that already has a child raises a :class:`~ValueError` instead of being linked to
+    a second chain; :func:`~pai_lang.syntax.freeze` a chain to branch from it. :class:`~pai_lang.syntax.FrozenNode`
+    instances are not modified; new frozen nodes only link to their parent so a frozen chain can be extended any
+    number of times.
+
+    A prefix with a number of tokens that is not a multiple of :data:`~pai_lang.syntax.CHILD_NODE_SIZE`, or that
+    cannot be tokenized, raises a :class:`~pai_lang.syntax.SyntaxError` before any node is created, so `leaf` is
+    left unchanged.
+
+    :param leaf: Last node of an existing chain
+    :param prefix: String holding the "node" and "edge" of each new child
+    :return: Yields nodes, closest to `leaf` first
+    """
+    if _supports_fast_path(prefix):
+        tokens = prefix.split(syntax.DELIMITER)
+        if '' in tokens:
+            tokens = [token for token in tokens if token]
+    else:
+        tokens = list(_invalid_input_gen(tokenizer.tokenize_iter(prefix, syntax.DELIMITER), prefix))
+
+    child_size = syntax.CHILD_NODE_SIZE
+    if len(tokens) % child_size:
+        raise _insufficient_tokens(child_size)
+
+    frozen = isinstance(leaf, syntax.FrozenNode)
+    if tokens and not frozen and leaf.child is not None:
+        raise ValueError('leaf already has a child; freeze the chain to extend it more than once')
+
+    intern = interning.DEFAULT_INTERN
+    cls = type(leaf)
+
+    node = leaf
+    end = len(tokens)
+    while end:
+        start = end - child_size
+        if frozen:
+            node = syntax.FrozenNode(intern(tokens[start]), intern(tokens[start + 1]), None, node)
+        else:
+            node = syntax.child(intern(tokens[start]), intern(tokens[start + 1]), node, cls)
+        yield node
+        end = start
+
+
+def validate_many(iterable, limits=None):
+    """
+    Check whether each data string in the given iterable would parse, without raising or creating nodes.
+
+    Data strings are tokenized like :func:`~pai_lang.parser.parse` and their number of tokens checked by
+    :func:`~pai_lang.visitor.check_token_count`, the rules enforced by the visitor. With `limits`, each data string
+    is first checked against them like :func:`~pai_lang.parser.parse` does, so oversized input is rejected without
+    being split. Each item is given one of the following status codes:
+        :data:`~pai_lang.parser.STATUS_OK`: The item parses, possibly to no nodes if it has no tokens.
+        :data:`~pai_lang.parser.STATUS_ROOT_TOKENS`: There are too few tokens for the root node.
+        :data:`~pai_lang.parser.STATUS_CHILD_TOKENS`: There are too few tokens for a child node.
+        :data:`~pai_lang.parser.STATUS_INVALID_INPUT`: The item cannot be tokenized, e.g. it is not a string or has
+        an unclosed quote.
+        :data:`~pai_lang.parser.STATUS_LIMIT_EXCEEDED`: The item exceeds the `limits`.
+
+    :param iterable: Iterable that yields strings to validate
+    :param limits: A :class:`~pai_lang.syntax.Limits` instance each data string is checked against; default: no
+        limits
+    :return: A :class:`~pai_lang.parser.ValidationResult` instance
+    """
+    status = array.array('B')
+    indices = array.array('Q')
+    offsets = array.array('Q')
+
+    supports_fast_path = _supports_fast_path
+    check_token_count = visitor.check_token_count
+    delimiter = syntax.DELIMITER
+
+    for index, data in enumerate(iterable):
+        if limits is not None and not _within_limits(data, limits):
+            status.append(STATUS_LIMIT_EXCEEDED)
+            indices.append(index)
+            offsets.append(0)
+            continue
+
+        if supports_fast_path(data):
+            tokens = data.split(delimiter)
+            count = len(tokens) - tokens.count('')
+        else:
+            count = _generic_token_count(data)
+            if count is None:
+                status.append(STATUS_INVALID_INPUT)
+                indices.append(index)
+                offsets.append(0)
+                continue
+
+        expected, consumed = check_token_count(count)
+        if not expected:
+            status.append(STATUS_OK)
+            continue
+
+        status.append(STATUS_CHILD_TOKENS if consumed else STATUS_ROOT_TOKENS)
+        indices.append(index)
+        offsets.append(consumed)
+
+    return ValidationResult(status, indices, offsets)
+
+
+class Parser:
+    """
+    Parser for a single :class:`~pai_lang.syntax.Dialect`.
+
+    The dialect is validated and the code path used to parse it is chosen once, when the parser is created, so
+    many parsers for different dialects can be used side by side without changing module level settings:
+        Right-to-left dialects with a single character delimiter parse like :func:`~pai_lang.parser.parse`;
+        strings are split on the delimiter and only those containing quote or comment characters fall back to the
+        generic :mod:`~shlex` based tokenizer.
+        Every other dialect, e.g. multi-character delimiters or left-to-right, only splits on the delimiter and
+        does not support quoting.
+
+    :param dialect: A :class:`~pai_lang.syntax.Dialect` instance; default: :data:`~pai_lang.syntax.DEFAULT_DIALECT`
+    :param cls: Type of node to create, e.g. :class:`~pai_lang.syntax.AcyclicNode`; default: `Node`
+    :param limits: A :class:`~pai_lang.syntax.Limits` instance each data string is checked against before parsing;
+        default: no limits
+    """
+
+    def __init__(self, dialect=syntax.DEFAULT_DIALECT, cls=syntax.Node, limits=None):
+        if not isinstance(dialect, syntax.Dialect):
+            raise ValueError('dialect must be a Dialect instance; got {!r}'.format(dialect))
+        if limits is not None and not isinstance(limits, syntax.Limits):
+            raise ValueError('limits must be a Limits instance; got {!r}'.format(limits))
+
+        self.dialect = dialect
+        self.cls = cls
+        self.limits = limits
+        self.shell = _is_shell_dialect(dialect)
+
+        if dialect.rtl:
+            self._split_parse, self._split_parse_gen = _fast_parse, _fast_parse_gen
+        else:
+            self._split_parse, self._split_parse_gen = _fast_parse_ltr, _fast_parse_ltr_gen
+
+    def __repr__(self):
+        return '<{}(delimiter={}, rtl={}>'.format(self.__class__.__name__, self.dialect.delimiter, self.dialect.rtl)
+
+    def parse(self, data):
+        """
+        Create a list of nodes from the parsed data string.
+
+        :param data: String to parse
+        :return: List of nodes, root first
+        """
+        if self.limits is not None:
+            _check_limits(data, self.limits, self.dialect.delimiter, self.shell)
+
+        text = self._text(data)
+        if text is None:
+            return list(self._generic_parse_gen(data))
+
+        nodes, expected = self._split_parse(text, self.dialect.delimiter, cls=self.cls)
+        if expected:
+            raise _insufficient_tokens(expected)
+        return nodes
+
+    def parse_gen(self, data):
+        """
+        Generator function that yields nodes from the parsed data string.
+
+        :param data: String to parse
+        :return: Yields nodes, root first
+        """
+        if self.limits is not None:
+            _check_limits(data, self.limits, self.dialect.delimiter, self.shell)
+
+        text = self._text(data)
+        if text is None:
+            return self._generic_parse_gen(data)
+        return self._split_parse_gen(text, self.dialect.delimiter, cls=self.cls)
+
+    def parse_many(self, iterable, errors=ERRORS_RAISE):
+        """
+        Create a list containing the list of nodes parsed from each data string in the given iterable.
+
+        :param iterable: Iterable that yields strings to parse
+        :param errors: Policy for items that fail to parse: "raise", "skip" or "yield" the error in place
+        :return: List of node lists, one per (non-skipped) item, in the order they were read
+        """
+        return list(self.parse_many_gen(iterable, errors))
+
+    def parse_many_gen(self, iterable, errors=ERRORS_RAISE):
+        """
+        Generator function that yields the list of nodes parsed from each data string in the given iterable.
+
+        Items that fail to parse are handled as described by :func:`~pai_lang.parser.parse_many_gen`.
+
+        :param iterable: Iterable that yields strings to parse
+        :param errors: Policy for items that fail to parse: "raise", "skip" or "yield" the error in place
+        :return: Yields node lists, or errors, in the order items were read
+        """
+        if errors not in ERROR_POLICIES:
+            raise ValueError('errors must be one of {}; got {}'.format(ERROR_POLICIES, errors))
+
+        if self.limits is not None:
+            yield from _parse_each_gen(iterable, errors, self.parse)
+            return
+
+        raise_errors = errors == ERRORS_RAISE
+        yield_errors = errors == ERRORS_YIELD
+        error_cache = {}
+
+        text, split_parse, generic_parse_gen = self._text, self._split_parse, self._generic_parse_gen
+        delimiter, cls = self.dialect.delimiter, self.cls
+
+        for data in iterable:
+            data_text = text(data)
+            if data_text is not None:
+                nodes, expected = split_parse(data_text, delimiter, cls=cls)
+                if not expected:
+                    yield nodes
+                    continue
+                if raise_errors:
+                    raise _insufficient_tokens(expected)
+                if yield_errors:
+                    error = error_cache.get(expected)
+                    if error is None:
+                        error = error_cache[expected] = _insufficient_tokens(expected)
+                    yield error
+                continue
+
+            try:
+                yield list(generic_parse_gen(data))
+            except syntax.SyntaxError as e:
+                if raise_errors:
+                    raise
+                if yield_errors:
+                    yield error_cache.setdefault(str(e), e)
+
+    def _text(self, data):
+        """
+        Return the string to split for the given data, or `None` if it must be parsed by the generic tokenizer.
+        """
+        if self.shell:
+            return data if _supports_fast_path(data) else None
+        if isinstance(data, bytes):
+            return data.decode('utf-8')
+        if not isinstance(data, str):
+            raise ValueError('Expected bytes/str; got {}'.format(type(data)))
+        return data
+
+    def _generic_parse_gen(self, data):
+        """
+        Generator function that yields nodes parsed by the generic :func:`~pai_parser.parser.parse_gen`.
+        """
+        nodes = parser.parse_gen(data, visitor, self.dialect.delimiter, syntax.GROUP_SIZE, syntax.RTL)
+        if self.cls is not syntax.Node:
+            nodes = _relink_gen(nodes, self.cls)
+        return _invalid_input_gen(nodes, data)
+
+
+def _insufficient_tokens(n):
+    """
+    Create the :class:`~pai_lang.syntax.SyntaxError` raised when there are fewer than `n` tokens left for a node.
+
+    :param n: Number of tokens expected
+    :return: A :class:`~pai_lang.syntax.SyntaxError` instance
+    """
+    return syntax.SyntaxError('Insufficient tokens; expected {}'.format(n))
+
+
+def _invalid_input_gen(items, data):
+    """
+    Generator function that yields the items of the generic tokenizer or parser for the given data string.
+
+    The :class:`~ValueError` the tokenizer raises for a :class:`~str` or :class:`~bytes` data string it cannot
+    tokenize, e.g. one with an unclosed quote, is raised as a :class:`~pai_lang.syntax.InvalidInput` so it is
+    handled like any other :class:`~pai_lang.syntax.SyntaxError`. Other types still raise a
+    :class:`~ValueError`.
+
+    :param items: Iterable of tokens or nodes created from `data`
+    :param data: String the items are created from
+    :return: Yields the given items
+    """
+    try:
+        yield from items
+    except syntax.SyntaxError:
+        raise
+    except ValueError as e:
+        if not isinstance(data, (str, bytes)):
+            raise
+        raise _invalid_input(e) from e
+
+
+def _invalid_input(error):
+    """
+    Create the :class:`~pai_lang.syntax.InvalidInput` raised for a data string that cannot be tokenized or decoded.
+
+    :param error: The :class:`~ValueError` raised by the tokenizer or decoder
+    :return: A :class:`~pai_lang.syntax.InvalidInput` instance
+    """
+    return syntax.InvalidInput('Invalid input; {}'.format(error))
+
+
+def _generic_token_count(data):
+    """
+    Count the tokens created by the generic :mod:`~shlex` based tokenizer for the given data.
+
+    :param data: String to tokenize
+    :return: Number of tokens or `None` if the data cannot be tokenized
+    """
+    try:
+        return len(tokenizer.tokenize(data, syntax.DELIMITER))
+    except ValueError:
+        return None
+
+
+def _relink_gen(nodes, cls, root=syntax.root, child=syntax.child):
+    """
+    Generator function that yields a copy of each node from the given iterable as a `cls` instance.
+
+    :param nodes: Iterable of nodes, root first
+    :param cls: Type of node to create
+    :param root: Function that creates the "root" node, e.g. :func:`~pai_lang.syntax.root`
+    :param child: Function that creates each "child" node, e.g. :func:`~pai_lang.syntax.child`
+    :return: Yields linked `cls` instances, root first
+    """
+    parent = None
+    for node in nodes:
+        if parent is None:
+            parent = root(node.node, node.edge, node.property, cls)
+        else:
+            parent = child(node.node, node.edge, parent, cls)
+        yield parent
+
+
+def _parse_each_gen(iterable, errors, parse):
+    """
+    Generator function that parses each item of the iterable with the given function, handling errors based on the
+    `errors` policy of :func:`~pai_lang.parser.parse_many_gen`.
+
+    :param iterable: Iterable that yields strings to parse
+    :param errors: Policy for items that fail to parse: "raise", "skip" or "yield" the error in place
+    :param parse: Function that creates the list of nodes of a single data string
+    :return: Yields node lists, or errors, in the order items were read
+    """
+    raise_errors = errors == ERRORS_RAISE
+    yield_errors = errors == ERRORS_YIELD
+    error_cache = {}
+
+    for data in iterable:
+        try:
+            nodes = parse(data)
+        except syntax.SyntaxError as e:
+            if raise_errors:
+                raise
+            if yield_errors:
+                yield error_cache.setdefault((type(e), str(e)), e)
+            continue
+        yield nodes
+
+
+def _check_limits(data, limits, delimiter=syntax.DELIMITER, shell=True):
+    """
+    Check the given data string against the limits, scanning it only as far as needed to find a violation.
+
+    Tokens are found by the same rules the parser uses, without creating them. Strings are searched for the
+    delimiter one token at a time. Quote and comment characters only change how the generic :mod:`~shlex` based
+    tokenizer splits a string from where they appear, so when there are any before the violation, or anywhere in a
+    string without one, the string is scanned again by the rules of that tokenizer, which is just as bounded.
+    Input that is neither :class:`~str` nor :class:`~bytes`, or that the tokenizer rejects, e.g. has an unclosed
+    quote shorter than `max_token_length`, is left for the parser to reject.
+
+    :param data: String to check
+    :param limits: A :class:`~pai_lang.syntax.Limits` instance
+    :param delimiter: Delimiter values are separated by
+    :param shell: Flag indicating if strings with quote or comment characters use the generic tokenizer
+    :return: `None`
+    """
+    if not isinstance(data, (str, bytes)):
+        return
+
+    max_length, max_hops, max_token_length = limits
+    if max_length is not None and len(data) > max_length:
+        raise _length_exceeded(len(data), max_length)
+    if max_hops is None and max_token_length is None:
+        return
+
+    if isinstance(data, bytes):
+        try:
+            data = data.decode('utf-8')
+        except UnicodeDecodeError:
+            return
+
+    violation = _limit_violation(_token_spans_gen(data, delimiter, max_token_length), max_hops, max_token_length)
+    end = len(data) if violation is None else violation[1]
+    if shell and any(data.find(char, 0, end) != -1 for char in LEXER_SPECIAL_CHARS):
+        spans = _shell_token_spans_gen(data, delimiter, max_token_length)
+        violation = _limit_violation(spans, max_hops, max_token_length)
+
+    if violation is not None:
+        raise syntax.LimitExceeded(violation[0])
+
+
+def _within_limits(data, limits):
+    """
+    Check to see if the given data string is within the limits.
+
+    :param data: String to check
+    :param limits: A :class:`~pai_lang.syntax.Limits` instance
+    :return: `True` if :func:`~pai_lang.parser._check_limits` accepts the data string, `False` otherwise
+    """
+    try:
+        _check_limits(data, limits)
+    except syntax.LimitExceeded:
+        return False
+    return True
+
+
+def _length_exceeded(length, max_length):
+    """
+    Create the :class:`~pai_lang.syntax.LimitExceeded` raised for input longer than `max_length`.
+
+    :param length: Length of the input
+    :param max_length: Maximum length of the input
+    :return: A :class:`~pai_lang.syntax.LimitExceeded` instance
+    """
+    return syntax.LimitExceeded('Input length {} exceeds limit of {}'.format(length, max_length))
+
+
+def _limit_violation(spans, max_hops, max_token_length):
+    """
+    Find the first token that exceeds the limits.
+
+    :param spans: Iterable of `(length, end)` tuples for each token, in order
+    :param max_hops: Maximum number of nodes or `None`
+    :param max_token_length: Maximum length of a token or `None`
+    :return: A :class:`~tuple` of the error message and the end of the offending token, or `None`
+    """
+    max_tokens = None if max_hops is None else syntax.ROOT_NODE_SIZE + (max_hops - 1) * syntax.CHILD_NODE_SIZE
+
+    for count, (length, end) in enumerate(spans, 1):
+        if max_tokens is not None and count > max_tokens:
+            return 'Input exceeds limit of {} hops'.format(max_hops), end
+        if max_token_length is not None and length > max_token_length:
+            return 'Token exceeds limit of {} characters'.format(max_token_length), end
+
+    return None
+
+
+def _token_spans_gen(data, delimiter, max_token_length=None):
+    """
+    Generator function that yields the length and end of each non-empty token of the data string split on the
+    delimiter, without splitting the string.
+
+    With a `max_token_length`, each search for the next delimiter stops that far past the start of the token, so
+    a longer token is reported with a length of `max_token_length + 1` without scanning to its end.
+
+    :param data: String to scan
+    :param delimiter: Delimiter to split on
+    :param max_token_length: Length past which tokens are not scanned to their end; default: scan every token
+    :return: Yields `(length, end)` tuples in order
+    """
+    size, step = len(data), len(delimiter)
+    start = 0
+
+    while start < size:
+        if max_token_length is None:
+            end = data.find(delimiter, start)
+        else:
+            ceiling = start + max_token_length + step
+            end = data.find(delimiter, start, ceiling)
+            if end == -1 and ceiling < size:
+                yield max_token_length + 1, ceiling
+                return
+        if end == -1:
+            end = size
+        if end > start:
+            yield end - start, end
+        start = end + step
+
+
+def _shell_token_spans_gen(data, delimiter, max_token_length=None, quotes='\'"', comment='#'):
+    """
+    Generator function that yields the length and end of each token the generic :mod:`~shlex` based tokenizer
+    creates from the data string, without creating the tokens.
+
+    Follows the rules of :class:`~shlex.shlex` in non-POSIX mode with the delimiter as its only whitespace: a quote
+    at the start of a token starts a quoted token that ends with the matching quote, a comment character outside of
+    quotes skips the rest of its line, and every other character, including a quote within a token, belongs to the
+    current token. Each token is found with a few searches bound by `max_token_length`, so a longer token, or an
+    unclosed quote that is longer, is reported with a length of `max_token_length + 1` without scanning to its end.
+    An unclosed quote that is not longer ends the scan.
+
+    :param data: String to scan
+    :param delimiter: Single character delimiter to split on
+    :param max_token_length: Length past which tokens are not scanned to their end; default: scan every token
+    :param quotes: Characters that start and end a quoted token
+    :param comment: Character that starts a comment
+    :return: Yields `(length, end)` tuples in order
+    """
+    size = len(data)
+    position = 0
+
+    while position < size:
+        char = data[position]
+        if char == delimiter:
+            position += 1
+            continue
+        if char == comment:
+            newline = data.find('\n', position)
+            position = size if newline == -1 else newline + 1
+            continue
+
+        start = position
+        if char in quotes:
+            ceiling = size if max_token_length is None else min(size, start + max_token_length)
+            end = data.find(char, start + 1, ceiling)
+            if end != -1:
+                yield end + 1 - start, end + 1
+                position = end + 1
+                continue
+            if ceiling < size:
+                yield max_token_length + 1, ceiling + 1
+            return
+
+        # Comments within a token are skipped and the token continues on the next line.
+        length = 0
+        while True:
+            ceiling = size if max_token_length is None else min(size, position + max_token_length + 1 - length)
+            end = data.find(delimiter, position, ceiling)
+            skip = data.find(comment, position, ceiling if end == -1 else end)
+            if skip != -1:
+                length += skip - position
+                newline = data.find('\n', skip)
+                position = size if newline == -1 else newline + 1
+                if position < size:
+                    continue
+            elif end != -1:
+                length += end - position
+                position = end + 1
+            else:
+                length += ceiling - position
+                position = ceiling
+                if ceiling < size:
+                    yield length, ceiling
+                    return
+            yield length, position
+            break
+
+
+def _is_shell_dialect(dialect):
+    """
+    Check to see if the given dialect supports quoting by parsing like :func:`~pai_lang.parser.parse`.
+
+    :param dialect: A :class:`~pai_lang.syntax.Dialect` instance
+    :return: `True` if strings with quote or comment characters use the generic tokenizer, `False` otherwise
+    """
+    return dialect.rtl and len(dialect.delimiter) == 1 and dialect.delimiter not in LEXER_SPECIAL_CHARS
+
+
+def _supports_fast_path(data, special_chars=LEXER_SPECIAL_CHARS):
+    """
+    Check to see if the given data string can be parsed by :func:`~pai_lang.parser._fast_parse_gen`.
+
+    :param data: String to check
+    :param special_chars: Characters that require the generic tokenizer
+    :return: `True` if the fast path yields identical results, `False` otherwise
+    """
+    if not isinstance(data, str):
+        return False
+    for char in special_chars:
+        if char in data:
+            return False
+    return True
+
+
+def _fast_parse_gen(data, delimiter=syntax.DELIMITER, root_size=syntax.ROOT_NODE_SIZE,
+                    child_size=syntax.CHILD_NODE_SIZE, intern=interning.DEFAULT_INTERN, cls=syntax.Node,
+                    split=str.split, root=syntax.root, child=syntax.child):
+    """
+    Generator function that yields nodes by splitting the data string once and walking the tokens right-to-left.
+
+    Raises a :class:`~pai_lang.syntax.SyntaxError` at the same point, and with the same message, as
+    :func:`~pai_lang.visitor.visit_node` would for the generic path.
+
+    :param data: String to parse
+    :param delimiter: Delimiter to split on
+    :param root_size: Number of tokens that create a "root" node
+    :param child_size: Number of tokens that create a "child" node
+    :param intern: Function that returns the shared instance of the "node" and "edge" values
+    :param cls: Type of node to create
+    :param split: Function that splits the data string on the delimiter
+    :param root: Function that creates the "root" node, e.g. :func:`~pai_lang.syntax.root`
+    :param child: Function that creates each "child" node, e.g. :func:`~pai_lang.syntax.child`
+    :return: Yields nodes in the same order as :func:`~pai_parser.parser.parse_gen`
+    """
+    tokens = split(data, delimiter)
+
+    # The generic tokenizer treats the delimiter as whitespace so empty tokens are dropped.
+    if '' in tokens:
+        tokens = [token for token in tokens if token]
+
+    end = len(tokens)
+    if not end:
+        return
+
+    if end < root_size:
+        raise _insufficient_tokens(root_size)
+
+    start = end - root_size
+    node = root(intern(tokens[start]), intern(tokens[start + 1]), tokens[start + 2], cls)
+    yield node
+
+    end = start
+    while end:
+        if end < child_size:
+            raise _insufficient_tokens(child_size)
+        start = end - child_size
+        node = child(intern(tokens[start]), intern(tokens[start + 1]), node, cls)
+        yield node
+        end = start
+
+
+def _fast_parse(data, delimiter=syntax.DELIMITER, root_size=syntax.ROOT_NODE_SIZE,
+                child_size=syntax.CHILD_NODE_SIZE, intern=interning.DEFAULT_INTERN, cls=syntax.Node,
+                split=str.split, root=syntax.root, child=syntax.child):
+    """
+    Create a list of nodes by splitting the data string once and walking the tokens right-to-left.
+
+    Unlike :func:`~pai_lang.parser._fast_parse_gen`, malformed input is reported by return value instead of
+    raising so batch callers can decide how to handle it without the cost of exceptions.
+
+    :param data: String to parse
+    :param delimiter: Delimiter to split on
+    :param root_size: Number of tokens that create a "root" node
+    :param child_size: Number of tokens that create a "child" node
+    :param intern: Function that returns the shared instance of the "node" and "edge" values
+    :param cls: Type of node to create
+    :param split: Function that splits the data string on the delimiter
+    :param root: Function that creates the "root" node, e.g. :func:`~pai_lang.syntax.root`
+    :param child: Function that creates each "child" node, e.g. :func:`~pai_lang.syntax.child`
+    :return: A :class:`~tuple` of the list of nodes and the number of tokens expected by the node that could not
+    be created; zero if the string was parsed successfully
+    """
+    tokens = split(data, delimiter)
+
+    if '' in tokens:
+        tokens = [token for token in tokens if token]
+
+    end = len(tokens)
+    if not end:
+        return [], 0
+
+    if end < root_size:
+        return [], root_size
+
+    start = end - root_size
+    node = root(intern(tokens[start]), intern(tokens[start + 1]), tokens[start + 2], cls)
+    nodes = [node]
+
+    end = start
+    while end:
+        if end < child_size:
+            return nodes, child_size
+        start = end - child_size
+        node = child(intern(tokens[start]), intern(tokens[start + 1]), node, cls)
+        nodes.append(node)
+        end = start
+
+    return nodes, 0
+
+
+def _fast_parse_ltr_gen(data, delimiter=syntax.DELIMITER, root_size=syntax.ROOT_NODE_SIZE,
+                        child_size=syntax.CHILD_NODE_SIZE, intern=interning.DEFAULT_INTERN, cls=syntax.Node):
+    """
+    Generator function that yields nodes by splitting the data string once and walking the tokens left-to-right.
+
+    Mirrors :func:`~pai_lang.parser._fast_parse_gen` for dialects that write the root first.
+
+    :param data: String to parse
+    :param delimiter: Delimiter to split on
+    :param root_size: Number of tokens that create a "root" node
+    :param child_size: Number of tokens that create a "child" node
+    :param intern: Function that returns the shared instance of the "node" and "edge" values
+    :param cls: Type of node to create
+    :return: Yields nodes, root first
+    """
+    tokens = data.split(delimiter)
+
+    if '' in tokens:
+        tokens = [token for token in tokens if token]
+
+    end = len(tokens)
+    if not end:
+        return
+
+    if end < root_size:
+        raise _insufficient_tokens(root_size)
+
+    node = syntax.root(intern(tokens[0]), intern(tokens[1]), tokens[2], cls)
+    yield node
+
+    start = root_size
+    while start < end:
+        if end - start < child_size:
+            raise _insufficient_tokens(child_size)
+        node = syntax.child(intern(tokens[start]), intern(tokens[start + 1]), node, cls)
+        yield node
+        start += child_size
+
+
+def _fast_parse_ltr(data, delimiter=syntax.DELIMITER, root_size=syntax.ROOT_NODE_SIZE,
+                    child_size=syntax.CHILD_NODE_SIZE, intern=interning.DEFAULT_INTERN, cls=syntax.Node):
+    """
+    Create a list of nodes by splitting the data string once and walking the tokens left-to-right.
+
+    Mirrors :func:`~pai_lang.parser._fast_parse` for dialects that write the root first.
+
+    :param data: String to parse
+    :param delimiter: Delimiter to split on
+    :param root_size: Number of tokens that create a "root" node
+    :param child_size: Number of tokens that create a "child" node
+    :param intern: Function that returns the shared instance of the "node" and "edge" values
+    :param cls: Type of node to create
+    :return: A :class:`~tuple` of the list of nodes and the number of tokens expected by the node that could not
+    be created; zero if the string was parsed successfully
+    """
+    tokens = data.split(delimiter)
+
+    if '' in tokens:
+        tokens = [token for token in tokens if token]
+
+    end = len(tokens)
+    if not end:
+        return [], 0
+
+    if end < root_size:
+        return [], root_size
+
+    node = syntax.root(intern(tokens[0]), intern(tokens[1]), tokens[2], cls)
+    nodes = [node]
+
+    start = root_size
+    while start < end:
+        if end - start < child_size:
+            return nodes, child_size
+        node = syntax.child(intern(tokens[start]), intern(tokens[start + 1]), node, cls)
+        nodes.append(node)
+        start += child_size
+
+    return nodes, 0
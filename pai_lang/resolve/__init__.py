@@ -0,0 +1,20 @@
+"""
+    pai_lang.resolve
+    ~~~~~~~~~~~~~~~~
+
+    Package for resolving parsed chains to the resources they describe.
+"""
+
+from . import backend
+from .backend import *
+from . import batch
+from .batch import *
+from . import cache
+from .cache import *
+from . import memory
+from .memory import *
+from . import resolver
+from .resolver import *
+
+
+__all__ = backend.__all__ + batch.__all__ + cache.__all__ + memory.__all__ + resolver.__all__
@@ -0,0 +1,135 @@
+"""
+    pai_lang.resolve.backend
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Module that defines the interface between the chain resolver and the store holding the resources.
+"""
+
+import time
+
+
+__all__ = ['Backend', 'LatencyBackend', 'AsyncLatencyBackend']
+
+
+class Backend:
+    """
+    Interface of a store that chains are resolved against.
+
+    Resources are identified by hashable ids. Every resource has a type, matched against the "node" value of a
+    chain, and is found either by one of its attributes, for the root of a chain, or by its relations to other
+    resources, for each child of a chain. An "edge" value of :data:`~pai_lang.syntax.ANY_EDGE` matches any
+    attribute or relation.
+
+    The batch methods, :meth:`~pai_lang.resolve.backend.Backend.lookup_many` and
+    :meth:`~pai_lang.resolve.backend.Backend.traverse_many`, are used by
+    :func:`~pai_lang.resolve.batch.resolve_many` to resolve many chains with one call per level. By default they
+    call the single methods in turn; backends with a round-trip cost should override them. Backends used with
+    :func:`~pai_lang.resolve.batch.resolve_many_async` may implement the batch methods as coroutines.
+    """
+
+    def lookup(self, node, edge, property):
+        """
+        Find the resources of type `node` whose `edge` attribute has the value `property`.
+
+        :param node: Type of the resources to find
+        :param edge: Name of the attribute to match or :data:`~pai_lang.syntax.ANY_EDGE` for any attribute
+        :param property: Value of the attribute
+        :return: A :class:`~set` of resource ids
+        """
+        raise NotImplementedError('backend must implement lookup')
+
+    def traverse(self, node, edge, sources):
+        """
+        Find the resources of type `node` related to any of the given resources by the `edge` relation.
+
+        :param node: Type of the resources to find
+        :param edge: Name of the relation to follow or :data:`~pai_lang.syntax.ANY_EDGE` for any relation
+        :param sources: Iterable of resource ids to follow relations from
+        :return: A :class:`~set` of resource ids
+        """
+        raise NotImplementedError('backend must implement traverse')
+
+    def lookup_many(self, keys):
+        """
+        Find the resources for each of the given `(node, edge, property)` lookups.
+
+        :param keys: Iterable of distinct `(node, edge, property)` tuples
+        :return: A :class:`~dict` mapping each key to a :class:`~set` of resource ids
+        """
+        return {key: self.lookup(*key) for key in keys}
+
+    def traverse_many(self, keys):
+        """
+        Find the related resources for each of the given `(node, edge, source)` traversals.
+
+        :param keys: Iterable of distinct `(node, edge, source)` tuples, one per source resource
+        :return: A :class:`~dict` mapping each key to a :class:`~set` of resource ids
+        """
+        return {key: self.traverse(key[0], key[1], (key[2],)) for key in keys}
+
+
+class LatencyBackend(Backend):
+    """
+    Backend that wraps another and sleeps for a fixed latency on every call, to simulate a remote store.
+
+    :param backend: The :class:`~pai_lang.resolve.backend.Backend` answering the calls
+    :param latency: Seconds to sleep per call
+    """
+
+    def __init__(self, backend, latency):
+        self.backend = backend
+        self.latency = latency
+        self.calls = 0
+
+    def __repr__(self):
+        return '<{}(backend={!r}, latency={}>'.format(self.__class__.__name__, self.backend, self.latency)
+
+    def _wait(self):
+        self.calls += 1
+        time.sleep(self.latency)
+
+    def lookup(self, node, edge, property):
+        self._wait()
+        return self.backend.lookup(node, edge, property)
+
+    def traverse(self, node, edge, sources):
+        self._wait()
+        return self.backend.traverse(node, edge, sources)
+
+    def lookup_many(self, keys):
+        self._wait()
+        return self.backend.lookup_many(keys)
+
+    def traverse_many(self, keys):
+        self._wait()
+        return self.backend.traverse_many(keys)
+
+
+class AsyncLatencyBackend(LatencyBackend):
+    """
+    Backend that wraps another and implements the batch methods as coroutines that sleep for a fixed latency
+    without blocking the event loop.
+
+    :param backend: The :class:`~pai_lang.resolve.backend.Backend` answering the calls
+    :param latency: Seconds to sleep per call
+    """
+
+    async def lookup_many(self, keys):
+        self.calls += 1
+        await _sleep(self.latency)
+        return self.backend.lookup_many(keys)
+
+    async def traverse_many(self, keys):
+        self.calls += 1
+        await _sleep(self.latency)
+        return self.backend.traverse_many(keys)
+
+
+async def _sleep(seconds):
+    """
+    Sleep for the given number of seconds without blocking the event loop.
+
+    :mod:`~asyncio` is only imported once a coroutine runs, so importing :mod:`~pai_lang` does not load it.
+    """
+    import asyncio
+    await asyncio.sleep(seconds)
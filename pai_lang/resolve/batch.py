@@ -0,0 +1,104 @@
+"""
+    pai_lang.resolve.batch
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    Module that resolves many chains at once with deduplicated, batched calls to a backend.
+"""
+
+import inspect
+
+from pai_lang.resolve import resolver
+
+
+__all__ = ['resolve_many', 'resolve_many_async']
+
+
+def resolve_many(chains, backend):
+    """
+    Resolve each of the given chains to the ids of the resources described by its last node.
+
+    Chains are walked level by level from the root. At each level the distinct root lookups, or the distinct
+    `(node, edge, source)` traversals of every chain still being resolved, are collected and issued as a single
+    :meth:`~pai_lang.resolve.backend.Backend.lookup_many` or :meth:`~pai_lang.resolve.backend.Backend.traverse_many`
+    call, and the results are fanned back out to each chain. Resolving N chains of depth D takes at most D backend
+    calls rather than N × D.
+
+    :param chains: Iterable of strings to parse, or chains of nodes or packed tuples
+    :param backend: A :class:`~pai_lang.resolve.backend.Backend` instance
+    :return: List of :class:`~set` of resource ids, in the order of the given chains
+    """
+    walk = _walk(chains)
+    try:
+        method, keys = next(walk)
+        while True:
+            method, keys = walk.send(getattr(backend, method)(keys))
+    except StopIteration as e:
+        return e.value
+
+
+async def resolve_many_async(chains, backend):
+    """
+    Coroutine that resolves each of the given chains like :func:`~pai_lang.resolve.batch.resolve_many`.
+
+    The batch methods of the backend may be coroutines, in which case they are awaited.
+
+    :param chains: Iterable of strings to parse, or chains of nodes or packed tuples
+    :param backend: A :class:`~pai_lang.resolve.backend.Backend` instance
+    :return: List of :class:`~set` of resource ids, in the order of the given chains
+    """
+    walk = _walk(chains)
+    try:
+        method, keys = next(walk)
+        while True:
+            results = getattr(backend, method)(keys)
+            if inspect.isawaitable(results):
+                results = await results
+            method, keys = walk.send(results)
+    except StopIteration as e:
+        return e.value
+
+
+def _walk(chains):
+    """
+    Generator function that walks the given chains level by level.
+
+    Yields the name of the backend batch method and the distinct keys to call it with for each level, expects the
+    results of the call to be sent back and returns the resources of each chain.
+    """
+    packed = [resolver.as_packed(chain) for chain in chains]
+    if not all(packed):
+        raise ValueError('chain must contain at least one node')
+
+    results = [None] * len(packed)
+    if not packed:
+        return results
+
+    roots = yield 'lookup_many', list({chain[0] for chain in packed})
+    active = []
+    for i, chain in enumerate(packed):
+        results[i] = set(roots[chain[0]])
+        if len(chain) > 1 and results[i]:
+            active.append(i)
+
+    level = 1
+    while active:
+        keys = set()
+        for i in active:
+            node, edge, _ = packed[i][level]
+            keys.update((node, edge, source) for source in results[i])
+
+        related = yield 'traverse_many', list(keys)
+
+        remaining = []
+        for i in active:
+            node, edge, _ = packed[i][level]
+            resources = set()
+            for source in results[i]:
+                resources.update(related[(node, edge, source)])
+            results[i] = resources
+            if len(packed[i]) > level + 1 and resources:
+                remaining.append(i)
+        active = remaining
+        level += 1
+
+    return results
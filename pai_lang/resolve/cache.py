@@ -0,0 +1,224 @@
+"""
+    pai_lang.resolve.cache
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    Module that implements a cache of resolution results between chain resolution and a backend.
+"""
+
+import collections
+import sys
+import threading
+import time
+
+from pai_lang.resolve import resolver
+
+
+__all__ = ['ResolutionCacheInfo', 'ResolutionCache']
+
+
+DEFAULT_MAXSIZE = 4096
+
+
+class ResolutionCacheInfo(collections.namedtuple('ResolutionCacheInfo', [
+        'hits', 'misses', 'evictions', 'expirations', 'maxsize', 'maxbytes', 'currsize', 'currbytes'])):
+    """
+    Statistics of a :class:`~pai_lang.resolve.cache.ResolutionCache`.
+    """
+
+    __slots__ = ()
+
+    @property
+    def hit_rate(self):
+        """
+        Fraction of cached lookups that were answered from the cache; zero before the first lookup.
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ResolutionCache:
+    """
+    Least-recently-used cache of resolved chains, in front of a :class:`~pai_lang.resolve.backend.Backend`.
+
+    Entries are keyed on the canonical, packed form of a chain created by :func:`~pai_lang.syntax.pack`. Every
+    partial chain, from the root up to each of its nodes, is cached as it is resolved, so resolving
+    "workspace:any:user:email:x" stores and can reuse the result of "user:email:x". Each resolution that is
+    answered from the cache counts as a hit and each node resolved by the backend as a miss.
+
+    Entries expire `ttl` seconds after they are stored. Once more than `maxsize` entries, or more than `maxbytes`
+    bytes as estimated by :func:`~sys.getsizeof`, are stored the least recently used entries are evicted.
+
+    :param backend: The :class:`~pai_lang.resolve.backend.Backend` resolving chains that are not cached
+    :param maxsize: Maximum number of entries
+    :param maxbytes: Optional maximum estimated size of all entries, in bytes
+    :param ttl: Optional number of seconds an entry is valid for
+    :param clock: Function returning the current time in seconds; default: :func:`~time.monotonic`
+    """
+
+    def __init__(self, backend, maxsize=DEFAULT_MAXSIZE, maxbytes=None, ttl=None, clock=time.monotonic):
+        if maxsize < 1:
+            raise ValueError('maxsize must be greater than zero')
+        if maxbytes is not None and maxbytes < 1:
+            raise ValueError('maxbytes must be greater than zero')
+        if ttl is not None and ttl <= 0:
+            raise ValueError('ttl must be greater than zero')
+
+        self.backend = backend
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.currbytes = 0
+        self._entries = collections.OrderedDict()
+        self._keys_by_node = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return '<{}(maxsize={}, currsize={}>'.format(self.__class__.__name__, self.maxsize, len(self))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, chain):
+        return resolver.as_packed(chain) in self._entries
+
+    def resolve(self, chain):
+        """
+        Resolve the given chain to the ids of the resources described by its last node, reusing the cached result
+        of the longest partial chain.
+
+        :param chain: String to parse, or a chain of nodes or packed tuples as created by :func:`~pai_lang.syntax.pack`
+        :return: A :class:`~frozenset` of resource ids
+        """
+        packed = resolver.as_packed(chain)
+        if not packed:
+            raise ValueError('chain must contain at least one node')
+
+        with self._lock:
+            now = self.clock()
+            for length in range(len(packed), 0, -1):
+                resources = self._get(packed[:length], now)
+                if resources is not None:
+                    self.hits += 1
+                    break
+            else:
+                length, resources = 0, None
+
+        # Resolve the remaining nodes outside of the lock so slow backends do not serialize callers.
+        results = []
+        for position in range(length, len(packed)):
+            node, edge, property = packed[position]
+            if not position:
+                resources = frozenset(self.backend.lookup(node, edge, property))
+            elif resources:
+                resources = frozenset(self.backend.traverse(node, edge, resources))
+            results.append((packed[:position + 1], resources))
+
+        if results:
+            with self._lock:
+                self.misses += len(results)
+                now = self.clock()
+                for key, value in results:
+                    self._set(key, value, now)
+
+        return resources
+
+    def invalidate(self, node):
+        """
+        Remove every entry whose chain contains a node of the given type.
+
+        :param node: Type of node, e.g. "workspace"
+        :return: Number of entries removed
+        """
+        with self._lock:
+            keys = list(self._keys_by_node.get(node, ()))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def info(self):
+        """
+        Return the current statistics of this cache.
+
+        :return: A :class:`~pai_lang.resolve.cache.ResolutionCacheInfo` instance
+        """
+        with self._lock:
+            return ResolutionCacheInfo(self.hits, self.misses, self.evictions, self.expirations, self.maxsize,
+                                       self.maxbytes, len(self._entries), self.currbytes)
+
+    def clear(self):
+        """
+        Remove all entries from this cache and reset its statistics.
+
+        :return: `None`
+        """
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_node.clear()
+            self.hits = self.misses = self.evictions = self.expirations = self.currbytes = 0
+
+    def _get(self, key, now):
+        """
+        Return the cached resources for the given key, or `None` when it is not cached or has expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        resources, expires, _ = entry
+        if expires is not None and expires <= now:
+            self._remove(key)
+            self.expirations += 1
+            return None
+
+        self._entries.move_to_end(key)
+        return resources
+
+    def _set(self, key, resources, now):
+        """
+        Store the resources under the given key and evict entries until the cache is within its budget.
+        """
+        if key in self._entries:
+            self._remove(key)
+
+        size = _sizeof(key, resources)
+        expires = now + self.ttl if self.ttl is not None else None
+        self._entries[key] = (resources, expires, size)
+        self.currbytes += size
+        for node, _, _ in key:
+            keys = self._keys_by_node.get(node)
+            if keys is None:
+                keys = self._keys_by_node[node] = set()
+            keys.add(key)
+
+        entries, maxbytes = self._entries, self.maxbytes
+        while len(entries) > self.maxsize or (maxbytes is not None and self.currbytes > maxbytes and len(entries) > 1):
+            self._remove(next(iter(entries)))
+            self.evictions += 1
+
+    def _remove(self, key):
+        """
+        Remove the entry with the given key from the cache and its node type index.
+        """
+        _, _, size = self._entries.pop(key)
+        self.currbytes -= size
+        for node, _, _ in key:
+            keys = self._keys_by_node.get(node)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_node[node]
+
+
+def _sizeof(key, resources):
+    """
+    Estimate the number of bytes held by a cache entry.
+    """
+    size = sys.getsizeof(key) + sys.getsizeof(resources)
+    for value in resources:
+        size += sys.getsizeof(value)
+    return size
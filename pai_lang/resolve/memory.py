@@ -0,0 +1,126 @@
+"""
+    pai_lang.resolve.memory
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    Module that implements a reference, in-memory graph store for resolving chains.
+"""
+
+from pai_lang import syntax
+from pai_lang.resolve import backend
+
+
+__all__ = ['MemoryGraph']
+
+
+_EMPTY = frozenset()
+
+
+class MemoryGraph(backend.Backend):
+    """
+    In-memory graph of typed resources, their attributes and the relations between them.
+
+    Relations are symmetric: relating `a` to `b` by an edge also relates `b` to `a` by the same edge. Every
+    lookup and traversal is answered from an index built as resources and relations are added:
+        attributes: `(type, attribute, value)` and, for "any" lookups, `(type, value)` to resource ids.
+        adjacency: `(resource, edge, type)` to the ids of related resources of that type.
+        related: `(resource, type)` to the ids of resources of that type related by any edge, so "any" hops are a
+        single lookup instead of a search over every edge.
+    """
+
+    def __init__(self):
+        self.types = {}
+        self.attributes = {}
+        self.any_attributes = {}
+        self.adjacency = {}
+        self.related = {}
+        self.relation_count = 0
+
+    def __repr__(self):
+        return '<{}(resources={}, relations={}>'.format(self.__class__.__name__, len(self.types),
+                                                        self.relation_count)
+
+    def __len__(self):
+        return len(self.types)
+
+    def __contains__(self, resource):
+        return resource in self.types
+
+    def add(self, resource, type, **attributes):
+        """
+        Add a resource to the graph.
+
+        :param resource: Hashable id of the resource
+        :param type: Type of the resource, matched against the "node" value of chains
+        :param attributes: Attribute values of the resource, matched against the "edge" and "property" of chain roots
+        :return: `None`
+        """
+        if resource in self.types:
+            raise ValueError('resource {} already exists'.format(resource))
+
+        self.types[resource] = type
+        for name, value in attributes.items():
+            _index(self.attributes, (type, name, value), resource)
+            _index(self.any_attributes, (type, value), resource)
+
+    def relate(self, source, edge, target):
+        """
+        Relate two resources of the graph by the given edge.
+
+        :param source: Id of the first resource
+        :param edge: Name of the relation
+        :param target: Id of the second resource
+        :return: `None`
+        """
+        types = self.types
+        if source not in types or target not in types:
+            raise KeyError('both resources must be added before relating them')
+
+        for a, b in ((source, target), (target, source)):
+            _index(self.adjacency, (a, edge, types[b]), b)
+            _index(self.related, (a, types[b]), b)
+        self.relation_count += 1
+
+    def type_of(self, resource):
+        """
+        Return the type of the given resource.
+        """
+        return self.types[resource]
+
+    def lookup(self, node, edge, property):
+        if edge == syntax.ANY_EDGE:
+            return set(self.any_attributes.get((node, property), _EMPTY))
+        return set(self.attributes.get((node, edge, property), _EMPTY))
+
+    def traverse(self, node, edge, sources):
+        if edge == syntax.ANY_EDGE:
+            index, keys = self.related, ((source, node) for source in sources)
+        else:
+            index, keys = self.adjacency, ((source, edge, node) for source in sources)
+
+        targets = set()
+        for key in keys:
+            related = index.get(key)
+            if related:
+                targets.update(related)
+        return targets
+
+    def traverse_many(self, keys):
+        related, adjacency = self.related, self.adjacency
+        results = {}
+        for key in keys:
+            node, edge, source = key
+            if edge == syntax.ANY_EDGE:
+                results[key] = set(related.get((source, node), _EMPTY))
+            else:
+                results[key] = set(adjacency.get((source, edge, node), _EMPTY))
+        return results
+
+
+def _index(index, key, value):
+    """
+    Add the value to the set stored under the given key of the index.
+    """
+    values = index.get(key)
+    if values is None:
+        values = index[key] = set()
+    values.add(value)
@@ -0,0 +1,50 @@
+"""
+    pai_lang.resolve.resolver
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Module that executes parsed chains against a :class:`~pai_lang.resolve.backend.Backend`.
+"""
+
+from pai_lang import parser, syntax
+
+
+__all__ = ['resolve']
+
+
+def resolve(chain, backend):
+    """
+    Resolve the given chain to the ids of the resources described by its last node.
+
+    The root of the chain is resolved with :meth:`~pai_lang.resolve.backend.Backend.lookup` and each child with
+    :meth:`~pai_lang.resolve.backend.Backend.traverse` from the resources of its parent. Resolution stops early
+    once a node resolves to no resources.
+
+    :param chain: String to parse, or a chain of nodes or packed tuples as created by :func:`~pai_lang.syntax.pack`
+    :param backend: A :class:`~pai_lang.resolve.backend.Backend` instance
+    :return: A :class:`~set` of resource ids
+    """
+    packed = as_packed(chain)
+    if not packed:
+        raise ValueError('chain must contain at least one node')
+
+    node, edge, property = packed[0]
+    resources = backend.lookup(node, edge, property)
+
+    for node, edge, _ in packed[1:]:
+        if not resources:
+            break
+        resources = backend.traverse(node, edge, resources)
+
+    return resources
+
+
+def as_packed(chain):
+    """
+    Create the packed form of the given chain, parsing it first if it is a string.
+
+    :param chain: String to parse, or a chain of nodes or packed tuples as created by :func:`~pai_lang.syntax.pack`
+    :return: A :class:`~tuple` of `(node, edge, property)` tuples, root first
+    """
+    if isinstance(chain, (str, bytes)):
+        chain = parser.parse(chain)
+    return syntax.pack(chain)
@@ -0,0 +1,286 @@
+"""
+    pai_lang.serializer
+    ~~~~~~~~~~~~~~~~~~~
+
+    Module for writing chains of nodes back into data strings; the inverse of :mod:`~pai_lang.parser`.
+
+    Every string written is checked to parse back into the chain it was written from, so
+    `parse(dumps(chain))` returns nodes with the same values as `chain`. Values that cannot be written
+    unambiguously, e.g. empty strings or values containing the delimiter outside of quotes, raise a
+    :class:`~ValueError` instead of creating a string that parses into a different chain.
+"""
+
+import os
+
+from pai_lang import parser, stream, syntax
+from pai_parser import tokenizer
+
+
+__all__ = ['dumps', 'dump_many']
+
+
+def dumps(chain, dialect=syntax.DEFAULT_DIALECT):
+    """
+    Create the data string that describes the given chain.
+
+    :param chain: Any node of a linked chain, e.g. the leaf of a chain built with :func:`~pai_lang.syntax.root` and
+        :func:`~pai_lang.syntax.child`; or an iterable of nodes, root first, as returned by
+        :func:`~pai_lang.parser.parse`, or the packed `(node, edge, property)` tuples created by
+        :func:`~pai_lang.syntax.pack`
+    :param dialect: A :class:`~pai_lang.syntax.Dialect` instance; default: :data:`~pai_lang.syntax.DEFAULT_DIALECT`
+    :return: A :class:`~str` instance
+    """
+    _check_dialect(dialect)
+    return _dumps(chain, dialect.delimiter, dialect.rtl, parser._is_shell_dialect(dialect))
+
+
+def dump_many(chains, file, dialect=syntax.DEFAULT_DIALECT, chunksize=stream.DEFAULT_CHUNKSIZE,
+              encoding=stream.DEFAULT_ENCODING):
+    """
+    Write the data string of each chain in the given iterable as a line of the given file.
+
+    Lines are joined and written `chunksize` at a time, so the number of writes is independent of the number of
+    chains. The file can be read back with :func:`~pai_lang.stream.parse_file`.
+
+    :param chains: Iterable of chains accepted by :func:`~pai_lang.serializer.dumps`
+    :param file: Path to a file or a file object opened in binary or text mode
+    :param dialect: A :class:`~pai_lang.syntax.Dialect` instance; default: :data:`~pai_lang.syntax.DEFAULT_DIALECT`
+    :param chunksize: Number of lines written at once
+    :param encoding: Encoding of files and binary streams
+    :return: Number of chains written
+    """
+    _check_dialect(dialect)
+    if chunksize < 1:
+        raise ValueError('chunksize must be at least 1; got {}'.format(chunksize))
+
+    if isinstance(file, (str, bytes, os.PathLike)):
+        with open(file, 'wb') as f:
+            return _dump_lines(chains, f, dialect, chunksize, encoding)
+    return _dump_lines(chains, file, dialect, chunksize, encoding)
+
+
+def _dump_lines(chains, file, dialect, chunksize, encoding):
+    """
+    Write the data string of each chain as a line of the given file object in chunks of `chunksize` lines.
+    """
+    delimiter, rtl, shell = dialect.delimiter, dialect.rtl, parser._is_shell_dialect(dialect)
+    binary = not hasattr(file, 'encoding')
+    write = file.write
+    chunk = []
+    count = 0
+
+    for chain in chains:
+        chunk.append(chain)
+        if len(chunk) == chunksize:
+            write(_dump_chunk(chunk, count, delimiter, rtl, shell, binary, encoding))
+            count += chunksize
+            chunk.clear()
+
+    if chunk:
+        write(_dump_chunk(chunk, count, delimiter, rtl, shell, binary, encoding))
+        count += len(chunk)
+
+    return count
+
+
+def _dump_chunk(chunk, count, delimiter, rtl, shell, binary, encoding):
+    """
+    Create the newline terminated data strings of the given chains.
+
+    The chunk is checked as a whole: if the joined string has one delimiter between each pair of values, none
+    next to another or a newline, and no quote or comment characters, every line round trips. Otherwise each
+    chain is checked on its own, which also finds the index of the first one that cannot be written.
+
+    :param chunk: List of chains accepted by :func:`~pai_lang.serializer.dumps`
+    :param count: Number of chains written before this chunk, used to report the index of invalid chains
+    :param delimiter: Delimiter to join values with
+    :param rtl: Flag indicating if the root is written last
+    :param shell: Flag indicating if values with quote or comment characters are parsed by the generic tokenizer
+    :param binary: Flag indicating if the chunk is encoded
+    :param encoding: Encoding of the chunk when binary
+    :return: A :class:`~str` or :class:`~bytes` instance
+    """
+    lines = []
+    append, join = lines.append, delimiter.join
+    separators = 0
+    for chain in chunk:
+        tokens = _tokens(chain, rtl)
+        try:
+            append(join(tokens))
+        except TypeError:
+            _join(tokens, delimiter, count + len(lines))
+        separators += len(tokens) - 1
+
+    text = '\n'.join(lines)
+    if not _chunk_round_trips(text, lines, separators, delimiter, shell):
+        for index, chain in enumerate(chunk):
+            line = _dumps(chain, delimiter, rtl, shell, count + index)
+            if not line or '\n' in line or '\r' in line:
+                raise ValueError('chain {} cannot be written as a single, non-empty line'.format(count + index))
+
+    text += '\n'
+    return text.encode(encoding) if binary else text
+
+
+def _chunk_round_trips(text, lines, separators, delimiter, shell):
+    """
+    Check to see if every line of the given chunk parses back into the values it was joined from.
+
+    :param text: Lines joined by newlines
+    :param lines: List of data strings
+    :param separators: Number of delimiters joining values across all lines
+    :param delimiter: Delimiter values were joined with
+    :param shell: Flag indicating if values with quote or comment characters are parsed by the generic tokenizer
+    :return: `True` if every line round trips, `False` if lines must be checked one at a time
+    """
+    if len(delimiter) != 1 or '' in lines or '\r' in text or text.count('\n') != len(lines) - 1:
+        return False
+    if shell and ('"' in text or "'" in text or '#' in text):
+        return False
+    if text.count(delimiter) != separators:
+        return False
+    return not (delimiter * 2 in text or '\n' + delimiter in text or delimiter + '\n' in text or
+                text.startswith(delimiter) or text.endswith(delimiter))
+
+
+def _dumps(chain, delimiter, rtl, shell, index=None):
+    """
+    Create the data string that describes the given chain and check that it parses back into the same values.
+
+    :param chain: Chain accepted by :func:`~pai_lang.serializer.dumps`
+    :param delimiter: Delimiter to join values with
+    :param rtl: Flag indicating if the root is written last
+    :param shell: Flag indicating if values with quote or comment characters are parsed by the generic tokenizer
+    :param index: Index of the chain within a batch, included in error messages
+    :return: A :class:`~str` instance
+    """
+    tokens = _tokens(chain, rtl)
+    if not tokens:
+        return ''
+
+    text = _join(tokens, delimiter, index)
+
+    # Strings without quote or comment characters are split on the delimiter, so each value must be non-empty and
+    # free of it; a single character delimiter can be counted instead of splitting the string again.
+    if shell and ('"' in text or "'" in text or '#' in text):
+        try:
+            written = tokenizer.tokenize(text, delimiter) == tokens
+        except ValueError:
+            written = False
+    elif '' in tokens:
+        written = False
+    elif len(delimiter) == 1:
+        written = text.count(delimiter) == len(tokens) - 1
+    else:
+        written = text.split(delimiter) == tokens
+    if not written:
+        message = '{}cannot be written without changing its values; got {!r}'
+        raise ValueError(message.format(_chain_name(index), tokens))
+
+    return text
+
+
+def _join(tokens, delimiter, index=None):
+    """
+    Join the given values by the delimiter.
+    """
+    try:
+        return delimiter.join(tokens)
+    except TypeError:
+        raise ValueError('{}values must be strings; got {!r}'.format(_chain_name(index), tokens)) from None
+
+
+def _chain_name(index):
+    """
+    Name of the chain at the given index within a batch, used to start error messages.
+    """
+    return 'chain ' if index is None else 'chain {} '.format(index)
+
+
+def _tokens(chain, rtl):
+    """
+    Create the list of values of the given chain in the order they are written.
+
+    Values are written leaf first for right-to-left dialects, so the root and its property are the last tokens,
+    and root first otherwise.
+    """
+    if isinstance(chain, (list, tuple)):
+        nodes = chain
+    elif isinstance(chain, (syntax.Node, syntax.FrozenNode)):
+        nodes = _walk(chain)
+    else:
+        nodes = list(chain)
+    if not nodes:
+        return []
+
+    tokens = []
+    try:
+        if isinstance(nodes[0], tuple):
+            return _tuple_tokens(nodes, rtl)
+        if rtl:
+            for node in reversed(nodes):
+                tokens.append(node.node)
+                tokens.append(node.edge)
+            tokens.append(nodes[0].property)
+        else:
+            root = nodes[0]
+            tokens += (root.node, root.edge, root.property)
+            for node in nodes[1:]:
+                tokens.append(node.node)
+                tokens.append(node.edge)
+    except (AttributeError, TypeError):
+        # Chains mixing nodes and packed tuples.
+        return _tuple_tokens(syntax.pack(nodes), rtl)
+
+    return tokens
+
+
+def _tuple_tokens(values, rtl):
+    """
+    Create the list of values of the given packed chain in the order they are written.
+    """
+    tokens = []
+    if rtl:
+        for node, edge, _ in reversed(values):
+            tokens.append(node)
+            tokens.append(edge)
+        tokens.append(values[0][2])
+    else:
+        tokens += values[0]
+        for node, edge, _ in values[1:]:
+            tokens.append(node)
+            tokens.append(edge)
+    return tokens
+
+
+def _walk(node):
+    """
+    Create the list of nodes, root first, of the chain the given node is linked into.
+
+    Nodes of a :class:`~pai_lang.syntax.Chain` return it as-is. Other nodes are walked down to the leaf by their
+    `child` links and then up to the root by their `parent` links, as the `child` links of
+    :class:`~pai_lang.syntax.AcyclicNode` do not keep the rest of the chain alive.
+    """
+    if isinstance(node, syntax.ChainNode) and node.chain is not None:
+        return node.chain
+
+    while node.child is not None:
+        node = node.child
+
+    nodes = [node]
+    while not node.is_root:
+        node = node.parent
+        if node is None:
+            raise ValueError('chain is not linked to a root node')
+        nodes.append(node)
+    nodes.reverse()
+
+    return nodes
+
+
+def _check_dialect(dialect):
+    """
+    Check the given dialect is a :class:`~pai_lang.syntax.Dialect` instance.
+    """
+    if not isinstance(dialect, syntax.Dialect):
+        raise ValueError('dialect must be a Dialect instance; got {!r}'.format(dialect))
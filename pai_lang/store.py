@@ -0,0 +1,239 @@
+"""
+    pai_lang.store
+    ~~~~~~~~~~~~~~
+
+    Module that implements a compact, array-backed container for large numbers of parsed chains.
+"""
+
+import array
+
+from pai_lang import syntax
+
+
+__all__ = ['ChainStore', 'NodeView']
+
+
+# Type codes of the arrays holding string ids and node offsets.
+ID_TYPECODE = 'I'
+OFFSET_TYPECODE = 'Q'
+
+
+class NodeView:
+    """
+    Lightweight, read-only view of a single node held by a :class:`~pai_lang.store.ChainStore`.
+
+    Views expose the same values, links and flags as a :class:`~pai_lang.syntax.Node` but are created on demand
+    and only hold a reference to the store and their position within it.
+    """
+
+    __slots__ = ['store', 'chain', 'index']
+
+    def __init__(self, store, chain, index):
+        self.store = store
+        self.chain = chain
+        self.index = index
+
+    def __repr__(self):
+        return '<{}(node={}, edge={}, property={}>'.format(self.__class__.__name__, self.node,
+                                                           self.edge, self.property)
+
+    @property
+    def node(self):
+        """
+        The entity/resource this node represents.
+        """
+        store = self.store
+        return store.strings[store.nodes[self.index]]
+
+    @property
+    def edge(self):
+        """
+        The relationship between this node and its property, or its parent if a child.
+        """
+        store = self.store
+        return store.strings[store.edges[self.index]]
+
+    @property
+    def parent(self):
+        """
+        The parent :class:`~pai_lang.store.NodeView` of this node or the root sentinel if a root node.
+        """
+        if self.is_root:
+            return syntax.ROOT_SENTINEL
+        return NodeView(self.store, self.chain, self.index - 1)
+
+    @property
+    def child(self):
+        """
+        The child :class:`~pai_lang.store.NodeView` of this node or `None` if the last node of the chain.
+        """
+        index = self.index + 1
+        if index == self.store.offsets[self.chain + 1]:
+            return None
+        return NodeView(self.store, self.chain, index)
+
+    @property
+    def is_root(self):
+        """
+        Flag to determine if this node is a "root" node.
+
+        :return: `True` if a root node, `False` otherwise
+        """
+        return self.index == self.store.offsets[self.chain]
+
+    @property
+    def is_child(self):
+        """
+        Flag to determine if this node is a "child" node.
+
+        :return: `True` if a child node, `False` otherwise
+        """
+        return not self.is_root
+
+    # Defined last as it shadows the builtin :class:`~property` decorator within the class body.
+    @property
+    def property(self):
+        """
+        The piece of information that identifies the entity/resource; `None` for child nodes.
+        """
+        if not self.is_root:
+            return None
+        store = self.store
+        return store.strings[store.properties[self.chain]]
+
+
+class ChainStore:
+    """
+    Container that holds parsed chains as parallel arrays instead of linked :class:`~pai_lang.syntax.Node` objects.
+
+    Every distinct string is stored once in `strings` and referenced by its integer id. Each node of every chain
+    is a single entry in the `nodes` and `edges` arrays; the property of each chain's root is an entry in the
+    `properties` array. The `offsets` array holds the position of the first node of each chain plus a final
+    entry marking the end of the last chain.
+    """
+
+    def __init__(self, chains=None):
+        self.strings = [None]
+        self.string_ids = {None: 0}
+        self.nodes = array.array(ID_TYPECODE)
+        self.edges = array.array(ID_TYPECODE)
+        self.properties = array.array(ID_TYPECODE)
+        self.offsets = array.array(OFFSET_TYPECODE, [0])
+        if chains is not None:
+            self.extend(chains)
+
+    def __repr__(self):
+        return '<{}(chains={}, nodes={}, strings={}>'.format(self.__class__.__name__, len(self),
+                                                             len(self.nodes), len(self.strings) - 1)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        return self.chain(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.chain(index)
+
+    def append(self, chain):
+        """
+        Add a chain to the store.
+
+        :param chain: Iterable of nodes, root first, or the packed `(node, edge, property)` tuples created by
+            :func:`~pai_lang.syntax.pack`
+        :return: Index of the chain within the store
+        """
+        index = self._append(chain)
+        if index is None:
+            raise ValueError('chain must contain at least one node')
+        return index
+
+    def extend(self, chains):
+        """
+        Add each chain from the given iterable to the store, e.g. the output of :func:`~pai_lang.parser.parse_many`.
+
+        Empty chains, e.g. those :func:`~pai_lang.parser.parse_many` creates for empty strings, are skipped, so the
+        index of each chain within the store does not necessarily match its position within the iterable.
+
+        :param chains: Iterable of chains accepted by :meth:`~pai_lang.store.ChainStore.append`
+        :return: `None`
+        """
+        append = self._append
+        for chain in chains:
+            append(chain)
+
+    def _append(self, chain):
+        """
+        Add a chain to the store unless it is empty.
+
+        :param chain: Chain accepted by :meth:`~pai_lang.store.ChainStore.append`
+        :return: Index of the chain within the store or `None` if the chain is empty
+        """
+        intern = self._intern
+        node_ids, edge_ids = [], []
+        property = None
+
+        for item in chain:
+            if isinstance(item, tuple):
+                node, edge, prop = item
+            else:
+                node, edge, prop = item.node, item.edge, item.property
+            if not node_ids:
+                property = prop
+            node_ids.append(intern(node))
+            edge_ids.append(intern(edge))
+
+        if not node_ids:
+            return None
+
+        self.nodes.extend(node_ids)
+        self.edges.extend(edge_ids)
+        self.properties.append(intern(property))
+        self.offsets.append(len(self.nodes))
+        return len(self) - 1
+
+    def chain(self, index):
+        """
+        Create views over the nodes of the chain at the given index.
+
+        :param index: Index of the chain; negative values count from the end
+        :return: List of :class:`~pai_lang.store.NodeView` instances, root first
+        """
+        index = self._chain_index(index)
+        return [NodeView(self, index, i) for i in range(self.offsets[index], self.offsets[index + 1])]
+
+    def packed(self, index):
+        """
+        Create the packed form of the chain at the given index.
+
+        :param index: Index of the chain; negative values count from the end
+        :return: A :class:`~tuple` of `(node, edge, property)` tuples as created by :func:`~pai_lang.syntax.pack`
+        """
+        index = self._chain_index(index)
+        strings, nodes, edges = self.strings, self.nodes, self.edges
+        start, end = self.offsets[index], self.offsets[index + 1]
+        property = strings[self.properties[index]]
+        return tuple((strings[nodes[i]], strings[edges[i]], property if i == start else None)
+                     for i in range(start, end))
+
+    def _chain_index(self, index):
+        """
+        Normalize and bounds check the given chain index.
+        """
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError('chain index out of range')
+        return index
+
+    def _intern(self, value):
+        """
+        Return the id of the given string, adding it to the string table if not already present.
+        """
+        string_id = self.string_ids.get(value)
+        if string_id is None:
+            string_id = self.string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
@@ -0,0 +1,239 @@
+"""
+    pai_lang.stream
+    ~~~~~~~~~~~~~~~
+
+    Module for parsing newline-delimited data strings from files and streams.
+"""
+
+import io
+import itertools
+import mmap
+import os
+import stat
+
+from pai_lang import parser, syntax
+
+
+__all__ = ['StreamLimitExceeded', 'StreamSyntaxError', 'parse_file']
+
+
+DEFAULT_CHUNKSIZE = 1024
+DEFAULT_ENCODING = 'utf-8'
+
+
+class StreamSyntaxError(syntax.SyntaxError):
+    """
+    Exception raised when a line of a stream cannot be properly converted into an object representation.
+
+    The `lineno` attribute is the one-based line number and `offset` is the byte offset of the start of the line
+    within the stream; for streams opened in text mode it is the character offset instead.
+    """
+
+    def __init__(self, message, lineno, offset):
+        super().__init__('line {}, offset {}: {}'.format(lineno, offset, message))
+        self.lineno = lineno
+        self.offset = offset
+
+
+class StreamLimitExceeded(StreamSyntaxError, syntax.LimitExceeded):
+    """
+    Exception raised when a line of a stream exceeds the :class:`~pai_lang.syntax.Limits` it is parsed with.
+    """
+
+
+def parse_file(file, errors=parser.ERRORS_RAISE, cls=syntax.Node, chunksize=DEFAULT_CHUNKSIZE,
+               encoding=DEFAULT_ENCODING, limits=None):
+    """
+    Generator function that yields the list of nodes parsed from each line of the given file.
+
+    Regular files are memory mapped and scanned for newlines in place, so only the lines being parsed are held
+    as Python strings and memory stays bounded regardless of the size of the file. Other streams, e.g.
+    :data:`~sys.stdin` or sockets, are read line by line. Empty lines are ignored.
+
+    Lines that fail to parse are handled based on the `errors` policy of :func:`~pai_lang.parser.parse_many_gen`
+    and are reported as a :class:`~pai_lang.stream.StreamSyntaxError` with their line number and offset. Lines
+    that exceed the `limits` are reported as a :class:`~pai_lang.stream.StreamLimitExceeded`. Lines longer than
+    `max_length` are rejected before they are copied or decoded, so memory stays bounded by the limit; like
+    :class:`~bytes` data strings, their length is the number of bytes unless the file is read in text mode.
+
+    :param file: Path to a file or a file object opened in binary or text mode
+    :param errors: Policy for lines that fail to parse: "raise", "skip" or "yield" the error in place
+    :param cls: Type of node to create; default: :class:`~pai_lang.syntax.Node`
+    :param chunksize: Number of lines parsed as a single batch
+    :param encoding: Encoding of files and binary streams
+    :param limits: A :class:`~pai_lang.syntax.Limits` instance each line is checked against before parsing;
+        default: no limits
+    :return: Yields node lists, or errors, in the order lines were read
+    """
+    if errors not in parser.ERROR_POLICIES:
+        raise ValueError('errors must be one of {}; got {}'.format(parser.ERROR_POLICIES, errors))
+
+    max_length = None if limits is None else limits.max_length
+    if isinstance(file, (str, bytes, os.PathLike)):
+        with open(file, 'rb') as f:
+            yield from _parse_lines(_file_lines_gen(f, encoding, max_length), errors, cls, chunksize, limits)
+    else:
+        yield from _parse_lines(_file_lines_gen(file, encoding, max_length), errors, cls, chunksize, limits)
+
+
+def _parse_lines(lines, errors, cls, chunksize, limits=None):
+    """
+    Generator function that parses `(lineno, offset, line)` tuples in batches of `chunksize` lines.
+    """
+    while True:
+        chunk = list(itertools.islice(lines, chunksize))
+        if not chunk:
+            break
+        yield from _apply_errors(_parse_chunk(chunk, cls, limits), errors)
+
+
+def _parse_chunk(chunk, cls, limits=None):
+    """
+    Parse a chunk of `(lineno, offset, line)` tuples.
+
+    :param chunk: List of `(lineno, offset, line)` tuples; `line` is the :class:`~pai_lang.syntax.SyntaxError`
+        of lines that were rejected while reading them
+    :param cls: Type of node to create
+    :param limits: A :class:`~pai_lang.syntax.Limits` instance each line is checked against, or `None`
+    :return: List of node lists, with a :class:`~pai_lang.stream.StreamSyntaxError` in place of each line that
+    failed to parse
+    """
+    parsed = parser.parse_many_gen((line for _, _, line in chunk if isinstance(line, str)), parser.ERRORS_YIELD,
+                                   cls, limits)
+    results = []
+    for lineno, offset, line in chunk:
+        result = next(parsed) if isinstance(line, str) else line
+        results.append(_stream_error(result, lineno, offset) if isinstance(result, syntax.SyntaxError) else result)
+    return results
+
+
+def _stream_error(error, lineno, offset):
+    """
+    Create the :class:`~pai_lang.stream.StreamSyntaxError` reporting the given error of a line.
+    """
+    if isinstance(error, syntax.LimitExceeded):
+        return StreamLimitExceeded(error, lineno, offset)
+    return StreamSyntaxError(error, lineno, offset)
+
+
+def _apply_errors(results, errors):
+    """
+    Generator function that handles errors within the given results based on the `errors` policy.
+    """
+    raise_errors = errors == parser.ERRORS_RAISE
+    yield_errors = errors == parser.ERRORS_YIELD
+
+    for result in results:
+        if not isinstance(result, StreamSyntaxError):
+            yield result
+        elif raise_errors:
+            raise result
+        elif yield_errors:
+            yield result
+
+
+def _file_lines_gen(file, encoding, max_length=None):
+    """
+    Generator function that yields `(lineno, offset, line)` tuples for each non-empty line of the given file object.
+
+    Lines longer than `max_length` are yielded with the :class:`~pai_lang.syntax.LimitExceeded` they raise in place
+    of the line, without reading more than `max_length` of them into memory at once. Lines that cannot be decoded
+    are yielded with a :class:`~pai_lang.syntax.InvalidInput` in their place.
+    """
+    # Text streams backed by a binary buffer, e.g. stdin, are read from the buffer to report byte offsets.
+    file = getattr(file, 'buffer', file)
+
+    if _is_regular_file(file):
+        size = os.fstat(file.fileno()).st_size
+        if not size:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield from _buffer_lines_gen(buffer, encoding, file.tell(), max_length)
+        return
+
+    # Room for the line ending, so a line of `max_length` is read whole.
+    size = -1 if max_length is None else max_length + 2
+    lineno = 0
+    offset = 0
+
+    while True:
+        line = file.readline(size)
+        if not line:
+            break
+        lineno += 1
+        start, offset = offset, offset + len(line)
+
+        newline, carriage = (b'\n', b'\r') if isinstance(line, bytes) else ('\n', '\r')
+        if not line.endswith(newline) and len(line) == size:
+            # Skip the rest of the line without holding it in memory.
+            length, last = len(line), line
+            while line and not line.endswith(newline):
+                line = file.readline(io.DEFAULT_BUFFER_SIZE)
+                length += len(line)
+                last = (last + line)[-2:]
+            offset = start + length
+            length -= len(last) - len(last.rstrip(carriage + newline))
+            yield lineno, start, parser._length_exceeded(length, max_length)
+            continue
+
+        line = line.rstrip(b'\r\n' if isinstance(line, bytes) else '\r\n')
+        if max_length is not None and len(line) > max_length:
+            yield lineno, start, parser._length_exceeded(len(line), max_length)
+        elif line:
+            yield lineno, start, _decode(line, encoding) if isinstance(line, bytes) else line
+
+
+def _buffer_lines_gen(buffer, encoding, start=0, max_length=None):
+    """
+    Generator function that yields `(lineno, offset, line)` tuples for each non-empty line of the given buffer.
+
+    Only the bytes of each line are copied out of the buffer; newlines are found with :meth:`~mmap.mmap.find`.
+    Lines of more than `max_length` bytes are not copied; the :class:`~pai_lang.syntax.LimitExceeded` they raise
+    is yielded in place of the line, as is the :class:`~pai_lang.syntax.InvalidInput` of lines that cannot be
+    decoded.
+
+    :param buffer: Object supporting the buffer protocol and `find`, e.g. :class:`~mmap.mmap` or :class:`~bytes`
+    :param encoding: Encoding of the buffer
+    :param start: Offset within the buffer to start reading from
+    :param max_length: Maximum number of bytes of a line or `None`
+    :return: Yields `(lineno, offset, line)` tuples
+    """
+    size = len(buffer)
+    lineno = 0
+
+    while start < size:
+        lineno += 1
+        end = buffer.find(b'\n', start)
+        if end == -1:
+            end = size
+        stop = end
+        if stop > start and buffer[stop - 1:stop] == b'\r':
+            stop -= 1
+        if max_length is not None and stop - start > max_length:
+            yield lineno, start, parser._length_exceeded(stop - start, max_length)
+        elif stop > start:
+            yield lineno, start, _decode(buffer[start:stop], encoding)
+        start = end + 1
+
+
+def _decode(line, encoding):
+    """
+    Decode the given line, or create the :class:`~pai_lang.syntax.InvalidInput` yielded in its place if it is not
+    valid in the encoding.
+    """
+    try:
+        return line.decode(encoding)
+    except UnicodeDecodeError as e:
+        return parser._invalid_input(e)
+
+
+def _is_regular_file(file):
+    """
+    Check to see if the given file object is a regular file opened in binary mode that can be memory mapped.
+    """
+    if hasattr(file, 'encoding') or not hasattr(file, 'fileno'):
+        return False
+    try:
+        return stat.S_ISREG(os.fstat(file.fileno()).st_mode)
+    except (OSError, ValueError):
+        return False
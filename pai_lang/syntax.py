@@ -5,7 +5,12 @@
     Module that defines the object representation of the language.
 """
 
-__all__ = ['SyntaxError', 'Node', 'root', 'child']
+import collections
+import weakref
+
+
+__all__ = ['SyntaxError', 'LimitExceeded', 'InvalidInput', 'Dialect', 'Limits', 'Node', 'AcyclicNode', 'ChainNode',
+           'FrozenNode', 'Chain', 'root', 'child', 'freeze', 'pack', 'unpack']
 
 
 GROUP_SIZE = 0
@@ -15,6 +20,9 @@ DELIMITER = ':'
 ROOT_NODE_SIZE = 3
 CHILD_NODE_SIZE = 2
 
+# Edge value that describes a link by any discoverable relation.
+ANY_EDGE = 'any'
+
 
 ROOT_SENTINEL = object()
 
@@ -25,6 +33,71 @@ class SyntaxError(Exception):
     """
 
 
+class LimitExceeded(SyntaxError):
+    """
+    Exception raised when a source string exceeds one of the :class:`~pai_lang.syntax.Limits` it is parsed with.
+    """
+
+
+class InvalidInput(SyntaxError, ValueError):
+    """
+    Exception raised when a source string cannot be tokenized, e.g. it has an unclosed quote or is not valid UTF-8.
+
+    Also a :class:`~ValueError`, the exception the tokenizer raises for such strings.
+    """
+
+
+class Dialect(collections.namedtuple('Dialect', ['delimiter', 'rtl'])):
+    """
+    Describes how the nodes of a chain are written in a source string.
+
+    The default dialect, :data:`~pai_lang.syntax.DEFAULT_DIALECT`, separates values by ":" and writes the root
+    last, e.g. "workspace:any:user:email:foo@bar.com". Left-to-right dialects write the root first, e.g.
+    "user/email/foo@bar.com/workspace/any" with a delimiter of "/".
+
+    :param delimiter: Non-empty string that separates values; may be longer than a single character
+    :param rtl: Flag indicating if the root is written last (right-to-left) or first (left-to-right)
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, delimiter=None, rtl=None):
+        delimiter = DELIMITER if delimiter is None else delimiter
+        rtl = RTL if rtl is None else rtl
+        if not isinstance(delimiter, str) or not delimiter:
+            raise ValueError('delimiter must be a non-empty string; got {!r}'.format(delimiter))
+        if not isinstance(rtl, bool):
+            raise ValueError('rtl must be a bool; got {!r}'.format(rtl))
+        return super().__new__(cls, delimiter, rtl)
+
+
+DEFAULT_DIALECT = Dialect(DELIMITER, RTL)
+
+
+class Limits(collections.namedtuple('Limits', ['max_length', 'max_hops', 'max_token_length'])):
+    """
+    Bounds on the size of source strings, for parsing untrusted input.
+
+    Limits are checked before any node is created and the string is only scanned as far as needed to find a
+    violation, so oversized input is rejected in time proportional to the limits rather than to its size. Each
+    limit is optional; `None` disables it. Consecutive delimiters are skipped one at a time, so set `max_length` as
+    well to bound the cost of input that is mostly delimiters.
+
+    :param max_length: Maximum length of the source string, in characters or in bytes for :class:`~bytes`
+    :param max_hops: Maximum number of nodes in the chain
+    :param max_token_length: Maximum length of a single "node", "edge" or "property" value, including any quotes
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, max_length=None, max_hops=None, max_token_length=None):
+        for name, value in (('max_length', max_length), ('max_hops', max_hops),
+                            ('max_token_length', max_token_length)):
+            if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 1):
+                raise ValueError('{} must be a positive int or None; got {!r}'.format(name, value))
+        return super().__new__(cls, max_length, max_hops, max_token_length)
+
+
 class Node:
     """
     Represents a single entity parsed from source.
@@ -101,27 +174,252 @@ class Node:
             self.child = child
 
 
-def root(node, edge, property):
+class AcyclicNode(Node):
+    """
+    Variant of :class:`~pai_lang.syntax.Node` whose link to its child is a weak reference.
+
+    Linking :class:`~pai_lang.syntax.Node` instances creates a reference cycle between every parent and child, so
+    discarded chains can only be freed by the cyclic garbage collector. Chains of acyclic nodes only hold strong
+    references from child to parent and are freed by reference counting alone.
+
+    A child is kept alive by whatever holds the chain, e.g. the list returned by the parser, or by any of its own
+    children. Holding only the root of a chain is not enough to keep its children alive.
+    """
+
+    __slots__ = ['_child', '__weakref__']
+
+    @property
+    def child(self):
+        """
+        The child node of this node or `None` if it has no child or the child has been freed.
+        """
+        ref = self._child
+        return ref() if ref is not None else None
+
+    @child.setter
+    def child(self, child):
+        self._child = weakref.ref(child) if child is not None else None
+
+
+class ChainNode(Node):
+    """
+    Variant of :class:`~pai_lang.syntax.Node` that knows the :class:`~pai_lang.syntax.Chain` it belongs to and its
+    position within it.
+
+    Both are set when a :class:`~pai_lang.syntax.Chain` is created from the node, so the root, leaf and length of
+    the chain are found from any of its nodes without following `parent`/`child` links. Nodes that are not part of
+    a chain have a `chain` and `position` of `None`.
+    """
+
+    __slots__ = ['chain', 'position']
+
+    def __init__(self, node, edge, property=None, parent=None, child=None):
+        super().__init__(node, edge, property, parent, child)
+        self.chain = None
+        self.position = None
+
+    def __getstate__(self):
+        # A chain is a tuple, which cannot be rebuilt by pickle while its own nodes refer to it; it links its nodes
+        # again when it is unpickled.
+        state = {name: getattr(self, name) for name in Node.__slots__}
+        state.update(chain=None, position=self.position)
+        return None, state
+
+
+class FrozenNode:
+    """
+    Immutable variant of :class:`~pai_lang.syntax.Node`.
+
+    Frozen nodes expose the same values and links as a :class:`~pai_lang.syntax.Node` but cannot be modified once
+    created, so a single chain can be safely shared between many consumers. Create them with
+    :func:`~pai_lang.syntax.freeze`.
+
+    Frozen nodes are hashable and compare structurally: two nodes are equal when their values and the values of
+    every node between them and their root are equal. The hash is computed once, from the cached hash of the
+    parent, so hashing a node of any depth is O(1).
+    """
+
+    __slots__ = ['node', 'edge', 'property', 'parent', 'child', '_hash']
+
+    def __init__(self, node, edge, property=None, parent=None, child=None):
+        _set = object.__setattr__
+        _set(self, 'node', node)
+        _set(self, 'edge', edge)
+        _set(self, 'property', property)
+        _set(self, 'parent', parent)
+        _set(self, 'child', child)
+        _set(self, '_hash', hash((node, edge, property, hash(parent))))
+
+    def __repr__(self):
+        return '<{}(node={}, edge={}, property={}>'.format(self.__class__.__name__, self.node,
+                                                           self.edge, self.property)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if not isinstance(other, FrozenNode):
+            return NotImplemented
+
+        # Walk both chains towards their roots; shared parents end the comparison early.
+        node = self
+        while node is not other:
+            if not isinstance(other, FrozenNode) or not isinstance(node, FrozenNode):
+                return False
+            if (node._hash != other._hash or node.node != other.node or node.edge != other.edge or
+                    node.property != other.property):
+                return False
+            node, other = node.parent, other.parent
+
+        return True
+
+    def __setattr__(self, name, value):
+        raise AttributeError('{} is immutable'.format(self.__class__.__name__))
+
+    def __delattr__(self, name):
+        raise AttributeError('{} is immutable'.format(self.__class__.__name__))
+
+    @property
+    def is_root(self):
+        """
+        Flag to determine if this node is a "root" node.
+
+        :return: `True` if a root node, `False` otherwise
+        """
+        return self.parent is ROOT_SENTINEL
+
+    @property
+    def is_child(self):
+        """
+        Flag to determine if this node is a "child" node.
+
+        :return: `True` if a child node, `False` otherwise
+        """
+        return not self.is_root
+
+
+class Chain(tuple):
+    """
+    Immutable sequence of the nodes of a single chain, root first, as returned by
+    :func:`~pai_lang.parser.parse_chain`.
+
+    Length, :attr:`~pai_lang.syntax.Chain.root`, :attr:`~pai_lang.syntax.Chain.leaf` and indexing by hop are O(1)
+    and iteration does not copy the nodes. Slicing returns a :class:`~tuple` of nodes. Creating a chain sets the
+    `chain` and `position` of each :class:`~pai_lang.syntax.ChainNode` within it; nodes of other types are held
+    as-is. The chain is a snapshot: relinking its nodes afterwards does not change it.
+
+    :param nodes: Iterable of linked nodes, root first
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, nodes=()):
+        self = super().__new__(cls, nodes)
+        for position, node in enumerate(self):
+            if isinstance(node, ChainNode):
+                node.chain = self
+                node.position = position
+        return self
+
+    def __repr__(self):
+        return '<{}(nodes={}>'.format(self.__class__.__name__, list(self))
+
+    @property
+    def root(self):
+        """
+        The "root" node of the chain or `None` if the chain is empty.
+        """
+        return self[0] if self else None
+
+    @property
+    def leaf(self):
+        """
+        The last node of the chain, the "root" node for single node chains, or `None` if the chain is empty.
+        """
+        return self[-1] if self else None
+
+
+def root(node, edge, property, cls=Node):
     """
     Create a new "root" node with the given node, edge, and property.
 
     :param node: The entity/resource this root node represents
     :param edge: The relationship between this root node and its property
     :param property: The piece of information that describes the entity/resource
+    :param cls: Type of node to create; default: :class:`~pai_lang.syntax.Node`
     :return: A :class:`~pai_lang.syntax.Node` instance that is a root node
     """
-    return Node(node, edge, property, ROOT_SENTINEL)
+    return cls(node, edge, property, ROOT_SENTINEL)
 
 
-def child(node, edge, parent):
+def child(node, edge, parent, cls=Node):
     """
     Create a new "child" node with the given node, edge, and parent node.
 
     :param node: The entity/resource this root node represents
     :param edge: The relationship between this root node and its parent
     :param parent: A :class:`~pai_lang.syntax.Node` instance that is the parent of this child node
+    :param cls: Type of node to create; default: :class:`~pai_lang.syntax.Node`
     :return: A :class:`~pai_lang.syntax.Node` instance that is a child node
     """
-    node = Node(node, edge)
+    node = cls(node, edge)
     node.link(parent)
     return node
+
+
+def freeze(nodes):
+    """
+    Create an immutable copy of the given chain of nodes.
+
+    :param nodes: Iterable of nodes, root first, as returned by the parser, or the packed `(node, edge, property)`
+        tuples created by :func:`~pai_lang.syntax.pack`
+    :return: A :class:`~tuple` of linked :class:`~pai_lang.syntax.FrozenNode` instances
+    """
+    if isinstance(nodes, tuple) and nodes and isinstance(nodes[0], FrozenNode):
+        return nodes
+
+    frozen = []
+    parent = ROOT_SENTINEL
+
+    for node in nodes:
+        if isinstance(node, tuple):
+            node = FrozenNode(node[0], node[1], node[2], parent)
+        else:
+            node = FrozenNode(node.node, node.edge, node.property, parent)
+        if frozen:
+            object.__setattr__(frozen[-1], 'child', node)
+        frozen.append(node)
+        parent = node
+
+    return tuple(frozen)
+
+
+def pack(nodes):
+    """
+    Create a compact, link-free representation of the given chain of nodes.
+
+    Packed chains contain no parent/child references so they are cheap to pickle, hash and compare.
+
+    :param nodes: Iterable of nodes, root first, as returned by the parser; items that are already packed
+        `(node, edge, property)` tuples are kept as-is
+    :return: A :class:`~tuple` of `(node, edge, property)` tuples, root first
+    """
+    return tuple(node if isinstance(node, tuple) else (node.node, node.edge, node.property) for node in nodes)
+
+
+def unpack(packed, cls=Node):
+    """
+    Create a chain of linked nodes from the given packed representation.
+
+    :param packed: Iterable of `(node, edge, property)` tuples, root first, as returned by :func:`~pai_lang.syntax.pack`
+    :param cls: Type of node to create; default: :class:`~pai_lang.syntax.Node`
+    :return: List of `cls` instances, root first
+    """
+    nodes = []
+    parent = None
+
+    for node, edge, property in packed:
+        parent = root(node, edge, property, cls) if parent is None else child(node, edge, parent, cls)
+        nodes.append(parent)
+
+    return nodes
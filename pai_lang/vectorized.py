@@ -0,0 +1,207 @@
+"""
+    pai_lang.vectorized
+    ~~~~~~~~~~~~~~~~~~~
+
+    Module for tokenizing large batches of data strings with vectorized :mod:`~numpy` operations.
+
+    NumPy is optional; without it :func:`~pai_lang.vectorized.extend_store` parses each data string in turn with
+    :func:`~pai_lang.parser.parse_many_gen`.
+"""
+
+import collections
+
+from pai_lang import parser, syntax
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+__all__ = ['HAS_NUMPY', 'BatchTokens', 'tokenize_batch', 'extend_store']
+
+
+HAS_NUMPY = numpy is not None
+
+# Maximum number of data strings :func:`~pai_lang.vectorized.extend_store` tokenizes as a single batch.
+DEFAULT_BATCHSIZE = 65536
+
+
+# Tokens of a batch of data strings, joined by the delimiter into a single source string:
+#     starts/ends: Offsets within the source of the first character of, and the character following, each token.
+#     counts: Number of tokens of each data string.
+#     offsets: Index of the first token of each data string, plus a final entry for the total number of tokens.
+#     expected: Number of tokens expected by the node of each data string that could not be created; zero if the
+#     data string is well formed.
+#     special: Flag for each data string that contains characters the generic tokenizer treats specially; the
+#     tokens of these strings are not what :func:`~pai_lang.parser.parse` would create.
+BatchTokens = collections.namedtuple('BatchTokens', ['source', 'starts', 'ends', 'counts', 'offsets', 'expected',
+                                                     'special'])
+
+
+def tokenize_batch(texts, delimiter=syntax.DELIMITER):
+    """
+    Tokenize the given data strings at once.
+
+    The strings are joined into one source string, encoded as a single UTF-32 buffer so array positions match
+    string offsets, and the token boundaries of every string are found with a handful of vectorized comparisons.
+    Lone surrogates are encoded as-is, so any :class:`~str` is accepted. The number of tokens of each string is
+    then checked against :data:`~pai_lang.syntax.ROOT_NODE_SIZE` and :data:`~pai_lang.syntax.CHILD_NODE_SIZE` for
+    the whole batch. Like :func:`~pai_lang.parser.parse`, empty tokens are ignored.
+
+    :param texts: Sequence of :class:`~str` data strings
+    :param delimiter: Single character delimiter to split on
+    :return: A :class:`~pai_lang.vectorized.BatchTokens` instance
+    """
+    if numpy is None:
+        raise RuntimeError('tokenize_batch requires numpy')
+
+    source = delimiter.join(texts)
+    data = numpy.frombuffer(source.encode('utf-32-le', 'surrogatepass'), dtype=numpy.uint32)
+
+    # Data strings are joined by the delimiter so no token spans two of them.
+    lengths = numpy.fromiter(map(len, texts), dtype=numpy.int64, count=len(texts))
+    record_starts = numpy.cumsum(lengths + 1) - lengths - 1
+
+    is_token = data != ord(delimiter)
+    follows_token = numpy.zeros(len(data), dtype=bool)
+    follows_token[1:] = is_token[:-1]
+    precedes_token = numpy.zeros(len(data), dtype=bool)
+    precedes_token[:-1] = is_token[1:]
+
+    starts = numpy.flatnonzero(is_token & ~follows_token)
+    ends = numpy.flatnonzero(is_token & ~precedes_token) + 1
+
+    records = numpy.searchsorted(record_starts, starts, side='right') - 1
+    counts = numpy.bincount(records, minlength=len(texts))
+    offsets = numpy.zeros(len(texts) + 1, dtype=numpy.int64)
+    numpy.cumsum(counts, out=offsets[1:])
+
+    root_size, child_size = syntax.ROOT_NODE_SIZE, syntax.CHILD_NODE_SIZE
+    expected = numpy.zeros(len(texts), dtype=numpy.int64)
+    expected[(counts > 0) & (counts < root_size)] = root_size
+    expected[(counts > root_size) & ((counts - root_size) % child_size != 0)] = child_size
+
+    special = numpy.zeros(len(texts), dtype=bool)
+    special_positions = numpy.flatnonzero(numpy.isin(data, [ord(char) for char in parser.LEXER_SPECIAL_CHARS]))
+    special[numpy.searchsorted(record_starts, special_positions, side='right') - 1] = True
+
+    return BatchTokens(source, starts, ends, counts, offsets, expected, special)
+
+
+def extend_store(store, iterable, errors=parser.ERRORS_RAISE, batchsize=DEFAULT_BATCHSIZE, limits=None):
+    """
+    Parse each data string from the given iterable and add the resulting chains to a
+    :class:`~pai_lang.store.ChainStore`.
+
+    With NumPy installed, runs of up to `batchsize` :class:`~str` data strings are tokenized by
+    :func:`~pai_lang.vectorized.tokenize_batch` and written to the columns of the store without creating any
+    nodes, so the memory used by the arrays of a batch is bound by `batchsize` rather than the whole iterable.
+    Data strings that need the generic tokenizer, and every data string without NumPy, are parsed one at a time.
+    Data strings that are empty produce no chain and are not added. With `limits`, each data string is checked
+    against them before it is tokenized; those that exceed them raise a :class:`~pai_lang.syntax.LimitExceeded`,
+    handled by the `errors` policy.
+
+    :param store: A :class:`~pai_lang.store.ChainStore` instance
+    :param iterable: Iterable that yields strings to parse
+    :param errors: Policy for items that fail to parse: "raise" or "skip"
+    :param batchsize: Maximum number of data strings tokenized as a single batch
+    :param limits: A :class:`~pai_lang.syntax.Limits` instance each data string is checked against; default: no
+        limits
+    :return: Number of chains added to the store
+    """
+    if errors not in (parser.ERRORS_RAISE, parser.ERRORS_SKIP):
+        raise ValueError('errors must be one of {}; got {}'.format((parser.ERRORS_RAISE, parser.ERRORS_SKIP), errors))
+    if batchsize < 1:
+        raise ValueError('batchsize must be at least 1; got {}'.format(batchsize))
+
+    count = len(store)
+
+    if numpy is None:
+        _extend_generic(store, iterable, errors, limits)
+        return len(store) - count
+
+    run = []
+    for data in iterable:
+        if isinstance(data, str) and (limits is None or parser._within_limits(data, limits)):
+            run.append(data)
+            if len(run) >= batchsize:
+                _extend_run(store, run, errors)
+                run = []
+            continue
+        if run:
+            _extend_run(store, run, errors)
+            run = []
+        _extend_generic(store, (data,), errors, limits)
+    if run:
+        _extend_run(store, run, errors)
+
+    return len(store) - count
+
+
+def _extend_generic(store, iterable, errors, limits=None):
+    """
+    Parse each data string from the given iterable in turn and append the non-empty chains to the store.
+    """
+    store.extend(parser.parse_many_gen(iterable, errors, limits=limits))
+
+
+def _extend_run(store, texts, errors):
+    """
+    Tokenize the given data strings as one batch and append their chains to the columns of the store.
+    """
+    tokens = tokenize_batch(texts)
+
+    special = tokens.special.nonzero()[0].tolist()
+    if special:
+        start = 0
+        for index in special:
+            if start < index:
+                _extend_run(store, texts[start:index], errors)
+            _extend_generic(store, (texts[index],), errors)
+            start = index + 1
+        if start < len(texts):
+            _extend_run(store, texts[start:], errors)
+        return
+
+    counts, offsets, expected = tokens.counts, tokens.offsets, tokens.expected
+
+    invalid = numpy.flatnonzero(expected)
+    if len(invalid) and errors == parser.ERRORS_RAISE:
+        # Store the chains before the first malformed data string, as parsing them one at a time would.
+        first = int(invalid[0])
+        if first:
+            _extend_run(store, texts[:first], errors)
+        raise parser._insufficient_tokens(int(expected[first]))
+
+    valid = (expected == 0) & (counts > 0)
+    records = numpy.flatnonzero(valid)
+    if not len(records):
+        return
+
+    # Nodes of each chain, root first: the root is the last three tokens and each child the two before it.
+    node_counts = (counts[records] - syntax.ROOT_NODE_SIZE) // syntax.CHILD_NODE_SIZE + 1
+    chain_ends = numpy.cumsum(node_counts)
+    node_records = numpy.repeat(records, node_counts)
+    depth = numpy.arange(chain_ends[-1]) - numpy.repeat(chain_ends - node_counts, node_counts)
+    node_tokens = offsets[node_records + 1] - syntax.ROOT_NODE_SIZE - syntax.CHILD_NODE_SIZE * depth
+    property_tokens = offsets[records + 1] - 1
+
+    # Splitting the source yields the same tokens, in order, as the vectorized scan. Each distinct token of a well
+    # formed chain is interned once, then every such token is mapped to its id.
+    values = list(filter(None, tokens.source.split(syntax.DELIMITER)))
+    token_ids = numpy.zeros(len(values), dtype=numpy.uint32)
+    if len(invalid):
+        used = numpy.flatnonzero(numpy.repeat(valid, counts))
+        values = [values[index] for index in used.tolist()]
+    else:
+        used = slice(None)
+
+    intern = store._intern
+    ids = {value: intern(value) for value in dict.fromkeys(values)}
+    token_ids[used] = numpy.fromiter(map(ids.__getitem__, values), dtype=numpy.uint32, count=len(values))
+
+    store.nodes.frombytes(token_ids[node_tokens].astype(store.nodes.typecode).tobytes())
+    store.edges.frombytes(token_ids[node_tokens + 1].astype(store.edges.typecode).tobytes())
+    store.properties.frombytes(token_ids[property_tokens].astype(store.properties.typecode).tobytes())
+    store.offsets.frombytes((chain_ends + store.offsets[-1]).astype(store.offsets.typecode).tobytes())
@@ -6,11 +6,11 @@
     language syntax.
 """
 
-from pai_lang import syntax
+from pai_lang import interning, syntax
 from pai_parser import slicer
 
 
-__all__ = ['supports', 'visit']
+__all__ = ['Visitor', 'supports', 'visit', 'check_token_count']
 
 
 def supports(group_size, rtl, expected_group_size=syntax.GROUP_SIZE, expected_rtl=syntax.RTL):
@@ -48,49 +48,122 @@ def visit(tokens, group_size, rtl, parent=None):
     return visit_child(tokens, parent)
 
 
-def visit_root(tokens, n=syntax.ROOT_NODE_SIZE):
+def visit_node(tokens, n):
+    """
+    Consume `n` values from the given iterable that will be used to create a :class:`~pai_lang.syntax.Node` instance.
+
+    Raises a :class:`~pai_lang.syntax.SyntaxError` when the token iterable contains less than `n` number of items.
+
+    :param tokens: Iterable that yields tokens to be consumed
+    :param n: Number of tokens to consume from iterable in order to create the node
+    :return: A :class:`~tuple` containing `n` items consumed from the token iterable, otherwise `None` if iterable
+    is empty or fully exhausted
+    """
+    try:
+        return reversed(slicer.iter_slice(tokens, n))
+    except slicer.SliceIterableEmpty:
+        return None
+    except slicer.SliceIterableExhausted:
+        raise syntax.SyntaxError('Insufficient tokens; expected {}'.format(n))
+
+
+def visit_root(tokens, n=syntax.ROOT_NODE_SIZE, intern=interning.DEFAULT_INTERN, visit_node=visit_node,
+               root=syntax.root):
     """
     Consume values from the given token iterable to create a "root" :class:`~pai_lang.syntax.Node` instance.
 
     :param tokens: Iterable that yields tokens to be consumed
     :param n: Number of tokens to consume from iterable in order to create a "root" node
+    :param intern: Function that returns the shared instance of the "node" and "edge" values
+    :param visit_node: Function that consumes the values of the node; default: :func:`~pai_lang.visitor.visit_node`
+    :param root: Function that creates the node; default: :func:`~pai_lang.syntax.root`
     :return: A "root" :class:`~pai_lang.syntax.Node` instance created from :func:`~pai_lang.syntax.root`
     """
     node = visit_node(tokens, n)
     if not node:
         return None
-    return syntax.root(*node)
+    node, edge, property = node
+    return root(intern(node), intern(edge), property)
 
 
-def visit_child(tokens, parent, n=syntax.CHILD_NODE_SIZE):
+def visit_child(tokens, parent, n=syntax.CHILD_NODE_SIZE, intern=interning.DEFAULT_INTERN, visit_node=visit_node,
+                child=syntax.child):
     """
     Consume values from the given token iterable to create a "child" :class:`~pai_lang.syntax.Node` instance.
 
     :param tokens: Iterable that yields tokens to be consumed
     :param parent: A :class:`~pai_lang.syntax.Node` instance that was created in previous visit step for this iterable
     :param n: Number of tokens to consume from iterable in order to create a "child" node
+    :param intern: Function that returns the shared instance of the "node" and "edge" values
+    :param visit_node: Function that consumes the values of the node; default: :func:`~pai_lang.visitor.visit_node`
+    :param child: Function that creates the node; default: :func:`~pai_lang.syntax.child`
     :return: A "child" :class:`~pai_lang.syntax.Node` instance created from :func:`~pai_lang.syntax.child`
     """
     node = visit_node(tokens, n)
     if not node:
         return None
-    return syntax.child(*node, parent=parent)
+    node, edge = node
+    return child(intern(node), intern(edge), parent)
 
 
-def visit_node(tokens, n):
+def check_token_count(count, root_size=syntax.ROOT_NODE_SIZE, child_size=syntax.CHILD_NODE_SIZE):
     """
-    Consume `n` values from the given iterable that will be used to create a :class:`~pai_lang.syntax.Node` instance.
+    Apply the rules enforced by :func:`~pai_lang.visitor.visit_root` and :func:`~pai_lang.visitor.visit_child` to
+    a number of tokens without consuming them.
 
-    Raises a :class:`~pai_lang.syntax.SyntaxError` when the token iterable contains less than `n` number of items.
+    Tokens are consumed right-to-left: `root_size` for the root node and `child_size` for each child after it.
 
-    :param tokens: Iterable that yields tokens to be consumed
-    :param n: Number of tokens to consume from iterable in order to create the node
-    :return: A :class:`~tuple` containing `n` items consumed from the token iterable, otherwise `None` if iterable
-    is empty or fully exhausted
+    :param count: Number of tokens
+    :param root_size: Number of tokens that create a "root" node
+    :param child_size: Number of tokens that create a "child" node
+    :return: A :class:`~tuple` of the number of tokens expected by the node that could not be created, zero if the
+    tokens are valid, and the number of tokens consumed by the nodes before it
     """
-    try:
-        return reversed(slicer.iter_slice(tokens, n))
-    except slicer.SliceIterableEmpty:
-        return None
-    except slicer.SliceIterableExhausted:
-        raise syntax.SyntaxError('Insufficient tokens; expected {}'.format(n))
+    if not count:
+        return 0, 0
+    if count < root_size:
+        return root_size, 0
+    remainder = (count - root_size) % child_size
+    if remainder:
+        return child_size, count - remainder
+    return 0, count
+
+
+class Visitor:
+    """
+    Object that implements the "visitor" interface like this module, calling the given functions to consume the
+    values of each node, intern them and create the node.
+
+    This is how each stage of the generic path is replaced, e.g. by the timed wrappers of
+    :mod:`~pai_lang.instrument`, without changing the functions of this module.
+
+    :param visit_node: Function that consumes the values of each node; default: :func:`~pai_lang.visitor.visit_node`
+    :param intern: Function that returns the shared instance of the "node" and "edge" values
+    :param root: Function that creates the "root" node; default: :func:`~pai_lang.syntax.root`
+    :param child: Function that creates each "child" node; default: :func:`~pai_lang.syntax.child`
+    """
+
+    supports = staticmethod(supports)
+
+    def __init__(self, visit_node=visit_node, intern=interning.DEFAULT_INTERN, root=syntax.root, child=syntax.child):
+        self.visit_node = visit_node
+        self.intern = intern
+        self.root = root
+        self.child = child
+
+    def __repr__(self):
+        return '<{}(visit_node={}, intern={}>'.format(self.__class__.__name__, self.visit_node, self.intern)
+
+    def visit(self, tokens, group_size, rtl, parent=None):
+        """
+        Consume values from given token iterable to create a :class:`~pai_lang.syntax.Node` instance.
+
+        :param tokens: Iterable that yields tokens to be consumed
+        :param group_size: Size of each group of tokens in iterable
+        :param rtl: Flag indicating if token groups are being returned right-to-left
+        :param parent: A :class:`~pai_lang.syntax.Node` instance that was created in previous visit step
+        :return: A :class:`~pai_lang.syntax.Node` instance
+        """
+        if not parent:
+            return visit_root(tokens, intern=self.intern, visit_node=self.visit_node, root=self.root)
+        return visit_child(tokens, parent, intern=self.intern, visit_node=self.visit_node, child=self.child)
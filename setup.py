@@ -31,7 +31,11 @@ setup(
     license='Apache 2.0',
     description='Language for describing resources/relations as shell-safe strings.',
     long_description=__doc__,
-    packages=['pai_lang'],
+    packages=['pai_lang', 'pai_lang.resolve'],
+    python_requires='>=3.7',
+    extras_require={
+        'numpy': ['numpy']
+    },
     include_package_data=True,
     platforms='any',
     classifiers=[
@@ -40,9 +44,12 @@ setup(
         'Natural Language :: English',
         'License :: OSI Approved :: Apache Software License',
         'Programming Language :: Python',
-        'Programming Language :: Python :: 3.3',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.5'
+        'Programming Language :: Python :: 3.7',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
+        'Programming Language :: Python :: 3.12'
     ]
 
 )
\ No newline at end of file
@@ -0,0 +1,202 @@
+"""
+    test_aio
+    ~~~~~~~~
+
+    Tests for the :mod:`~pai_lang.aio` module.
+"""
+
+import asyncio
+import concurrent.futures
+
+import pytest
+
+from pai_lang import aio, parser, stream, syntax
+
+
+DATA = b'user:email:foo@bar.com\nworkspace:any:user:email:foo@bar.com\r\n\na:b\nsettings:any:workspace:any:user:email:x'
+
+
+@pytest.fixture(scope='module', params=[1, 3, 7, len(DATA)])
+def chunk_size(request):
+    """
+    Fixture that yields sizes used to split :data:`DATA` into chunks, including sizes that split lines.
+    """
+    return request.param
+
+
+def chunks_of(data, size):
+    """
+    Split the given data into chunks of `size` items.
+    """
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+async def async_iter(items):
+    """
+    Asynchronous generator function that yields the given items.
+    """
+    for item in items:
+        yield item
+
+
+def stream_reader(data):
+    """
+    Create an :class:`~asyncio.StreamReader` holding the given data.
+    """
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+def collect(source, **kwargs):
+    """
+    Run :func:`~pai_lang.aio.parse_stream` over the given source and return its results.
+    """
+    async def run():
+        return [result async for result in aio.parse_stream(source() if callable(source) else source, **kwargs)]
+    return asyncio.run(run())
+
+
+def expected_packed():
+    """
+    Return the packed chains of all valid lines in :data:`DATA`.
+    """
+    lines = [line for line in DATA.decode('utf-8').split('\n') if line.strip() and line != 'a:b']
+    return [syntax.pack(parser.parse(line.rstrip('\r'))) for line in lines]
+
+
+def test_parse_stream_handles_lines_split_across_chunks(chunk_size):
+    """
+    Assert that :func:`~pai_lang.aio.parse_stream` reassembles lines that are split across chunks.
+    """
+    results = collect(async_iter(chunks_of(DATA, chunk_size)), errors=parser.ERRORS_SKIP, batchsize=2, maxsize=1)
+    assert [syntax.pack(nodes) for nodes in results] == expected_packed()
+
+
+def test_parse_stream_reads_text_chunks(chunk_size):
+    """
+    Assert that :func:`~pai_lang.aio.parse_stream` accepts chunks of text.
+    """
+    results = collect(async_iter(chunks_of(DATA.decode('utf-8'), chunk_size)), errors=parser.ERRORS_SKIP)
+    assert [syntax.pack(nodes) for nodes in results] == expected_packed()
+
+
+def test_parse_stream_reads_stream_reader():
+    """
+    Assert that :func:`~pai_lang.aio.parse_stream` reads from an :class:`~asyncio.StreamReader`.
+    """
+    results = collect(lambda: stream_reader(DATA), errors=parser.ERRORS_SKIP, read_size=5)
+    assert [syntax.pack(nodes) for nodes in results] == expected_packed()
+
+
+def test_parse_stream_raises_with_line_number_and_offset():
+    """
+    Assert that :func:`~pai_lang.aio.parse_stream` raises a :class:`~pai_lang.stream.StreamSyntaxError` with the
+    line number and offset of the malformed line.
+    """
+    with pytest.raises(stream.StreamSyntaxError) as e:
+        collect(async_iter(chunks_of(DATA, 4)))
+    assert e.value.lineno == 4
+    assert e.value.offset == DATA.index(b'a:b')
+
+
+def test_parse_stream_yields_errors_in_place():
+    """
+    Assert that :func:`~pai_lang.aio.parse_stream` yields errors in place using the "yield" policy.
+    """
+    results = collect(async_iter([DATA]), errors=parser.ERRORS_YIELD)
+    assert len(results) == 4
+    assert isinstance(results[2], stream.StreamSyntaxError)
+
+
+def test_parse_stream_applies_limits():
+    """
+    Assert that :func:`~pai_lang.aio.parse_stream` reports lines that exceed the limits as a
+    :class:`~pai_lang.stream.StreamLimitExceeded`.
+    """
+    results = collect(async_iter([DATA]), errors=parser.ERRORS_YIELD, limits=syntax.Limits(max_hops=2))
+    assert len(results) == 4
+    assert isinstance(results[3], stream.StreamLimitExceeded)
+
+
+def test_parse_stream_parses_large_batches_on_executor():
+    """
+    Assert that :func:`~pai_lang.aio.parse_stream` parses batches on the given executor.
+    """
+    with concurrent.futures.ThreadPoolExecutor(1) as executor:
+        results = collect(async_iter([DATA]), errors=parser.ERRORS_SKIP, executor=executor, executor_threshold=1)
+    assert [syntax.pack(nodes) for nodes in results] == expected_packed()
+
+
+def test_parse_stream_raises_source_errors():
+    """
+    Assert that :func:`~pai_lang.aio.parse_stream` raises exceptions raised while reading the source.
+    """
+    async def failing():
+        yield b'a:b:c\n'
+        raise ConnectionResetError()
+
+    with pytest.raises(ConnectionResetError):
+        collect(failing())
+
+
+@pytest.mark.parametrize('max_length', [1, 21, 22, 36, 37, 38])
+def test_parse_stream_rejects_lines_longer_than_max_length(chunk_size, max_length):
+    """
+    Assert that :func:`~pai_lang.aio.parse_stream` reports each line longer than `max_length` as a
+    :class:`~pai_lang.stream.StreamLimitExceeded` with its line number, offset and length, and parses the lines
+    that follow it.
+    """
+    limits = syntax.Limits(max_length=max_length)
+    results = collect(async_iter(chunks_of(DATA, chunk_size)), errors=parser.ERRORS_YIELD, limits=limits)
+
+    lines = [(lineno, line.rstrip(b'\r')) for lineno, line in enumerate(DATA.split(b'\n'), 1) if line]
+    assert len(results) == len(lines)
+    for (lineno, line), result in zip(lines, results):
+        if len(line) > max_length:
+            assert isinstance(result, stream.StreamLimitExceeded)
+            assert (result.lineno, result.offset) == (lineno, DATA.index(line))
+            assert str(len(line)) in str(result)
+        elif line == b'a:b':
+            assert isinstance(result, stream.StreamSyntaxError)
+        else:
+            assert syntax.pack(result) == syntax.pack(parser.parse(line.decode('utf-8')))
+
+
+def test_parse_stream_drops_long_lines_while_reading_them(mocker):
+    """
+    Assert that :func:`~pai_lang.aio.parse_stream` does not join the chunks of a line longer than `max_length`.
+    """
+    line_entry = mocker.spy(aio, '_line_entry')
+    data = b'a:b:c\n' + b'x' * 100000 + b'\r\nw:x:a:b:c'
+    results = collect(async_iter(chunks_of(data, 10)), errors=parser.ERRORS_YIELD,
+                      limits=syntax.Limits(max_length=10))
+    assert len(results) == 3
+    assert isinstance(results[1], stream.StreamLimitExceeded)
+    assert (results[1].lineno, results[1].offset) == (2, 6)
+    assert '100000' in str(results[1])
+    assert [len(results[0]), len(results[2])] == [1, 2]
+    lines = [call.args[0] for call in line_entry.call_args_list]
+    assert all(len(line) <= 11 for line in lines if isinstance(line, bytes))
+
+
+@pytest.mark.parametrize('limits', [None, syntax.Limits(max_length=64)])
+def test_parse_stream_reports_lines_that_cannot_be_decoded_or_tokenized(chunk_size, limits):
+    """
+    Assert that :func:`~pai_lang.aio.parse_stream` reports lines that are not valid in the encoding, or have an
+    unclosed quote, as a :class:`~pai_lang.stream.StreamSyntaxError` handled by the `errors` policy.
+    """
+    data = b'a:b:c\nx:y:\xff\r\nw:x:a:b:c\na:b:"c\nx:y:z'
+    chunks = chunks_of(data, chunk_size)
+
+    results = collect(async_iter(chunks), errors=parser.ERRORS_SKIP, limits=limits)
+    assert [len(nodes) for nodes in results] == [1, 2, 1]
+
+    results = collect(async_iter(chunks), errors=parser.ERRORS_YIELD, limits=limits)
+    assert [(result.lineno, result.offset) for result in results[1::2]] == [(2, 6), (4, 23)]
+    assert all(isinstance(result, stream.StreamSyntaxError) for result in results[1::2])
+
+    with pytest.raises(stream.StreamSyntaxError) as e:
+        collect(async_iter(chunks), limits=limits)
+    assert e.value.lineno == 2
@@ -0,0 +1,77 @@
+"""
+    test_cache
+    ~~~~~~~~~~
+
+    Tests for the :mod:`~pai_lang.cache` module.
+"""
+
+import pytest
+
+from pai_lang import cache, syntax
+
+
+@pytest.fixture(scope='function')
+def parse_cache():
+    """
+    Fixture that yields a :class:`~pai_lang.cache.ParseCache` that holds two entries.
+    """
+    return cache.ParseCache(maxsize=2)
+
+
+def test_parse_cache_returns_frozen_chain(parse_cache):
+    """
+    Assert that :meth:`~pai_lang.cache.ParseCache.parse` returns a tuple of :class:`~pai_lang.syntax.FrozenNode`.
+    """
+    nodes = parse_cache.parse('workspace:any:user:email:foo@bar.com')
+    assert isinstance(nodes, tuple)
+    assert all(isinstance(node, syntax.FrozenNode) for node in nodes)
+    assert [node.node for node in nodes] == ['user', 'workspace']
+
+
+def test_parse_cache_returns_shared_chain_on_hit(parse_cache):
+    """
+    Assert that :meth:`~pai_lang.cache.ParseCache.parse` returns the same chain for repeated data strings.
+    """
+    assert parse_cache.parse('a:b:c') is parse_cache.parse('a:b:c')
+    assert parse_cache.info() == cache.CacheInfo(hits=1, misses=1, evictions=0, maxsize=2, currsize=1)
+
+
+def test_parse_cache_evicts_least_recently_used(parse_cache):
+    """
+    Assert that :class:`~pai_lang.cache.ParseCache` evicts the least recently used entry once full.
+    """
+    parse_cache.parse('a:b:c')
+    parse_cache.parse('d:e:f')
+    parse_cache.parse('a:b:c')
+    parse_cache.parse('g:h:i')
+    assert 'a:b:c' in parse_cache
+    assert 'd:e:f' not in parse_cache
+    assert parse_cache.info().evictions == 1
+    assert len(parse_cache) == 2
+
+
+def test_parse_cache_does_not_cache_errors(parse_cache):
+    """
+    Assert that :class:`~pai_lang.cache.ParseCache` raises and does not cache a data string that fails to parse.
+    """
+    with pytest.raises(syntax.SyntaxError):
+        parse_cache.parse('a:b')
+    assert 'a:b' not in parse_cache
+
+
+def test_parse_cache_clear_resets_entries_and_stats(parse_cache):
+    """
+    Assert that :meth:`~pai_lang.cache.ParseCache.clear` removes all entries and resets statistics.
+    """
+    parse_cache.parse('a:b:c')
+    parse_cache.parse('a:b:c')
+    parse_cache.clear()
+    assert parse_cache.info() == cache.CacheInfo(hits=0, misses=0, evictions=0, maxsize=2, currsize=0)
+
+
+def test_parse_cache_raises_on_invalid_maxsize():
+    """
+    Assert that :class:`~pai_lang.cache.ParseCache` raises a :class:`~ValueError` when `maxsize` is less than one.
+    """
+    with pytest.raises(ValueError):
+        cache.ParseCache(maxsize=0)
@@ -0,0 +1,122 @@
+"""
+    test_codec
+    ~~~~~~~~~~
+
+    Tests for the :mod:`~pai_lang.codec` module.
+"""
+
+import mmap
+
+import pytest
+
+from pai_lang import codec, parser, syntax
+
+
+@pytest.fixture(scope='module')
+def chains():
+    """
+    Fixture that yields parsed chains with repeated and non-ascii values.
+    """
+    return parser.parse_many([
+        'user:email:foo@bar.com',
+        'workspace:any:user:email:foo@bar.com',
+        'settings:any:workspace:any:user:email:ü@bar.com',
+        'x' * 200 + ':edge:' + 'y' * 300
+    ])
+
+
+@pytest.fixture(scope='module')
+def encoded(chains):
+    """
+    Fixture that yields the result of :func:`~pai_lang.codec.dumps` for the parsed chains.
+    """
+    return codec.dumps(chains)
+
+
+def test_dumps_loads_round_trip(chains, encoded):
+    """
+    Assert that :func:`~pai_lang.codec.loads` returns linked chains equal to the :func:`~pai_lang.parser.parse`
+    output they were encoded from.
+    """
+    decoded = codec.loads(encoded)
+    assert [syntax.pack(nodes) for nodes in decoded] == [syntax.pack(nodes) for nodes in chains]
+    for nodes in decoded:
+        assert nodes[0].is_root
+        assert all(child.parent is parent for parent, child in zip(nodes, nodes[1:]))
+
+
+def test_dumps_accepts_packed_chains(chains, encoded):
+    """
+    Assert that :func:`~pai_lang.codec.dumps` encodes packed and linked chains the same.
+    """
+    assert codec.dumps([syntax.pack(nodes) for nodes in chains]) == encoded
+
+
+def test_dumps_stores_each_string_once(encoded):
+    """
+    Assert that :func:`~pai_lang.codec.dumps` stores repeated values once in the string table.
+    """
+    assert encoded.count(b'workspace') == 1
+    assert encoded.count(b'foo@bar.com') == 1
+
+
+def test_reader_supports_random_access(chains, encoded):
+    """
+    Assert that :class:`~pai_lang.codec.Reader` decodes chains by index.
+    """
+    reader = codec.Reader(encoded)
+    assert len(reader) == len(chains)
+    assert reader.packed(-1) == syntax.pack(chains[-1])
+    assert syntax.pack(reader[1]) == syntax.pack(chains[1])
+    with pytest.raises(IndexError):
+        reader.packed(len(chains))
+
+
+def test_reader_decodes_strings_lazily(encoded):
+    """
+    Assert that :class:`~pai_lang.codec.Reader` only decodes the strings of chains that are read.
+    """
+    reader = codec.Reader(encoded)
+    reader.packed(0)
+    assert 'workspace' not in reader._strings
+    assert 'user' in reader._strings
+
+
+def test_reader_reads_memory_mapped_file(chains, encoded, tmpdir):
+    """
+    Assert that :class:`~pai_lang.codec.Reader` reads chains directly from a memory mapped file.
+    """
+    path = tmpdir.join('chains.pai')
+    path.write_binary(encoded)
+    with open(str(path), 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        reader = codec.Reader(buffer)
+        assert list(reader.iter_packed()) == [syntax.pack(nodes) for nodes in chains]
+        del reader
+
+
+@pytest.mark.parametrize('data', [b'', b'JSON', codec.HEADER + b'\x05\x01'])
+def test_reader_raises_on_invalid_buffer(data):
+    """
+    Assert that :class:`~pai_lang.codec.Reader` raises a :class:`~pai_lang.codec.CodecError` for invalid buffers.
+    """
+    with pytest.raises(codec.CodecError):
+        codec.Reader(data)
+
+
+def test_loads_raises_on_truncated_buffer(encoded):
+    """
+    Assert that :func:`~pai_lang.codec.loads` raises a :class:`~pai_lang.codec.CodecError` for truncated chains.
+    """
+    with pytest.raises(codec.CodecError):
+        codec.loads(encoded[:-3])
+
+
+def test_reader_raises_on_truncated_buffer_by_index(encoded):
+    """
+    Assert that :meth:`~pai_lang.codec.Reader.packed` raises a :class:`~pai_lang.codec.CodecError` for truncated
+    chains on every access, not only the first.
+    """
+    reader = codec.Reader(encoded[:-3])
+    for _ in range(2):
+        with pytest.raises(codec.CodecError):
+            reader.packed(0)
@@ -0,0 +1,129 @@
+"""
+    test_index
+    ~~~~~~~~~~
+
+    Tests for the :mod:`~pai_lang.index` module.
+"""
+
+import pytest
+
+from pai_lang import index, parser, syntax
+
+
+EXPRESSIONS = [
+    'user:email:foo@bar.com',
+    'workspace:any:user:email:foo@bar.com',
+    'settings:any:workspace:any:user:email:baz@bar.com',
+    'workspace:id:w1',
+    'user:any:workspace:id:w1',
+    'user:any:user:any:user:email:foo@baz.com'
+]
+
+
+@pytest.fixture(scope='function')
+def expression_index():
+    """
+    Fixture that yields a :class:`~pai_lang.index.ExpressionIndex` holding the parsed :data:`EXPRESSIONS`.
+    """
+    expression_index = index.ExpressionIndex()
+    expression_index.add_many(parser.parse_many(EXPRESSIONS))
+    return expression_index
+
+
+def scan(predicate):
+    """
+    Return the ids of :data:`EXPRESSIONS` whose packed chain matches the given predicate using a full scan.
+    """
+    return {i for i, data in enumerate(EXPRESSIONS) if predicate(syntax.pack(parser.parse(data)))}
+
+
+def test_query_by_root_node_and_edge(expression_index):
+    """
+    Assert that :meth:`~pai_lang.index.ExpressionIndex.query` finds chains by their root node and edge.
+    """
+    result = expression_index.query(hops=[(0, 'user', 'email')])
+    assert result == scan(lambda chain: chain[0][:2] == ('user', 'email'))
+
+
+def test_query_by_hop_at_any_position(expression_index):
+    """
+    Assert that :meth:`~pai_lang.index.ExpressionIndex.query` finds chains that contain a hop at any position.
+    """
+    result = expression_index.query(hops=[(None, 'workspace', 'any')])
+    assert result == {1, 2}
+
+
+def test_query_by_edge_at_position(expression_index):
+    """
+    Assert that :meth:`~pai_lang.index.ExpressionIndex.query` finds chains by an edge at a given position.
+    """
+    assert expression_index.query(hops=[(1, None, 'any')]) == scan(lambda c: len(c) > 1 and c[1][1] == 'any')
+
+
+def test_query_combines_terms(expression_index):
+    """
+    Assert that :meth:`~pai_lang.index.ExpressionIndex.query` returns chains matching every term.
+    """
+    result = expression_index.query(hops=[(0, 'user', 'email'), (None, 'workspace', None)],
+                                    property='foo@bar.com')
+    assert result == {1}
+
+
+def test_query_by_property_prefix(expression_index):
+    """
+    Assert that :meth:`~pai_lang.index.ExpressionIndex.query` finds chains by root property prefix.
+    """
+    assert expression_index.query(property_prefix='foo@') == {0, 1, 5}
+    assert expression_index.query(property_prefix='zzz') == set()
+
+
+def test_query_without_terms_returns_all(expression_index):
+    """
+    Assert that :meth:`~pai_lang.index.ExpressionIndex.query` returns all ids when given no terms.
+    """
+    assert expression_index.query() == set(range(len(EXPRESSIONS)))
+
+
+def test_query_raises_on_empty_hop_term(expression_index):
+    """
+    Assert that :meth:`~pai_lang.index.ExpressionIndex.query` raises a :class:`~ValueError` for a hop term without
+    a node or edge.
+    """
+    with pytest.raises(ValueError):
+        expression_index.query(hops=[(0, None, None)])
+
+
+def test_remove_drops_chain_from_postings(expression_index):
+    """
+    Assert that :meth:`~pai_lang.index.ExpressionIndex.remove` removes the chain from every query result.
+    """
+    removed = expression_index.remove(5)
+    assert removed == syntax.pack(parser.parse(EXPRESSIONS[5]))
+    assert 5 not in expression_index
+    assert expression_index.query(property_prefix='foo@') == {0, 1}
+    assert expression_index.query(hops=[(None, 'user', 'any')]) == {4}
+    assert 'foo@baz.com' not in expression_index.sorted_properties
+
+
+def test_remove_all_leaves_empty_index(expression_index):
+    """
+    Assert that removing every chain from the index leaves no postings behind.
+    """
+    for chain_id in range(len(EXPRESSIONS)):
+        expression_index.remove(chain_id)
+    assert not expression_index.postings
+    assert not expression_index.properties
+    assert not expression_index.sorted_properties
+
+
+def test_query_by_property_prefix_sees_changes_between_queries(expression_index):
+    """
+    Assert that :meth:`~pai_lang.index.ExpressionIndex.query` finds chains added or removed after a prefix query.
+    """
+    assert expression_index.query(property_prefix='foo@') == {0, 1, 5}
+    added = expression_index.add(parser.parse('user:email:foo@qux.com'))
+    assert expression_index.query(property_prefix='foo@') == {0, 1, 5, added}
+    expression_index.remove(0)
+    expression_index.remove(1)
+    assert expression_index.query(property_prefix='foo@') == {5, added}
+    assert expression_index.sorted_properties == sorted({'baz@bar.com', 'w1', 'foo@baz.com', 'foo@qux.com'})
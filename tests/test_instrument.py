@@ -0,0 +1,182 @@
+"""
+    test_instrument
+    ~~~~~~~~~~~~~~~
+
+    Tests for the :mod:`~pai_lang.instrument` module.
+"""
+
+import pytest
+
+from pai_lang import instrument, parser, syntax
+
+
+ITEMS = [
+    '',
+    'a:b:c',
+    'workspace:any:user:email:foo@bar.com',
+    'a::b:::c',
+    '"a:b":c:d',
+    'a:b',
+    'x:a:b:c',
+    '"x":a:b:c',
+    'a:"b:c',
+    b'settings:any:workspace:any:user:email:foo@bar.com'
+]
+
+
+@pytest.fixture(scope='function')
+def instrumentation():
+    """
+    Fixture that yields an enabled :class:`~pai_lang.instrument.Instrumentation` and disables it afterwards.
+    """
+    with instrument.enabled() as instrumentation:
+        yield instrumentation
+
+
+def outcome(function, *args):
+    """
+    Call the given function and return its packed result, or the type and message of the exception raised.
+    """
+    try:
+        result = function(*args)
+        return [syntax.pack(nodes) if isinstance(nodes, list) else str(nodes) for nodes in result]
+    except Exception as e:
+        return type(e), str(e)
+
+
+@pytest.mark.parametrize('data', ITEMS)
+def test_instrumented_parse_matches_parse(data):
+    """
+    Assert that :func:`~pai_lang.parser.parse` and :func:`~pai_lang.parser.parse_gen` return the same results and
+    errors while instrumented.
+    """
+    expected = outcome(lambda d: [parser.parse(d)], data), outcome(lambda d: [list(parser.parse_gen(d))], data)
+    with instrument.enabled():
+        assert outcome(lambda d: [parser.parse(d)], data) == expected[0]
+        assert outcome(lambda d: [list(parser.parse_gen(d))], data) == expected[1]
+
+
+@pytest.mark.parametrize('errors', [parser.ERRORS_SKIP, parser.ERRORS_YIELD])
+def test_instrumented_parse_many_matches_parse_many(errors):
+    """
+    Assert that :func:`~pai_lang.parser.parse_many` returns the same results while instrumented.
+    """
+    expected = outcome(parser.parse_many, ITEMS, errors)
+    with instrument.enabled() as instrumentation:
+        assert outcome(parser.parse_many, ITEMS, errors) == expected
+    assert instrumentation.errors[instrument.ERROR_INVALID_INPUT] == 1
+
+
+@pytest.mark.parametrize('errors', parser.ERROR_POLICIES)
+def test_instrumented_parse_many_raises_on_invalid_input(errors):
+    """
+    Assert that :func:`~pai_lang.parser.parse_many` raises errors other than :class:`~pai_lang.syntax.SyntaxError`
+    regardless of the policy, the same as while not instrumented.
+    """
+    items = ['a:b:c', None]
+    with pytest.raises(ValueError) as expected:
+        parser.parse_many(items, errors)
+    with instrument.enabled() as instrumentation:
+        with pytest.raises(ValueError) as raised:
+            parser.parse_many(items, errors)
+    assert type(raised.value) is type(expected.value)
+    assert instrumentation.errors == {instrument.ERROR_INVALID_INPUT: 1}
+
+
+def test_instrumented_parse_gen_yields_nodes_lazily(instrumentation):
+    """
+    Assert that :func:`~pai_lang.parser.parse_gen` yields each node before the next is created while instrumented.
+    """
+    nodes = parser.parse_gen('a:workspace:any:user:email:foo@bar.com')
+    assert next(nodes).is_root
+    assert instrumentation.expressions == 0
+    with pytest.raises(syntax.SyntaxError):
+        list(nodes)
+    assert instrumentation.errors == {instrument.ERROR_CHILD_TOKENS: 1}
+
+
+def test_instrumentation_counts_expressions_nodes_tokens_and_errors(instrumentation):
+    """
+    Assert that :class:`~pai_lang.instrument.Instrumentation` counts what the pipeline does.
+    """
+    parser.parse_many(['workspace:any:user:email:foo@bar.com', 'a:b', 'x:a:b:c', '"a":b:c'], errors=parser.ERRORS_SKIP)
+    with pytest.raises(ValueError):
+        parser.parse('a:"b')
+    snapshot = instrumentation.snapshot()
+    assert snapshot['expressions'] == 5
+    assert snapshot['nodes'] == 4
+    assert snapshot['tokens'] == 11
+    assert snapshot['errors'] == {instrument.ERROR_ROOT_TOKENS: 1, instrument.ERROR_CHILD_TOKENS: 1,
+                                  instrument.ERROR_INVALID_INPUT: 1}
+    assert all(stage['count'] == 5 for stage in snapshot['stages'].values())
+
+    instrumentation.reset()
+    assert instrumentation.snapshot()['expressions'] == 0
+
+
+def test_instrumentation_counts_exceeded_limits(instrumentation):
+    """
+    Assert that :class:`~pai_lang.instrument.Instrumentation` counts data strings rejected by their limits as their
+    own kind of error, including from :func:`~pai_lang.parser.parse_gen` before it is iterated.
+    """
+    limits = syntax.Limits(max_hops=1)
+    with pytest.raises(syntax.LimitExceeded):
+        parser.parse('w:any:a:b:c', limits=limits)
+    with pytest.raises(syntax.LimitExceeded):
+        parser.parse_gen('"w":any:a:b:c', limits=limits)
+    results = parser.parse_many(['a:b:c', 'w:any:a:b:c', 'a:b'], errors=parser.ERRORS_YIELD, limits=limits)
+    assert isinstance(results[1], syntax.LimitExceeded)
+    assert len(list(parser.parse_gen('a:b:c', limits=limits))) == 1
+
+    snapshot = instrumentation.snapshot()
+    assert snapshot['expressions'] == 6
+    assert snapshot['errors'] == {instrument.ERROR_LIMIT: 3, instrument.ERROR_ROOT_TOKENS: 1}
+    assert all(stage['count'] == 6 for stage in snapshot['stages'].values())
+
+
+def test_instrumentation_calls_callback_per_expression():
+    """
+    Assert that :class:`~pai_lang.instrument.Instrumentation` passes a sample of each data string to its callback.
+    """
+    samples = []
+    with instrument.enabled(samples.append):
+        parser.parse('workspace:any:user:email:foo@bar.com')
+        parser.parse('"a":b:c')
+        with pytest.raises(syntax.SyntaxError):
+            parser.parse('x:a:b:c')
+
+    assert [(s.nodes, s.tokens, s.error) for s in samples] == [(2, 5, None), (1, 3, None),
+                                                               (1, 3, instrument.ERROR_CHILD_TOKENS)]
+    assert set(samples[0].timings) == set(instrument.STAGES)
+    assert samples[0].timings['slice'] == 0
+    assert samples[1].timings['slice'] > 0
+
+
+def test_enable_and_disable_swap_pipeline():
+    """
+    Assert that :func:`~pai_lang.instrument.enable` and :func:`~pai_lang.instrument.disable` install and remove
+    the instrumentation, and that :func:`~pai_lang.instrument.enabled` restores the previous one.
+    """
+    outer = instrument.enable()
+    try:
+        with instrument.enabled() as inner:
+            parser.parse('a:b:c')
+        assert parser._instrumentation is outer
+        assert inner.expressions == 1
+        assert outer.expressions == 0
+    finally:
+        assert instrument.disable() is outer
+    assert parser._instrumentation is None
+
+
+def test_histogram_records_power_of_two_buckets():
+    """
+    Assert that :class:`~pai_lang.instrument.Histogram` buckets values by their bit length.
+    """
+    histogram = instrument.Histogram()
+    assert histogram.percentile(50) == 0
+    for value in (0, 1, 5, 6, 1000):
+        histogram.record(value)
+    assert histogram.snapshot() == {'count': 5, 'total': 1012, 'buckets': {0: 1, 1: 1, 7: 2, 1023: 1}}
+    assert histogram.percentile(50) == 7
+    assert histogram.percentile(100) == 1023
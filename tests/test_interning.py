@@ -0,0 +1,77 @@
+"""
+    test_interning
+    ~~~~~~~~~~~~~~
+
+    Tests for the :mod:`~pai_lang.interning` module.
+"""
+
+import pytest
+
+from pai_lang import interning, parser, syntax
+
+
+@pytest.fixture(scope='function')
+def interner():
+    """
+    Fixture that yields an empty :class:`~pai_lang.interning.Interner`.
+    """
+    return interning.Interner()
+
+
+def test_interner_returns_first_equal_value(interner):
+    """
+    Assert that :class:`~pai_lang.interning.Interner` returns the first instance of an equal value it has seen.
+    """
+    first = ''.join(['us', 'er'])
+    second = ''.join(['use', 'r'])
+    assert first is not second
+    assert interner(first) is first
+    assert interner(second) is first
+
+
+def test_intern_chain_returns_shared_chain(interner):
+    """
+    Assert that :meth:`~pai_lang.interning.Interner.intern_chain` returns the same chain for equal input.
+    """
+    first = interner.intern_chain(parser.parse('workspace:any:user:email:foo@bar.com'))
+    second = interner.intern_chain(parser.parse('workspace:any:user:email:foo@bar.com'))
+    assert first is second
+    assert all(isinstance(node, syntax.FrozenNode) for node in first)
+    assert len(interner.chains) == 1
+
+
+def test_intern_chain_accepts_packed_chains(interner):
+    """
+    Assert that :meth:`~pai_lang.interning.Interner.intern_chain` treats packed and linked chains the same.
+    """
+    nodes = parser.parse('workspace:any:user:email:foo@bar.com')
+    assert interner.intern_chain(nodes) is interner.intern_chain(syntax.pack(nodes))
+
+
+def test_intern_chain_shares_values_across_chains(interner):
+    """
+    Assert that :meth:`~pai_lang.interning.Interner.intern_chain` shares "node" and "edge" values between chains.
+    """
+    first = interner.intern_chain(syntax.pack(parser.parse('workspace:any:user:email:foo@bar.com')))
+    second = interner.intern_chain([(''.join(['us', 'er']), 'email', 'baz@bar.com')])
+    assert first[0].node is second[0].node
+
+
+def test_interner_clear_removes_values(interner):
+    """
+    Assert that :meth:`~pai_lang.interning.Interner.clear` removes all interned values and chains.
+    """
+    interner.intern_chain(parser.parse('a:b:c'))
+    interner.clear()
+    assert not interner.strings
+    assert not interner.chains
+
+
+def test_parse_interns_node_and_edge_values():
+    """
+    Assert that :func:`~pai_lang.parser.parse` returns shared "node" and "edge" values across data strings.
+    """
+    first = parser.parse('workspace:any:user:email:foo@bar.com')
+    second = parser.parse(''.join(['workspace:any:us', 'er:email:baz@bar.com']))
+    assert first[0].node is second[0].node
+    assert first[1].edge is second[1].edge
@@ -0,0 +1,133 @@
+"""
+    test_lazy
+    ~~~~~~~~~
+
+    Tests for the :mod:`~pai_lang.lazy` module.
+"""
+
+import pytest
+
+from pai_lang import lazy, parser, syntax
+
+
+def collect(nodes):
+    """
+    Consume the given node iterable into comparable values, capturing any exception raised part way through.
+    """
+    values = []
+    try:
+        for node in nodes:
+            values.append((node.node, node.edge, node.property, node.is_root))
+    except Exception as e:
+        values.append((type(e), str(e)))
+    return values
+
+
+def collect_lazy(data):
+    """
+    Parse the given string lazily and collect its values, capturing an exception raised for the root.
+    """
+    try:
+        chain = lazy.parse_lazy(data)
+    except syntax.SyntaxError as e:
+        return [(type(e), str(e))]
+    return collect(chain)
+
+
+@pytest.mark.parametrize('data', [
+    '',
+    ':',
+    'a',
+    'a:b',
+    ':a:b:c:',
+    'a::b:::c',
+    'x:a:b:c',
+    'w:x:y:a:b:c',
+    'workspace:any:user:email:foo@bar.com',
+    'settings:any:workspace:any:user:email:foo@bar.com',
+    'with space:edge\n:prop\t',
+    '"a:b":c:d',
+    'user:email:"foo@bar.com"',
+    b'workspace:any:user:email:foo@bar.com'
+])
+def test_parse_lazy_matches_parse_gen(data):
+    """
+    Assert that :func:`~pai_lang.lazy.parse_lazy` yields the same values and errors as
+    :func:`~pai_lang.parser.parse_gen`.
+    """
+    assert collect_lazy(data) == collect(parser.parse_gen(data))
+
+
+def test_parse_lazy_only_reaches_accessed_nodes():
+    """
+    Assert that :class:`~pai_lang.lazy.LazyChain` only creates nodes up to the one accessed.
+    """
+    chain = lazy.parse_lazy('c:x:b:y:a:any:user:email:foo@bar.com')
+    assert len(chain._nodes) == 1
+    assert chain[0].node == 'user'
+    assert chain[0]._property is lazy._UNSET
+    assert chain[1].node == 'a'
+    assert len(chain._nodes) == 2
+    assert len(chain) == 4
+
+
+def test_parse_lazy_links_nodes():
+    """
+    Assert that :class:`~pai_lang.lazy.LazyNode` links each node to its parent and child.
+    """
+    chain = lazy.parse_lazy('settings:any:workspace:any:user:email:foo@bar.com')
+    root = chain[0]
+    child = root.child
+    grandchild = child.child
+    assert root.is_root and root.parent is syntax.ROOT_SENTINEL
+    assert child.is_child and child.parent is root
+    assert grandchild.parent is child
+    assert grandchild.child is None
+    assert list(chain) == [root, child, grandchild]
+    assert chain[-1] is grandchild
+    assert chain[1:] == [child, grandchild]
+
+
+def test_parse_lazy_raises_when_malformed_child_is_reached():
+    """
+    Assert that :class:`~pai_lang.lazy.LazyChain` raises for a malformed child only when it is reached.
+    """
+    chain = lazy.parse_lazy('x:a:b:c')
+    assert chain[0].node == 'a'
+    for _ in range(2):
+        with pytest.raises(syntax.SyntaxError):
+            chain[0].child
+    with pytest.raises(syntax.SyntaxError):
+        len(chain)
+
+
+def test_parse_lazy_applies_limits():
+    """
+    Assert that :func:`~pai_lang.lazy.parse_lazy` checks the data string against the limits up front.
+    """
+    limits = syntax.Limits(max_length=20, max_hops=2)
+    assert len(lazy.parse_lazy('w:any:a:b:c', limits)) == 2
+    for data in ('x:any:w:any:a:b:c', 'a:b:' + 'c' * 20, '"x":any:w:any:a:b:c'):
+        with pytest.raises(syntax.LimitExceeded):
+            lazy.parse_lazy(data, limits)
+
+
+def test_parse_lazy_raises_index_error():
+    """
+    Assert that :class:`~pai_lang.lazy.LazyChain` raises an :class:`~IndexError` past the last node.
+    """
+    chain = lazy.parse_lazy('a:b:c')
+    with pytest.raises(IndexError):
+        chain[1]
+    assert chain.get(1) is None
+    assert not lazy.parse_lazy('')
+
+
+def test_parse_lazy_converts_to_nodes():
+    """
+    Assert that a :class:`~pai_lang.lazy.LazyChain` can be packed and frozen like a list of nodes.
+    """
+    data = 'workspace:any:user:email:foo@bar.com'
+    chain = lazy.parse_lazy(data)
+    assert syntax.pack(chain) == syntax.pack(parser.parse(data))
+    assert syntax.freeze(chain) == syntax.freeze(parser.parse(data))
@@ -0,0 +1,94 @@
+"""
+    test_match
+    ~~~~~~~~~~
+
+    Tests for the :mod:`~pai_lang.match` module.
+"""
+
+import pytest
+
+from pai_lang import match, parser, syntax
+
+
+PATTERNS = {
+    'exact': 'workspace:id:user:email:foo@bar.com',
+    'any-edge': 'workspace:any:user:email:foo@bar.com',
+    'any-property': 'workspace:any:user:email:*',
+    'any-node': '*:any:user:email:*',
+    'root-only': 'user:email:*',
+    'other-root': 'user:id:*'
+}
+
+
+@pytest.fixture(scope='module')
+def matcher():
+    """
+    Fixture that yields a :class:`~pai_lang.match.PatternMatcher` with all :data:`PATTERNS` registered.
+    """
+    matcher = match.PatternMatcher()
+    for pattern_id, pattern in PATTERNS.items():
+        matcher.add(pattern, pattern_id)
+    return matcher
+
+
+@pytest.mark.parametrize('expression, expected', [
+    ('workspace:id:user:email:foo@bar.com', {'exact', 'any-edge', 'any-property', 'any-node'}),
+    ('workspace:any:user:email:foo@bar.com', {'any-edge', 'any-property', 'any-node'}),
+    ('workspace:member:user:email:baz@bar.com', {'any-property', 'any-node'}),
+    ('settings:any:user:email:baz@bar.com', {'any-node'}),
+    ('user:email:foo@bar.com', {'root-only'}),
+    ('user:name:foo', set()),
+    ('settings:any:workspace:any:user:email:foo@bar.com', set())
+])
+def test_match_returns_all_matching_patterns(matcher, expression, expected):
+    """
+    Assert that :meth:`~pai_lang.match.PatternMatcher.match` returns the ids of every matching pattern.
+    """
+    result = matcher.match(expression)
+    assert set(result) == expected
+    assert len(result) == len(expected)
+
+
+def test_match_accepts_parsed_and_packed_chains(matcher):
+    """
+    Assert that :meth:`~pai_lang.match.PatternMatcher.match` accepts parsed and packed chains.
+    """
+    nodes = parser.parse('workspace:member:user:email:baz@bar.com')
+    assert sorted(matcher.match(nodes)) == sorted(matcher.match(syntax.pack(nodes)))
+
+
+def test_match_treats_any_edge_literally_when_disabled():
+    """
+    Assert that :class:`~pai_lang.match.PatternMatcher` matches "any" edges exactly when `any_edge` is disabled.
+    """
+    matcher = match.PatternMatcher(any_edge=False)
+    matcher.add('workspace:any:user:email:*')
+    assert matcher.match('workspace:id:user:email:foo@bar.com') == []
+    assert matcher.match('workspace:any:user:email:foo@bar.com') == [0]
+
+
+def test_add_assigns_unused_ids():
+    """
+    Assert that :meth:`~pai_lang.match.PatternMatcher.add` assigns unused integer ids to patterns.
+    """
+    matcher = match.PatternMatcher()
+    assert matcher.add('a:b:c', 1) == 1
+    assert matcher.add('a:b:*') == 0
+    assert matcher.add('*:b:c') == 2
+    assert sorted(matcher.match('a:b:c')) == [0, 1, 2]
+
+
+def test_add_raises_on_duplicate_id(matcher):
+    """
+    Assert that :meth:`~pai_lang.match.PatternMatcher.add` raises a :class:`~ValueError` for a registered id.
+    """
+    with pytest.raises(ValueError):
+        matcher.add('a:b:c', 'exact')
+
+
+def test_add_raises_on_empty_pattern():
+    """
+    Assert that :meth:`~pai_lang.match.PatternMatcher.add` raises a :class:`~ValueError` for an empty pattern.
+    """
+    with pytest.raises(ValueError):
+        match.PatternMatcher().add('')
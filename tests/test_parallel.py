@@ -0,0 +1,64 @@
+"""
+    test_parallel
+    ~~~~~~~~~~~~~
+
+    Tests for the :mod:`~pai_lang.parallel` module.
+"""
+
+import pytest
+
+from pai_lang import parallel, parser, syntax
+
+
+@pytest.fixture(scope='module')
+def corpus():
+    """
+    Fixture that yields a list of data strings, with a malformed string every tenth item.
+    """
+    return ['a:b' if i % 10 == 9 else 'n{0}:any:user:email:{0}'.format(i) for i in range(100)]
+
+
+def test_parse_corpus_preserves_order(corpus):
+    """
+    Assert that :func:`~pai_lang.parallel.parse_corpus` returns packed chains in input order.
+    """
+    results = list(parallel.parse_corpus(corpus, workers=2, chunksize=7, errors=parser.ERRORS_YIELD))
+    assert len(results) == len(corpus)
+    for data, result in zip(corpus, results):
+        if data == 'a:b':
+            assert isinstance(result, syntax.SyntaxError)
+        else:
+            assert result == syntax.pack(parser.parse(data))
+
+
+def test_parse_corpus_skips_errors(corpus):
+    """
+    Assert that :func:`~pai_lang.parallel.parse_corpus` drops items that fail to parse using the "skip" policy.
+    """
+    results = list(parallel.parse_corpus(corpus, workers=2, chunksize=16, errors=parser.ERRORS_SKIP))
+    assert len(results) == 90
+
+
+def test_parse_corpus_raises_on_error_by_default(corpus):
+    """
+    Assert that :func:`~pai_lang.parallel.parse_corpus` raises a :class:`~pai_lang.syntax.SyntaxError` by default.
+    """
+    with pytest.raises(syntax.SyntaxError):
+        list(parallel.parse_corpus(corpus, workers=2, chunksize=16))
+
+
+def test_parse_corpus_applies_limits(corpus):
+    """
+    Assert that :func:`~pai_lang.parallel.parse_corpus` checks each item against the given limits.
+    """
+    limits = syntax.Limits(max_token_length=2)
+    results = list(parallel.parse_corpus(corpus, workers=2, chunksize=16, errors=parser.ERRORS_YIELD, limits=limits))
+    assert sum(isinstance(result, syntax.LimitExceeded) for result in results) == 90
+
+
+def test_parse_corpus_raises_on_invalid_chunksize(corpus):
+    """
+    Assert that :func:`~pai_lang.parallel.parse_corpus` raises a :class:`~ValueError` when `chunksize` is less than one.
+    """
+    with pytest.raises(ValueError):
+        next(parallel.parse_corpus(corpus, chunksize=0))
@@ -7,7 +7,8 @@
 
 import pytest
 
-from pai_lang import parser
+from pai_lang import parser, serializer, syntax
+from pai_parser import tokenizer
 
 
 @pytest.fixture(scope='function')
@@ -144,3 +145,623 @@ def test_parse_gen_yields_root_and_two_child_nodes_per_syntax(root_and_two_child
     assert is_root_node(nodes[0])
     assert is_child_node(nodes[1])
     assert is_child_node(nodes[2])
+
+
+@pytest.fixture(scope='module', params=[
+    '',
+    ':',
+    'a',
+    'a:b',
+    ':a:b:c:',
+    'a::b:::c',
+    'x:a:b:c',
+    'w:x:y:a:b:c',
+    'workspace:any:user:email:foo@bar.com',
+    'settings:any:workspace:any:user:email:foo@bar.com',
+    'with space:edge\n:prop\t',
+])
+def fast_path_token_stream(request):
+    """
+    Fixture that yields strings, valid and malformed, that are handled by the fast path.
+    """
+    return request.param
+
+
+@pytest.fixture(scope='module', params=[
+    '"a:b":c:d',
+    'a:b:\'c:d\'',
+    'a:b:c#comment',
+    'user:email:"foo@bar.com"'
+])
+def generic_path_token_stream(request):
+    """
+    Fixture that yields strings containing characters that the generic tokenizer treats specially.
+    """
+    return request.param
+
+
+def generic_parse(data):
+    """
+    Parse the given string using only the generic :mod:`~pai_parser` path.
+
+    :return: Tuple of node values created, or the type and message of the exception raised
+    """
+    from pai_lang import visitor
+    from pai_parser import parser as generic_parser
+    return collect(generic_parser.parse_gen(data, visitor, syntax.DELIMITER, syntax.GROUP_SIZE, syntax.RTL))
+
+
+def collect(nodes):
+    """
+    Consume the given node iterable into comparable values, capturing any exception raised part way through.
+    """
+    values = []
+    try:
+        for node in nodes:
+            values.append((node.node, node.edge, node.property, node.is_root))
+    except Exception as e:
+        values.append((type(e), str(e)))
+    return values
+
+
+def test_fast_path_supports_plain_strings(fast_path_token_stream):
+    """
+    Assert that :func:`~pai_lang.parser._supports_fast_path` accepts strings without special lexer characters.
+    """
+    assert parser._supports_fast_path(fast_path_token_stream) is True
+
+
+def test_fast_path_rejects_special_lexer_strings(generic_path_token_stream):
+    """
+    Assert that :func:`~pai_lang.parser._supports_fast_path` rejects strings with quote or comment characters.
+    """
+    assert parser._supports_fast_path(generic_path_token_stream) is False
+
+
+def test_parse_gen_fast_path_matches_generic_path(fast_path_token_stream):
+    """
+    Assert that :func:`~pai_lang.parser.parse_gen` yields the same nodes and errors as the generic path.
+    """
+    assert collect(parser.parse_gen(fast_path_token_stream)) == generic_parse(fast_path_token_stream)
+
+
+def test_parse_gen_falls_back_to_generic_path(generic_path_token_stream):
+    """
+    Assert that :func:`~pai_lang.parser.parse_gen` uses the generic path for strings with special lexer characters.
+    """
+    assert collect(parser.parse_gen(generic_path_token_stream)) == generic_parse(generic_path_token_stream)
+
+
+def test_parse_gen_fast_path_links_nodes(root_and_two_child_nodes_token_stream):
+    """
+    Assert that :func:`~pai_lang.parser.parse_gen` links each node to its parent and child.
+    """
+    root, child, grandchild = parser.parse(root_and_two_child_nodes_token_stream)
+    assert root.child is child
+    assert child.parent is root
+    assert child.child is grandchild
+    assert grandchild.parent is child
+    assert grandchild.child is None
+
+
+@pytest.fixture(scope='module', params=[
+    'a:b',
+    'x:a:b:c',
+    '"a:b":c'
+])
+def malformed_token_stream(request):
+    """
+    Fixture that yields strings that raise a :class:`~pai_lang.syntax.SyntaxError` when parsed.
+    """
+    return request.param
+
+
+def test_parse_matches_parse_gen(fast_path_token_stream):
+    """
+    Assert that :func:`~pai_lang.parser.parse` returns the same nodes and errors as the generic path.
+    """
+    try:
+        nodes = collect(parser.parse(fast_path_token_stream))
+    except Exception as e:
+        nodes = [(type(e), str(e))]
+    assert nodes == generic_parse(fast_path_token_stream)[-len(nodes):]
+
+
+def test_parse_many_returns_node_list_per_item(root_node_only_token_stream, root_and_two_child_nodes_token_stream):
+    """
+    Assert that :func:`~pai_lang.parser.parse_many` returns the same node lists as :func:`~pai_lang.parser.parse`.
+    """
+    items = [root_node_only_token_stream, root_and_two_child_nodes_token_stream, '"a":b:c']
+    results = parser.parse_many(items)
+    assert len(results) == len(items)
+    for item, nodes in zip(items, results):
+        assert collect(nodes) == collect(parser.parse(item))
+
+
+def test_parse_many_gen_is_lazy():
+    """
+    Assert that :func:`~pai_lang.parser.parse_many_gen` does not consume items before they are requested.
+    """
+    def items():
+        yield 'a:b:c'
+        raise AssertionError('consumed too many items')
+
+    assert len(next(parser.parse_many_gen(items()))) == 1
+
+
+def test_parse_many_raises_on_error_by_default(malformed_token_stream):
+    """
+    Assert that :func:`~pai_lang.parser.parse_many` raises a :class:`~pai_lang.syntax.SyntaxError` by default.
+    """
+    with pytest.raises(syntax.SyntaxError):
+        parser.parse_many(['a:b:c', malformed_token_stream])
+
+
+def test_parse_many_skips_errors(malformed_token_stream):
+    """
+    Assert that :func:`~pai_lang.parser.parse_many` drops items that fail to parse using the "skip" policy.
+    """
+    results = parser.parse_many(['a:b:c', malformed_token_stream, 'd:e:f'], errors=parser.ERRORS_SKIP)
+    assert [nodes[0].node for nodes in results] == ['a', 'd']
+
+
+def test_parse_many_yields_errors_in_place(malformed_token_stream):
+    """
+    Assert that :func:`~pai_lang.parser.parse_many` returns errors in place using the "yield" policy.
+    """
+    results = parser.parse_many(['a:b:c', malformed_token_stream, 'd:e:f'], errors=parser.ERRORS_YIELD)
+    assert len(results) == 3
+    assert isinstance(results[1], syntax.SyntaxError)
+    with pytest.raises(syntax.SyntaxError) as e:
+        parser.parse(malformed_token_stream)
+    assert str(results[1]) == str(e.value)
+
+
+def test_parse_many_reuses_error_instances():
+    """
+    Assert that :func:`~pai_lang.parser.parse_many` yields the same error instance for identical errors.
+    """
+    first, second = parser.parse_many(['a:b', 'c:d'], errors=parser.ERRORS_YIELD)
+    assert first is second
+
+
+def test_parse_many_raises_on_unknown_error_policy():
+    """
+    Assert that :func:`~pai_lang.parser.parse_many` raises a :class:`~ValueError` for an unknown error policy.
+    """
+    with pytest.raises(ValueError):
+        parser.parse_many(['a:b:c'], errors='ignore')
+
+
+def test_parse_creates_nodes_of_given_type(root_and_two_child_nodes_token_stream):
+    """
+    Assert that :func:`~pai_lang.parser.parse` creates linked nodes of the given `cls`.
+    """
+    nodes = parser.parse(root_and_two_child_nodes_token_stream, cls=syntax.AcyclicNode)
+    assert all(isinstance(node, syntax.AcyclicNode) for node in nodes)
+    assert collect(nodes) == collect(parser.parse(root_and_two_child_nodes_token_stream))
+    assert nodes[0].child is nodes[1]
+    assert nodes[2].parent is nodes[1]
+
+
+def test_parse_many_creates_nodes_of_given_type(generic_path_token_stream):
+    """
+    Assert that :func:`~pai_lang.parser.parse_many` creates nodes of the given `cls` on the fast and generic paths.
+    """
+    results = parser.parse_many(['a:b:c', generic_path_token_stream], errors=parser.ERRORS_SKIP,
+                                cls=syntax.AcyclicNode)
+    for nodes in results:
+        assert all(isinstance(node, syntax.AcyclicNode) for node in nodes)
+
+
+def test_parse_chain_returns_chain_of_chain_nodes(root_and_two_child_nodes_token_stream, generic_path_token_stream):
+    """
+    Assert that :func:`~pai_lang.parser.parse_chain` returns a :class:`~pai_lang.syntax.Chain` of the nodes
+    :func:`~pai_lang.parser.parse` creates, each knowing its position.
+    """
+    for data in (root_and_two_child_nodes_token_stream, generic_path_token_stream):
+        chain = parser.parse_chain(data)
+        assert isinstance(chain, syntax.Chain)
+        assert collect(chain) == collect(parser.parse(data))
+        assert all(isinstance(node, syntax.ChainNode) for node in chain)
+        assert [node.position for node in chain] == list(range(len(chain)))
+        assert all(node.chain is chain for node in chain)
+        assert chain.root is chain[0] and chain.leaf is chain[-1]
+
+
+def test_parse_chain_raises_on_error(malformed_token_stream):
+    """
+    Assert that :func:`~pai_lang.parser.parse_chain` raises the same errors as :func:`~pai_lang.parser.parse`.
+    """
+    with pytest.raises(syntax.SyntaxError):
+        parser.parse_chain(malformed_token_stream)
+
+
+@pytest.mark.parametrize('data, limits', [
+    ('a' * 65, syntax.Limits(max_length=64)),
+    (b'a' * 65, syntax.Limits(max_length=64)),
+    ('x:any:w:any:a:b:c', syntax.Limits(max_hops=2)),
+    ('x::any:::w:any:a:b:c:', syntax.Limits(max_hops=2)),
+    ('"x:y":any:w:any:a:b:c', syntax.Limits(max_hops=2)),
+    ('a:b:abcdefghi', syntax.Limits(max_token_length=8)),
+    ('abcdefghi:b:c', syntax.Limits(max_token_length=8)),
+    ('a:b:"abcdefg"', syntax.Limits(max_token_length=8)),
+    ('"a:b:c":x:y', syntax.Limits(max_token_length=4)),
+    (b'a:b:abcdefghi', syntax.Limits(max_token_length=8))
+])
+def test_parse_raises_on_exceeded_limits(data, limits):
+    """
+    Assert that :func:`~pai_lang.parser.parse`, :func:`~pai_lang.parser.parse_gen` and
+    :func:`~pai_lang.parser.parse_chain` raise a :class:`~pai_lang.syntax.LimitExceeded` for data strings that
+    exceed the given limits.
+    """
+    for function in (parser.parse, parser.parse_gen, parser.parse_chain):
+        with pytest.raises(syntax.LimitExceeded):
+            function(data, limits=limits)
+
+
+@pytest.mark.parametrize('data', [
+    'w:any:a:b:c',
+    'w::any:::a:b:abcdefgh:',
+    '"w:x":any:a:b:c',
+    '"a:b:c:d:e:f:g:h:i":b:c',
+    'a:b:c#d:e:f:g:h:i:j',
+    b'w:any:a:b:c'
+])
+def test_parse_accepts_data_within_limits(data):
+    """
+    Assert that :func:`~pai_lang.parser.parse` parses data strings within the limits as if there were none.
+    """
+    limits = syntax.Limits(max_length=32, max_hops=2, max_token_length=20)
+    assert collect(parser.parse(data, limits=limits)) == collect(parser.parse(data))
+
+
+def test_parse_rejects_oversized_input_before_scanning_it():
+    """
+    Assert that limits reject oversized input before scanning past the limit.
+    """
+    assert next(parser._token_spans_gen('a' * 1000000 + ':b:c', ':', 8)) == (9, 9)
+
+    with pytest.raises(syntax.LimitExceeded):
+        parser.parse('a:' * 500000 + 'b:c', limits=syntax.Limits(max_hops=16))
+
+
+@pytest.mark.parametrize('data', [
+    "'" + 'a' * 1000000,
+    "x:'" + 'a:' * 1000000,
+    'x:"a:b":' + 'c:' * 1000000,
+    'x:a#' + 'b' * 1000000 + '\n' + 'c' * 1000000
+])
+def test_parse_rejects_oversized_quoted_input_before_scanning_it(data):
+    """
+    Assert that limits reject oversized input with quote or comment characters, including unclosed quotes, as a
+    :class:`~pai_lang.syntax.LimitExceeded` without tokenizing it.
+    """
+    with pytest.raises(syntax.LimitExceeded):
+        parser.parse(data, limits=syntax.Limits(max_hops=8, max_token_length=256))
+
+
+@pytest.mark.parametrize('data', [
+    '',
+    '#:a:b',
+    'a:b#c:d\ne:f',
+    '\'a\'b:c',
+    'a\'b:"c":d',
+    '"a:b"#c\n:d',
+    ':"a\'b":\'c"d\':e',
+    'a:"b:c'
+])
+def test_shell_token_spans_match_generic_tokenizer(data):
+    """
+    Assert that :func:`~pai_lang.parser._shell_token_spans_gen` finds the tokens of the generic tokenizer, up to an
+    unclosed quote.
+    """
+    lengths = []
+    try:
+        for token in tokenizer.tokenize_iter(data, syntax.DELIMITER):
+            lengths.append(len(token))
+    except ValueError:
+        pass
+    assert [length for length, _ in parser._shell_token_spans_gen(data, syntax.DELIMITER)] == lengths
+
+
+@pytest.mark.parametrize('limits', [None, syntax.Limits(max_hops=4)])
+@pytest.mark.parametrize('errors', [parser.ERRORS_SKIP, parser.ERRORS_YIELD])
+def test_parse_many_applies_error_policy_to_invalid_input(errors, limits):
+    """
+    Assert that :func:`~pai_lang.parser.parse_many` and :meth:`~pai_lang.parser.Parser.parse_many` handle items the
+    tokenizer cannot split, e.g. with an unclosed quote, with the `errors` policy.
+    """
+    items = ['a:b:c', 'a:b:"c', b'x:y:\xff', 'x:y:z']
+    dialect_parser = parser.Parser(limits=limits)
+    for results in (parser.parse_many(items, errors, limits=limits), dialect_parser.parse_many(items, errors)):
+        if errors == parser.ERRORS_SKIP:
+            assert [syntax.pack(nodes) for nodes in results] == [(('a', 'b', 'c'),), (('x', 'y', 'z'),)]
+        else:
+            assert all(isinstance(result, syntax.InvalidInput) for result in results[1:3])
+            assert 'No closing quotation' in str(results[1])
+
+    with pytest.raises(syntax.InvalidInput):
+        parser.parse_many(items, limits=limits)
+    with pytest.raises(ValueError):
+        parser.parse('a:b:"c')
+
+
+@pytest.mark.parametrize('errors', [parser.ERRORS_SKIP, parser.ERRORS_YIELD])
+def test_parse_many_applies_error_policy_to_exceeded_limits(errors):
+    """
+    Assert that :func:`~pai_lang.parser.parse_many` handles exceeded limits with the `errors` policy.
+    """
+    items = ['a:b:c', 'x:any:w:any:a:b:c', 'a:b', 'w:any:a:b:c']
+    results = parser.parse_many(items, errors=errors, limits=syntax.Limits(max_hops=2))
+    if errors == parser.ERRORS_SKIP:
+        assert [len(nodes) for nodes in results] == [1, 2]
+    else:
+        assert isinstance(results[1], syntax.LimitExceeded)
+        assert isinstance(results[2], syntax.SyntaxError) and not isinstance(results[2], syntax.LimitExceeded)
+        assert [len(results[0]), len(results[3])] == [1, 2]
+
+    with pytest.raises(syntax.LimitExceeded):
+        parser.parse_many(items, limits=syntax.Limits(max_hops=2))
+
+
+def test_parser_applies_limits():
+    """
+    Assert that :class:`~pai_lang.parser.Parser` checks each data string against its limits.
+    """
+    limits = syntax.Limits(max_hops=1, max_token_length=4)
+    dialect_parser = parser.Parser(syntax.Dialect('->', rtl=False), limits=limits)
+    assert collect(dialect_parser.parse('user->name->abcd')) == collect(parser.parse('user:name:abcd'))
+
+    for data in ('user->name->abcd->w->any', 'user->name->abcde'):
+        with pytest.raises(syntax.LimitExceeded):
+            dialect_parser.parse(data)
+        with pytest.raises(syntax.LimitExceeded):
+            dialect_parser.parse_gen(data)
+    assert len(dialect_parser.parse_many(['a->b->c', 'a->b->c->d->e'], errors=parser.ERRORS_SKIP)) == 1
+
+    with pytest.raises(ValueError):
+        parser.Parser(limits=(None, 1, None))
+
+
+def test_parser_default_dialect_matches_parse(fast_path_token_stream, generic_path_token_stream):
+    """
+    Assert that a :class:`~pai_lang.parser.Parser` for the default dialect matches :func:`~pai_lang.parser.parse_gen`.
+    """
+    default_parser = parser.Parser()
+    for data in (fast_path_token_stream, generic_path_token_stream):
+        assert collect(default_parser.parse_gen(data)) == collect(parser.parse_gen(data))
+
+
+@pytest.mark.parametrize('delimiter', ['/', '::', ' -> ', '#'])
+def test_parser_rtl_dialect_matches_default_dialect(delimiter, fast_path_token_stream):
+    """
+    Assert that a right-to-left :class:`~pai_lang.parser.Parser` with another delimiter parses like the default.
+    """
+    dialect_parser = parser.Parser(syntax.Dialect(delimiter))
+    data = fast_path_token_stream.replace(':', delimiter)
+    assert collect(dialect_parser.parse_gen(data)) == collect(parser.parse_gen(fast_path_token_stream))
+
+
+def test_parser_ltr_dialect_mirrors_default_dialect(root_and_two_child_nodes_token_stream):
+    """
+    Assert that a left-to-right :class:`~pai_lang.parser.Parser` reads the root first.
+    """
+    tokens = root_and_two_child_nodes_token_stream.split(':')
+    groups = [tokens[-3:]] + [tokens[i:i + 2] for i in range(len(tokens) - 5, -1, -2)]
+    data = '/'.join(token for group in groups for token in group)
+
+    ltr_parser = parser.Parser(syntax.Dialect('/', rtl=False))
+    assert collect(ltr_parser.parse(data)) == collect(parser.parse(root_and_two_child_nodes_token_stream))
+
+    root, child, grandchild = ltr_parser.parse(data)
+    assert root.child is child and child.child is grandchild
+    assert grandchild.parent is child and child.parent is root
+
+
+@pytest.mark.parametrize('data, expected', [
+    ('', []),
+    ('a', [(syntax.SyntaxError, 'Insufficient tokens; expected 3')]),
+    ('a/b/c/d', [('a', 'b', 'c', True), (syntax.SyntaxError, 'Insufficient tokens; expected 2')]),
+    ('a//b/c/', [('a', 'b', 'c', True)]),
+    (b'a/b/c/d/e', [('a', 'b', 'c', True), ('d', 'e', None, False)])
+])
+def test_parser_ltr_dialect_errors(data, expected):
+    """
+    Assert that a left-to-right :class:`~pai_lang.parser.Parser` raises the same errors as the default dialect.
+    """
+    ltr_parser = parser.Parser(syntax.Dialect('/', rtl=False))
+    assert collect(ltr_parser.parse_gen(data)) == expected
+
+    errors = [value for value in expected if isinstance(value[0], type)]
+    if errors:
+        with pytest.raises(syntax.SyntaxError):
+            ltr_parser.parse(data)
+    else:
+        assert collect(ltr_parser.parse(data)) == expected
+
+
+@pytest.mark.parametrize('malformed', ['a:b', 'x:a:b:c'])
+def test_parser_parse_many_applies_error_policy(malformed):
+    """
+    Assert that :meth:`~pai_lang.parser.Parser.parse_many` handles errors like :func:`~pai_lang.parser.parse_many`.
+    """
+    items = ['a:b:c', malformed, 'd:e:f']
+    for dialect_parser in (parser.Parser(), parser.Parser(syntax.Dialect('::'))):
+        data = [item.replace(':', dialect_parser.dialect.delimiter) for item in items]
+        assert len(dialect_parser.parse_many(data, errors=parser.ERRORS_SKIP)) == 2
+        results = dialect_parser.parse_many(data, errors=parser.ERRORS_YIELD)
+        assert isinstance(results[1], syntax.SyntaxError)
+        with pytest.raises(syntax.SyntaxError):
+            dialect_parser.parse_many(data)
+        with pytest.raises(ValueError):
+            dialect_parser.parse_many(data, errors='ignore')
+
+
+def test_parser_creates_nodes_of_given_type():
+    """
+    Assert that :class:`~pai_lang.parser.Parser` creates nodes of the given `cls` on every code path.
+    """
+    for dialect, data in ((syntax.DEFAULT_DIALECT, 'a:"b":c:d:e'), (syntax.Dialect('/', False), 'a/b/c/d/e')):
+        nodes = parser.Parser(dialect, cls=syntax.AcyclicNode).parse(data)
+        assert len(nodes) == 2
+        assert all(isinstance(node, syntax.AcyclicNode) for node in nodes)
+
+
+def test_parser_raises_on_invalid_input():
+    """
+    Assert that :class:`~pai_lang.parser.Parser` raises a :class:`~ValueError` for invalid dialects and input.
+    """
+    with pytest.raises(ValueError):
+        parser.Parser(':')
+    with pytest.raises(ValueError):
+        parser.Parser(syntax.Dialect('::')).parse(None)
+
+
+@pytest.mark.parametrize('data', [
+    '',
+    ':',
+    'a',
+    'a:b',
+    'a:b:c',
+    ':a:b:c:',
+    'x:a:b:c',
+    'w:x:y:a:b:c',
+    'v:w:x:y:a:b:c',
+    'settings:any:workspace:any:user:email:foo@bar.com',
+    '"a:b":c:d',
+    '"a:b":c',
+    'a:b:c#comment',
+    'a:"b:c',
+    b'workspace:any:user:email:foo@bar.com',
+    b'a:b',
+    b'\xff:b:c',
+    None
+])
+def test_validate_many_matches_parse(data):
+    """
+    Assert that :func:`~pai_lang.parser.validate_many` reports the same outcome as :func:`~pai_lang.parser.parse`.
+    """
+    result = parser.validate_many([data])
+    try:
+        nodes = parser.parse(data)
+    except ValueError:
+        assert result.status[0] == parser.STATUS_INVALID_INPUT
+        assert list(result.indices) == [0]
+    except syntax.SyntaxError as e:
+        expected = int(str(e).rsplit(' ', 1)[-1])
+        assert result.status[0] == (parser.STATUS_ROOT_TOKENS if expected == syntax.ROOT_NODE_SIZE
+                                    else parser.STATUS_CHILD_TOKENS)
+        assert list(result.indices) == [0]
+    else:
+        assert result.status[0] == parser.STATUS_OK
+        assert not result.indices and not result.offsets
+        assert nodes is not None
+
+
+def test_validate_many_reports_failures_in_order():
+    """
+    Assert that :func:`~pai_lang.parser.validate_many` reports the index and token offset of each failing item.
+    """
+    result = parser.validate_many(iter(['a:b:c', 'a:b', 'x:a:b:c', 'u:v:w:x:y:a:b:c', 5]))
+    assert list(result.status) == [parser.STATUS_OK, parser.STATUS_ROOT_TOKENS, parser.STATUS_CHILD_TOKENS,
+                                   parser.STATUS_CHILD_TOKENS, parser.STATUS_INVALID_INPUT]
+    assert list(result.indices) == [1, 2, 3, 4]
+    assert list(result.offsets) == [0, 3, 7, 0]
+
+
+def test_validate_many_applies_limits():
+    """
+    Assert that :func:`~pai_lang.parser.validate_many` reports items that exceed the limits, like
+    :func:`~pai_lang.parser.parse`, before checking their tokens.
+    """
+    limits = syntax.Limits(max_length=20, max_hops=2)
+    items = ['a:b:c', 'x:any:w:any:a:b:c', 'a:b:' + 'c' * 20, 'x:a:b:c', '"a:b', None]
+    result = parser.validate_many(items, limits)
+    assert list(result.status) == [parser.STATUS_OK, parser.STATUS_LIMIT_EXCEEDED, parser.STATUS_LIMIT_EXCEEDED,
+                                   parser.STATUS_CHILD_TOKENS, parser.STATUS_INVALID_INPUT,
+                                   parser.STATUS_INVALID_INPUT]
+    assert list(result.indices) == [1, 2, 3, 4, 5]
+    assert list(result.offsets) == [0, 0, 3, 0, 0]
+    for index, data in enumerate(items):
+        if result.status[index] == parser.STATUS_LIMIT_EXCEEDED:
+            with pytest.raises(syntax.LimitExceeded):
+                parser.parse(data, limits=limits)
+
+
+@pytest.mark.parametrize('base, prefix', [
+    ('user:email:x', ''),
+    ('user:email:x', 'workspace:any'),
+    ('user:email:x', 'settings:any:workspace:any:'),
+    ('workspace:any:user:email:x', 'settings:any'),
+    ('user:email:x', '"a:b":c')
+])
+def test_extend_matches_parse(base, prefix):
+    """
+    Assert that :func:`~pai_lang.parser.extend` returns the same chain as parsing the whole data string.
+    """
+    chain = parser.parse(base)
+    extended = parser.extend(chain, prefix)
+    assert collect(extended) == collect(parser.parse(prefix + ':' + base))
+    assert extended[:len(chain)] == chain
+    for parent, child in zip(extended, extended[1:]):
+        assert parent.child is child
+        assert child.parent is parent
+
+
+def test_extend_raises_on_malformed_prefix():
+    """
+    Assert that :func:`~pai_lang.parser.extend` raises a :class:`~pai_lang.syntax.SyntaxError` for an odd prefix.
+    """
+    with pytest.raises(syntax.SyntaxError):
+        parser.extend(parser.parse('user:email:x'), 'x:workspace:any')
+    with pytest.raises(ValueError):
+        parser.extend([], 'workspace:any')
+
+
+def test_extend_leaves_chain_unchanged_on_malformed_prefix():
+    """
+    Assert that :func:`~pai_lang.parser.extend` does not link any node to the chain when the prefix is malformed.
+    """
+    chain = parser.parse('user:email:foo')
+    with pytest.raises(syntax.SyntaxError):
+        parser.extend(chain, 'x:a:b')
+    assert chain[-1].child is None
+
+
+def test_extend_raises_on_mutable_chain_extended_twice():
+    """
+    Assert that :func:`~pai_lang.parser.extend` raises a :class:`~ValueError` instead of linking the leaf of a
+    mutable chain to a second prefix.
+    """
+    base = parser.parse('user:email:x')
+    workspace = parser.extend(base, 'workspace:any')
+    with pytest.raises(ValueError):
+        parser.extend(base, 'team:member')
+    assert base[0].child is workspace[1]
+    assert serializer.dumps(base[0]) == 'workspace:any:user:email:x'
+    assert parser.extend(base, '') == base
+
+
+def test_extend_gen_builds_chains_incrementally():
+    """
+    Assert that :func:`~pai_lang.parser.extend_gen` creates nodes of the type of the leaf and links them to it.
+    """
+    leaf = parser.parse('user:email:x', cls=syntax.AcyclicNode)[0]
+    for depth in range(50):
+        leaf, = parser.extend_gen(leaf, 'n{}:any'.format(depth))
+        assert isinstance(leaf, syntax.AcyclicNode)
+    assert leaf.node == 'n49'
+    assert leaf.parent.node == 'n48'
+
+
+def test_extend_gen_shares_frozen_chains():
+    """
+    Assert that :func:`~pai_lang.parser.extend_gen` extends frozen chains without modifying them.
+    """
+    base = syntax.freeze(parser.parse('user:email:x'))
+    workspace = parser.extend(base, 'workspace:any')
+    team = parser.extend(base, 'team:any')
+    assert base[0].child is None
+    assert workspace[1].parent is team[1].parent is base[0]
+    assert syntax.freeze(workspace) == syntax.freeze(parser.parse('workspace:any:user:email:x'))
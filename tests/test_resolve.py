@@ -0,0 +1,324 @@
+"""
+    test_resolve
+    ~~~~~~~~~~~~
+
+    Tests for the :mod:`~pai_lang.resolve` package.
+"""
+
+import asyncio
+
+import pytest
+
+from pai_lang import parser, resolve
+
+
+@pytest.fixture(scope='function')
+def graph():
+    """
+    Fixture that yields a :class:`~pai_lang.resolve.MemoryGraph` of users, workspaces and settings.
+    """
+    graph = resolve.MemoryGraph()
+    graph.add('u1', 'user', email='foo@bar.com', name='foo')
+    graph.add('u2', 'user', email='baz@bar.com', name='baz')
+    graph.add('w1', 'workspace', name='acme')
+    graph.add('w2', 'workspace', name='globex')
+    graph.add('s1', 'settings', theme='dark')
+    graph.add('s2', 'settings', theme='light')
+    graph.relate('u1', 'member', 'w1')
+    graph.relate('u1', 'owner', 'w2')
+    graph.relate('u2', 'member', 'w2')
+    graph.relate('w1', 'config', 's1')
+    graph.relate('w2', 'config', 's2')
+    return graph
+
+
+@pytest.mark.parametrize('expression, expected', [
+    ('user:email:foo@bar.com', {'u1'}),
+    ('user:any:foo@bar.com', {'u1'}),
+    ('user:email:nobody@bar.com', set()),
+    ('workspace:member:user:email:foo@bar.com', {'w1'}),
+    ('workspace:any:user:email:foo@bar.com', {'w1', 'w2'}),
+    ('user:member:workspace:owner:user:email:foo@bar.com', {'u2'}),
+    ('settings:any:workspace:any:user:email:foo@bar.com', {'s1', 's2'}),
+    ('settings:config:workspace:member:user:email:baz@bar.com', {'s2'}),
+    ('settings:any:user:email:foo@bar.com', set()),
+    ('settings:any:workspace:any:user:email:nobody@bar.com', set())
+])
+def test_resolve_returns_resources_of_last_node(graph, expression, expected):
+    """
+    Assert that :func:`~pai_lang.resolve.resolve` returns the ids of the resources described by the last node.
+    """
+    assert resolve.resolve(expression, graph) == expected
+    assert resolve.resolve(parser.parse(expression), graph) == expected
+
+
+def test_resolve_stops_once_no_resources_remain(graph, mocker):
+    """
+    Assert that :func:`~pai_lang.resolve.resolve` does not traverse from an empty set of resources.
+    """
+    traverse = mocker.spy(graph, 'traverse')
+    assert resolve.resolve('settings:any:workspace:any:user:email:nobody@bar.com', graph) == set()
+    assert traverse.call_count == 0
+
+
+def test_resolve_raises_on_empty_chain(graph):
+    """
+    Assert that :func:`~pai_lang.resolve.resolve` raises a :class:`~ValueError` for an empty chain.
+    """
+    with pytest.raises(ValueError):
+        resolve.resolve('', graph)
+
+
+def test_memory_graph_relations_are_symmetric(graph):
+    """
+    Assert that :meth:`~pai_lang.resolve.MemoryGraph.relate` relates resources in both directions.
+    """
+    assert graph.traverse('user', 'member', ['w1']) == {'u1'}
+    assert graph.traverse('workspace', 'member', ['u1']) == {'w1'}
+
+
+def test_memory_graph_raises_on_duplicate_resource(graph):
+    """
+    Assert that :meth:`~pai_lang.resolve.MemoryGraph.add` raises a :class:`~ValueError` for an existing resource.
+    """
+    with pytest.raises(ValueError):
+        graph.add('u1', 'user')
+
+
+def test_memory_graph_raises_on_unknown_relation_resource(graph):
+    """
+    Assert that :meth:`~pai_lang.resolve.MemoryGraph.relate` raises a :class:`~KeyError` for unknown resources.
+    """
+    with pytest.raises(KeyError):
+        graph.relate('u1', 'member', 'w3')
+
+
+def test_backend_interface_is_not_implemented():
+    """
+    Assert that :class:`~pai_lang.resolve.Backend` requires subclasses to implement its methods.
+    """
+    with pytest.raises(NotImplementedError):
+        resolve.Backend().lookup('user', 'email', 'foo@bar.com')
+    with pytest.raises(NotImplementedError):
+        resolve.Backend().traverse('workspace', 'any', ['u1'])
+
+
+BATCH_EXPRESSIONS = [
+    'user:email:foo@bar.com',
+    'workspace:member:user:email:foo@bar.com',
+    'workspace:any:user:email:foo@bar.com',
+    'settings:any:workspace:any:user:email:foo@bar.com',
+    'settings:config:workspace:member:user:email:baz@bar.com',
+    'settings:any:workspace:any:user:email:nobody@bar.com',
+    'user:member:workspace:owner:user:email:foo@bar.com'
+]
+
+
+def test_resolve_many_matches_resolve(graph):
+    """
+    Assert that :func:`~pai_lang.resolve.resolve_many` returns the same resources as
+    :func:`~pai_lang.resolve.resolve` for each chain, in order.
+    """
+    expected = [resolve.resolve(expression, graph) for expression in BATCH_EXPRESSIONS]
+    assert resolve.resolve_many(BATCH_EXPRESSIONS, graph) == expected
+    assert resolve.resolve_many([parser.parse(e) for e in BATCH_EXPRESSIONS], graph) == expected
+
+
+def test_resolve_many_issues_one_call_per_level(graph):
+    """
+    Assert that :func:`~pai_lang.resolve.resolve_many` makes one backend call per chain level.
+    """
+    backend = resolve.LatencyBackend(graph, 0)
+    resolve.resolve_many(BATCH_EXPRESSIONS * 100, backend)
+    assert backend.calls == 3
+
+
+def test_resolve_many_deduplicates_keys(graph, mocker):
+    """
+    Assert that :func:`~pai_lang.resolve.resolve_many` requests each distinct lookup once.
+    """
+    lookup = mocker.spy(graph, 'lookup')
+    resolve.resolve_many(['user:email:foo@bar.com'] * 10, graph)
+    assert lookup.call_count == 1
+
+
+def test_resolve_many_default_batch_methods(graph):
+    """
+    Assert that the default :class:`~pai_lang.resolve.Backend` batch methods call the single methods.
+    """
+    class Wrapper(resolve.Backend):
+        def lookup(self, node, edge, property):
+            return graph.lookup(node, edge, property)
+
+        def traverse(self, node, edge, sources):
+            return graph.traverse(node, edge, sources)
+
+    expected = [resolve.resolve(expression, graph) for expression in BATCH_EXPRESSIONS]
+    assert resolve.resolve_many(BATCH_EXPRESSIONS, Wrapper()) == expected
+
+
+def test_resolve_many_empty(graph):
+    """
+    Assert that :func:`~pai_lang.resolve.resolve_many` returns an empty list without calling the backend.
+    """
+    backend = resolve.LatencyBackend(graph, 0)
+    assert resolve.resolve_many([], backend) == []
+    assert backend.calls == 0
+
+
+def test_resolve_many_raises_on_empty_chain(graph):
+    """
+    Assert that :func:`~pai_lang.resolve.resolve_many` raises a :class:`~ValueError` for an empty chain.
+    """
+    with pytest.raises(ValueError):
+        resolve.resolve_many(['user:email:foo@bar.com', ''], graph)
+
+
+@pytest.mark.parametrize('backend_cls', [resolve.LatencyBackend, resolve.AsyncLatencyBackend])
+def test_resolve_many_async(graph, backend_cls):
+    """
+    Assert that :func:`~pai_lang.resolve.resolve_many_async` resolves chains with synchronous and asynchronous
+    backends.
+    """
+    backend = backend_cls(graph, 0)
+    expected = [resolve.resolve(expression, graph) for expression in BATCH_EXPRESSIONS]
+    assert asyncio.run(resolve.resolve_many_async(BATCH_EXPRESSIONS, backend)) == expected
+    assert backend.calls == 3
+
+
+class Clock:
+    """
+    Manually advanced clock for testing expiry.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(scope='function')
+def clock():
+    """
+    Fixture that yields a manually advanced clock.
+    """
+    return Clock()
+
+
+@pytest.fixture(scope='function')
+def resolution_cache(graph, clock):
+    """
+    Fixture that yields a :class:`~pai_lang.resolve.ResolutionCache` in front of the graph fixture.
+    """
+    return resolve.ResolutionCache(resolve.LatencyBackend(graph, 0), maxsize=8, ttl=10, clock=clock)
+
+
+def test_resolution_cache_matches_resolve(graph, resolution_cache):
+    """
+    Assert that :meth:`~pai_lang.resolve.ResolutionCache.resolve` returns the same resources as
+    :func:`~pai_lang.resolve.resolve`, cold and cached.
+    """
+    for expression in BATCH_EXPRESSIONS:
+        expected = resolve.resolve(expression, graph)
+        assert resolution_cache.resolve(expression) == expected
+        assert resolution_cache.resolve(parser.parse(expression)) == expected
+
+
+def test_resolution_cache_reuses_partial_chains(resolution_cache):
+    """
+    Assert that :class:`~pai_lang.resolve.ResolutionCache` reuses the result of a cached partial chain.
+    """
+    resolution_cache.resolve('user:email:foo@bar.com')
+    assert resolution_cache.backend.calls == 1
+
+    resolution_cache.resolve('workspace:any:user:email:foo@bar.com')
+    assert resolution_cache.backend.calls == 2
+    assert 'workspace:any:user:email:foo@bar.com' in resolution_cache
+
+    resolution_cache.resolve('workspace:any:user:email:foo@bar.com')
+    assert resolution_cache.backend.calls == 2
+
+    info = resolution_cache.info()
+    assert (info.hits, info.misses, info.currsize) == (2, 2, 2)
+    assert info.hit_rate == 0.5
+
+
+def test_resolution_cache_expires_entries(resolution_cache, clock):
+    """
+    Assert that :class:`~pai_lang.resolve.ResolutionCache` resolves entries again once they expire.
+    """
+    resolution_cache.resolve('user:email:foo@bar.com')
+    clock.now = 9.9
+    resolution_cache.resolve('user:email:foo@bar.com')
+    assert resolution_cache.backend.calls == 1
+
+    clock.now = 10
+    resolution_cache.resolve('user:email:foo@bar.com')
+    assert resolution_cache.backend.calls == 2
+    assert resolution_cache.info().expirations == 1
+
+
+def test_resolution_cache_evicts_least_recently_used(graph):
+    """
+    Assert that :class:`~pai_lang.resolve.ResolutionCache` evicts the least recently used entry once full.
+    """
+    resolution_cache = resolve.ResolutionCache(graph, maxsize=2)
+    resolution_cache.resolve('user:email:foo@bar.com')
+    resolution_cache.resolve('user:email:baz@bar.com')
+    resolution_cache.resolve('user:email:foo@bar.com')
+    resolution_cache.resolve('user:any:foo@bar.com')
+    assert 'user:email:foo@bar.com' in resolution_cache
+    assert 'user:email:baz@bar.com' not in resolution_cache
+    assert resolution_cache.info().evictions == 1
+
+
+def test_resolution_cache_evicts_over_byte_budget(graph):
+    """
+    Assert that :class:`~pai_lang.resolve.ResolutionCache` keeps the estimated size of its entries within
+    `maxbytes`.
+    """
+    resolution_cache = resolve.ResolutionCache(graph, maxbytes=1000)
+    for expression in BATCH_EXPRESSIONS:
+        resolution_cache.resolve(expression)
+    info = resolution_cache.info()
+    assert 0 < info.currbytes <= 1000
+    assert info.evictions > 0
+
+
+def test_resolution_cache_invalidates_by_node_type(resolution_cache):
+    """
+    Assert that :meth:`~pai_lang.resolve.ResolutionCache.invalidate` removes every entry containing the node type.
+    """
+    resolution_cache.resolve('settings:any:workspace:any:user:email:foo@bar.com')
+    resolution_cache.resolve('user:email:baz@bar.com')
+    assert len(resolution_cache) == 4
+
+    assert resolution_cache.invalidate('workspace') == 2
+    assert 'user:email:foo@bar.com' in resolution_cache
+    assert 'workspace:any:user:email:foo@bar.com' not in resolution_cache
+    assert 'settings:any:workspace:any:user:email:foo@bar.com' not in resolution_cache
+    assert resolution_cache.invalidate('workspace') == 0
+
+
+def test_resolution_cache_clear_resets_entries_and_stats(resolution_cache):
+    """
+    Assert that :meth:`~pai_lang.resolve.ResolutionCache.clear` removes all entries and resets statistics.
+    """
+    resolution_cache.resolve('workspace:any:user:email:foo@bar.com')
+    resolution_cache.clear()
+    assert resolution_cache.info() == resolve.ResolutionCacheInfo(0, 0, 0, 0, 8, None, 0, 0)
+    assert resolution_cache.info().hit_rate == 0.0
+
+
+@pytest.mark.parametrize('kwargs', [
+    dict(maxsize=0),
+    dict(maxbytes=0),
+    dict(ttl=0)
+])
+def test_resolution_cache_raises_on_invalid_budget(graph, kwargs):
+    """
+    Assert that :class:`~pai_lang.resolve.ResolutionCache` raises a :class:`~ValueError` for invalid budgets.
+    """
+    with pytest.raises(ValueError):
+        resolve.ResolutionCache(graph, **kwargs)
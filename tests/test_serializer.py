@@ -0,0 +1,165 @@
+"""
+    test_serializer
+    ~~~~~~~~~~~~~~~
+
+    Tests for the :mod:`~pai_lang.serializer` module.
+"""
+
+import io
+import random
+
+import pytest
+
+from pai_lang import parser, serializer, stream, syntax
+
+
+ITEMS = [
+    'user:email:foo@bar.com',
+    'workspace:any:user:email:foo@bar.com',
+    'settings:any:workspace:any:user:email:foo@bar.com',
+    '"a:b":c:d',
+    'x:c:"d e"',
+    "x:y:'z # z'",
+    'x:c:a"b',
+    'a:b:c d'
+]
+
+UNWRITABLE = [
+    [('a', 'b', 'c:d')],
+    [('a', 'b', '')],
+    [('a', 'b', None)],
+    [('a', 'b', 'c'), ('', 'e', None)],
+    [('a', 'b', '#c')],
+    [('a', 'b', '"c')],
+    [('a', 'b', 1)]
+]
+
+
+@pytest.mark.parametrize('data', ITEMS)
+def test_dumps_round_trips_parse(data):
+    """
+    Assert that :func:`~pai_lang.serializer.dumps` writes the string parsed by :func:`~pai_lang.parser.parse`.
+    """
+    assert serializer.dumps(parser.parse(data)) == data
+
+
+def test_dumps_drops_empty_tokens():
+    """
+    Assert that :func:`~pai_lang.serializer.dumps` writes the canonical form of strings with empty tokens.
+    """
+    assert serializer.dumps(parser.parse('a::b:::c')) == 'a:b:c'
+    assert serializer.dumps(parser.parse('')) == ''
+
+
+@pytest.mark.parametrize('cls', [syntax.Node, syntax.AcyclicNode, syntax.ChainNode])
+def test_dumps_walks_linked_nodes(cls):
+    """
+    Assert that :func:`~pai_lang.serializer.dumps` writes the whole chain given any of its linked nodes.
+    """
+    data = 'settings:any:workspace:any:user:email:foo@bar.com'
+    nodes = parser.parse(data, cls)
+    assert [serializer.dumps(node) for node in nodes] == [data] * len(nodes)
+    assert serializer.dumps(syntax.freeze(nodes)[1]) == data
+    assert serializer.dumps(parser.parse_chain(data)[1]) == data
+
+    leaf = syntax.child('workspace', 'any', syntax.root('user', 'email', 'foo@bar.com'))
+    assert serializer.dumps(leaf) == 'workspace:any:user:email:foo@bar.com'
+
+
+def test_dumps_rejects_unlinked_nodes():
+    """
+    Assert that :func:`~pai_lang.serializer.dumps` raises a :class:`~ValueError` for nodes without a root.
+    """
+    with pytest.raises(ValueError):
+        serializer.dumps(syntax.Node('user', 'email', 'foo@bar.com'))
+
+
+@pytest.mark.parametrize('chain', UNWRITABLE)
+def test_dumps_rejects_values_that_do_not_round_trip(chain):
+    """
+    Assert that :func:`~pai_lang.serializer.dumps` raises a :class:`~ValueError` instead of writing a string that
+    parses into different values.
+    """
+    with pytest.raises(ValueError):
+        serializer.dumps(chain)
+
+
+@pytest.mark.parametrize('dialect', [syntax.Dialect('/', rtl=False), syntax.Dialect('::'), syntax.Dialect('#')])
+def test_dumps_round_trips_dialects(dialect):
+    """
+    Assert that :func:`~pai_lang.serializer.dumps` writes strings parsed by a :class:`~pai_lang.parser.Parser` of the
+    same dialect.
+    """
+    chain = parser.parse('settings:any:workspace:any:user:email:foo@bar.com')
+    data = serializer.dumps(chain, dialect)
+    assert syntax.pack(parser.Parser(dialect).parse(data)) == syntax.pack(chain)
+
+    with pytest.raises(ValueError):
+        serializer.dumps([('a', 'b', 'c' + dialect.delimiter)], dialect)
+
+
+def test_dumps_round_trips_random_values():
+    """
+    Assert that every chain of random values either round trips or is rejected.
+    """
+    rng = random.Random(0)
+    alphabet = 'ab :#"\' '
+    for _ in range(2000):
+        values = [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 4))) for _ in range(5)]
+        chain = [(values[0], values[1], values[2]), (values[3], values[4], None)]
+        try:
+            data = serializer.dumps(chain)
+        except ValueError:
+            continue
+        assert syntax.pack(parser.parse(data)) == tuple(chain)
+
+
+def test_dumps_rejects_invalid_dialect():
+    """
+    Assert that :func:`~pai_lang.serializer.dumps` raises a :class:`~ValueError` for values that are not dialects.
+    """
+    with pytest.raises(ValueError):
+        serializer.dumps(parser.parse('a:b:c'), '/')
+
+
+@pytest.mark.parametrize('mode', ['path', 'binary', 'text'])
+@pytest.mark.parametrize('chunksize', [1, 3, 1024])
+def test_dump_many_round_trips_parse_file(mode, chunksize, tmpdir):
+    """
+    Assert that :func:`~pai_lang.serializer.dump_many` writes a file read back by
+    :func:`~pai_lang.stream.parse_file`.
+    """
+    chains = [parser.parse(data) for data in ITEMS]
+    path = str(tmpdir.join('expressions.txt'))
+
+    if mode == 'path':
+        count = serializer.dump_many(iter(chains), path, chunksize=chunksize)
+    else:
+        with open(path, 'wb' if mode == 'binary' else 'w') as f:
+            count = serializer.dump_many(iter(chains), f, chunksize=chunksize)
+
+    assert count == len(chains)
+    with open(path) as f:
+        assert f.read() == ''.join(data + '\n' for data in ITEMS)
+    assert [syntax.pack(nodes) for nodes in stream.parse_file(path)] == [syntax.pack(nodes) for nodes in chains]
+
+
+@pytest.mark.parametrize('chain', [[], [('a', 'b', 'c\nd')], [('a', 'b', 'c\r')]])
+def test_dump_many_rejects_chains_that_are_not_a_single_line(chain):
+    """
+    Assert that :func:`~pai_lang.serializer.dump_many` raises a :class:`~ValueError` reporting the index of chains
+    that would not be read back as a single line.
+    """
+    file = io.StringIO()
+    with pytest.raises(ValueError) as exc:
+        serializer.dump_many([[('a', 'b', 'c')], chain], file, chunksize=1)
+    assert 'chain 1 ' in str(exc.value)
+    assert file.getvalue() == 'a:b:c\n'
+
+
+def test_dump_many_rejects_invalid_chunksize():
+    """
+    Assert that :func:`~pai_lang.serializer.dump_many` raises a :class:`~ValueError` for a chunksize below one.
+    """
+    with pytest.raises(ValueError):
+        serializer.dump_many([], io.StringIO(), chunksize=0)
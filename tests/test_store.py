@@ -0,0 +1,113 @@
+"""
+    test_store
+    ~~~~~~~~~~
+
+    Tests for the :mod:`~pai_lang.store` module.
+"""
+
+import pytest
+
+from pai_lang import parser, store, syntax
+
+
+@pytest.fixture(scope='module')
+def expressions():
+    """
+    Fixture that yields a list of data strings with repeated values and varying depths.
+    """
+    return [
+        'user:email:foo@bar.com',
+        'workspace:any:user:email:foo@bar.com',
+        'settings:any:workspace:any:user:email:baz@bar.com'
+    ]
+
+
+@pytest.fixture(scope='function')
+def chain_store(expressions):
+    """
+    Fixture that yields a :class:`~pai_lang.store.ChainStore` populated from :func:`~pai_lang.parser.parse_many`.
+    """
+    return store.ChainStore(parser.parse_many(expressions))
+
+
+def test_chain_store_holds_one_entry_per_chain(chain_store, expressions):
+    """
+    Assert that :class:`~pai_lang.store.ChainStore` holds one chain per parsed data string.
+    """
+    assert len(chain_store) == len(expressions)
+    assert len(chain_store.nodes) == 6
+
+
+def test_chain_store_interns_strings(chain_store):
+    """
+    Assert that :class:`~pai_lang.store.ChainStore` stores each distinct string once.
+    """
+    assert chain_store.strings.count('user') == 1
+    assert chain_store.strings.count('any') == 1
+
+
+def test_chain_store_packed_matches_parse(chain_store, expressions):
+    """
+    Assert that :meth:`~pai_lang.store.ChainStore.packed` returns the same values as :func:`~pai_lang.syntax.pack`.
+    """
+    for index, data in enumerate(expressions):
+        assert chain_store.packed(index) == syntax.pack(parser.parse(data))
+
+
+def test_chain_store_views_behave_like_nodes(chain_store, expressions):
+    """
+    Assert that :class:`~pai_lang.store.NodeView` instances expose the same values and links as parsed nodes.
+    """
+    for views, data in zip(chain_store, expressions):
+        nodes = parser.parse(data)
+        assert len(views) == len(nodes)
+        for view, node in zip(views, nodes):
+            assert (view.node, view.edge, view.property) == (node.node, node.edge, node.property)
+            assert view.is_root is node.is_root
+            assert view.is_child is node.is_child
+        assert views[0].parent is syntax.ROOT_SENTINEL
+        assert views[-1].child is None
+        for parent, child in zip(views, views[1:]):
+            assert parent.child.index == child.index
+            assert child.parent.index == parent.index
+
+
+def test_chain_store_supports_negative_index(chain_store):
+    """
+    Assert that :class:`~pai_lang.store.ChainStore` supports indexing chains from the end.
+    """
+    assert chain_store[-1][-1].node == 'settings'
+
+
+def test_chain_store_raises_on_index_out_of_range(chain_store):
+    """
+    Assert that :class:`~pai_lang.store.ChainStore` raises an :class:`~IndexError` for an unknown chain.
+    """
+    with pytest.raises(IndexError):
+        chain_store[len(chain_store)]
+
+
+def test_chain_store_append_accepts_packed_chains(chain_store):
+    """
+    Assert that :meth:`~pai_lang.store.ChainStore.append` accepts chains created by :func:`~pai_lang.syntax.pack`.
+    """
+    packed = syntax.pack(parser.parse('workspace:any:user:email:x'))
+    index = chain_store.append(packed)
+    assert chain_store.packed(index) == packed
+
+
+def test_chain_store_append_raises_on_empty_chain(chain_store):
+    """
+    Assert that :meth:`~pai_lang.store.ChainStore.append` raises a :class:`~ValueError` for an empty chain.
+    """
+    with pytest.raises(ValueError):
+        chain_store.append([])
+
+
+def test_chain_store_extend_skips_empty_chains():
+    """
+    Assert that :meth:`~pai_lang.store.ChainStore.extend` skips the empty chains created for empty strings.
+    """
+    chains = store.ChainStore(parser.parse_many(['a:b:c', '', 'd:e:f']))
+    assert len(chains) == 2
+    assert chains.packed(1) == syntax.pack(parser.parse('d:e:f'))
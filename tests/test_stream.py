@@ -0,0 +1,185 @@
+"""
+    test_stream
+    ~~~~~~~~~~~
+
+    Tests for the :mod:`~pai_lang.stream` module.
+"""
+
+import io
+
+import pytest
+
+from pai_lang import parser, stream, syntax
+
+
+LINES = [
+    'user:email:foo@bar.com',
+    'workspace:any:user:email:foo@bar.com',
+    '',
+    'a:b',
+    'settings:any:workspace:any:user:email:baz@bar.com'
+]
+
+
+@pytest.fixture(scope='module', params=['\n', '\r\n'])
+def file_bytes(request):
+    """
+    Fixture that yields the encoded contents of a newline-delimited file, using both newline conventions.
+    """
+    return request.param.join(LINES).encode('utf-8')
+
+
+@pytest.fixture(scope='function', params=['path', 'binary', 'text', 'bytesio'])
+def file_source(request, file_bytes, tmpdir):
+    """
+    Fixture that yields the same contents as a path, binary and text file objects and an in-memory stream.
+    """
+    path = tmpdir.join('expressions.txt')
+    path.write_binary(file_bytes)
+
+    if request.param == 'path':
+        yield str(path)
+    elif request.param == 'bytesio':
+        yield io.BytesIO(file_bytes)
+    elif request.param == 'binary':
+        with open(str(path), 'rb') as f:
+            yield f
+    else:
+        with open(str(path), 'r', newline='') as f:
+            yield f
+
+
+def expected_packed():
+    """
+    Return the packed chains of all valid lines in :data:`LINES`.
+    """
+    return [syntax.pack(parser.parse(line)) for line in LINES if line and line != 'a:b']
+
+
+def test_parse_file_yields_chains_per_line(file_source):
+    """
+    Assert that :func:`~pai_lang.stream.parse_file` yields a chain per non-empty line.
+    """
+    results = stream.parse_file(file_source, errors=parser.ERRORS_SKIP, chunksize=2)
+    assert [syntax.pack(nodes) for nodes in results] == expected_packed()
+
+
+def test_parse_file_raises_with_line_number_and_offset(file_source, file_bytes):
+    """
+    Assert that :func:`~pai_lang.stream.parse_file` raises a :class:`~pai_lang.stream.StreamSyntaxError` with the
+    line number and offset of the malformed line.
+    """
+    with pytest.raises(stream.StreamSyntaxError) as e:
+        list(stream.parse_file(file_source))
+    assert isinstance(e.value, syntax.SyntaxError)
+    assert e.value.lineno == 4
+    assert e.value.offset == file_bytes.index(b'a:b')
+
+
+def test_parse_file_yields_errors_in_place(file_source):
+    """
+    Assert that :func:`~pai_lang.stream.parse_file` yields errors in place of malformed lines using the "yield"
+    policy.
+    """
+    results = list(stream.parse_file(file_source, errors=parser.ERRORS_YIELD))
+    assert len(results) == 4
+    assert isinstance(results[2], stream.StreamSyntaxError)
+
+
+def test_parse_file_applies_limits(file_source):
+    """
+    Assert that :func:`~pai_lang.stream.parse_file` reports lines that exceed the limits as a
+    :class:`~pai_lang.stream.StreamLimitExceeded`.
+    """
+    results = list(stream.parse_file(file_source, errors=parser.ERRORS_YIELD, limits=syntax.Limits(max_hops=2)))
+    assert len(results) == 4
+    assert isinstance(results[3], stream.StreamLimitExceeded)
+    assert isinstance(results[3], syntax.LimitExceeded)
+    assert results[3].lineno == 5
+    assert not isinstance(results[2], syntax.LimitExceeded)
+
+
+def test_parse_file_yields_nothing_for_empty_file(tmpdir):
+    """
+    Assert that :func:`~pai_lang.stream.parse_file` yields nothing for an empty file.
+    """
+    path = tmpdir.join('empty.txt')
+    path.write_binary(b'')
+    assert list(stream.parse_file(str(path))) == []
+
+
+def test_parse_file_reads_text_stream():
+    """
+    Assert that :func:`~pai_lang.stream.parse_file` reads streams that only yield text lines.
+    """
+    results = list(stream.parse_file(io.StringIO('a:b:c\nw:x:a:b:c\n')))
+    assert [len(nodes) for nodes in results] == [1, 2]
+
+
+@pytest.mark.parametrize('max_length', [1, 2, 21, 22, 36, 49, 50])
+def test_parse_file_rejects_lines_longer_than_max_length(file_source, file_bytes, max_length):
+    """
+    Assert that :func:`~pai_lang.stream.parse_file` reports each line longer than `max_length` as a
+    :class:`~pai_lang.stream.StreamLimitExceeded` with its line number, offset and length, and parses the lines
+    that follow it.
+    """
+    limits = syntax.Limits(max_length=max_length)
+    results = list(stream.parse_file(file_source, errors=parser.ERRORS_YIELD, limits=limits))
+
+    lines = [(lineno, line) for lineno, line in enumerate(LINES, 1) if line]
+    assert len(results) == len(lines)
+    for (lineno, line), result in zip(lines, results):
+        if len(line) > max_length:
+            assert isinstance(result, stream.StreamLimitExceeded)
+            assert result.lineno == lineno
+            assert result.offset == file_bytes.index(line.encode('utf-8'))
+            assert str(len(line)) in str(result)
+        elif line == 'a:b':
+            assert isinstance(result, stream.StreamSyntaxError)
+        else:
+            assert syntax.pack(result) == syntax.pack(parser.parse(line))
+
+
+def test_parse_file_rejects_long_lines_without_reading_them_whole():
+    """
+    Assert that :func:`~pai_lang.stream.parse_file` reads no more than a buffer of a line longer than `max_length`
+    at a time.
+    """
+    class Source(io.BytesIO):
+        def readline(self, size=-1):
+            assert 0 < size <= io.DEFAULT_BUFFER_SIZE
+            return super().readline(size)
+
+    data = b'a:b:c\n' + b'x' * (10 * io.DEFAULT_BUFFER_SIZE) + b'\r\nw:x:a:b:c\n'
+    results = list(stream.parse_file(Source(data), errors=parser.ERRORS_YIELD, limits=syntax.Limits(max_length=10)))
+    assert len(results) == 3
+    assert isinstance(results[1], stream.StreamLimitExceeded)
+    assert (results[1].lineno, results[1].offset) == (2, 6)
+    assert str(10 * io.DEFAULT_BUFFER_SIZE) in str(results[1])
+    assert [len(results[0]), len(results[2])] == [1, 2]
+
+
+@pytest.mark.parametrize('source', ['path', 'bytesio'])
+@pytest.mark.parametrize('limits', [None, syntax.Limits(max_length=64)])
+def test_parse_file_reports_lines_that_cannot_be_decoded_or_tokenized(tmpdir, source, limits):
+    """
+    Assert that :func:`~pai_lang.stream.parse_file` reports lines that are not valid in the encoding, or have an
+    unclosed quote, as a :class:`~pai_lang.stream.StreamSyntaxError` handled by the `errors` policy.
+    """
+    data = b'a:b:c\nx:y:\xff\r\nw:x:a:b:c\na:b:"c\nx:y:z\n'
+    path = tmpdir.join('invalid.txt')
+    path.write_binary(data)
+
+    def parse_file(errors):
+        file = str(path) if source == 'path' else io.BytesIO(data)
+        return list(stream.parse_file(file, errors=errors, limits=limits))
+
+    assert [len(nodes) for nodes in parse_file(parser.ERRORS_SKIP)] == [1, 2, 1]
+
+    results = parse_file(parser.ERRORS_YIELD)
+    assert [(result.lineno, result.offset) for result in results[1::2]] == [(2, 6), (4, 23)]
+    assert all(isinstance(result, stream.StreamSyntaxError) for result in results[1::2])
+
+    with pytest.raises(stream.StreamSyntaxError) as e:
+        parse_file(parser.ERRORS_RAISE)
+    assert e.value.lineno == 2
@@ -5,6 +5,8 @@
     Tests for the :mod:`~pai_lang.syntax` module.
 """
 
+import pickle
+
 import pytest
 
 from pai_lang import syntax
@@ -77,3 +79,210 @@ def test_child_creates_nodes_with_links(fake_child_node, fake_root_node):
     """
     assert fake_root_node.child == fake_child_node
     assert fake_child_node.parent == fake_root_node
+
+
+@pytest.fixture(scope='function')
+def frozen_nodes(fake_child_node, fake_root_node):
+    """
+    Fixture that yields the result of :func:`~pai_lang.syntax.freeze` over a root and child node.
+    """
+    return syntax.freeze([fake_root_node, fake_child_node])
+
+
+def test_freeze_creates_linked_frozen_nodes(frozen_nodes, fake_root_node, fake_child_node):
+    """
+    Assert that :func:`~pai_lang.syntax.freeze` creates a tuple of linked :class:`~pai_lang.syntax.FrozenNode`
+    instances with the same values as the source nodes.
+    """
+    root, child = frozen_nodes
+    assert isinstance(frozen_nodes, tuple)
+    assert is_root_node(root)
+    assert is_child_node(child)
+    assert root.child is child
+    assert child.parent is root
+    assert child.child is None
+    assert (root.node, root.edge, root.property) == (fake_root_node.node, fake_root_node.edge,
+                                                     fake_root_node.property)
+    assert (child.node, child.edge, child.property) == (fake_child_node.node, fake_child_node.edge, None)
+
+
+def test_freeze_returns_frozen_chain_unmodified(frozen_nodes):
+    """
+    Assert that :func:`~pai_lang.syntax.freeze` returns an already frozen chain as-is.
+    """
+    assert syntax.freeze(frozen_nodes) is frozen_nodes
+
+
+def test_frozen_node_is_immutable(frozen_nodes):
+    """
+    Assert that :class:`~pai_lang.syntax.FrozenNode` instances cannot be modified.
+    """
+    root, child = frozen_nodes
+    with pytest.raises(AttributeError):
+        root.node = 'foo'
+    with pytest.raises(AttributeError):
+        del child.parent
+    assert not hasattr(root, 'link')
+
+
+def test_pack_creates_link_free_tuples(fake_child_node, fake_root_node):
+    """
+    Assert that :func:`~pai_lang.syntax.pack` creates a tuple of `(node, edge, property)` tuples, root first.
+    """
+    packed = syntax.pack([fake_root_node, fake_child_node])
+    assert packed == ((fake_root_node.node, fake_root_node.edge, fake_root_node.property),
+                      (fake_child_node.node, fake_child_node.edge, None))
+
+
+def test_unpack_creates_linked_nodes(fake_child_node, fake_root_node):
+    """
+    Assert that :func:`~pai_lang.syntax.unpack` reverses :func:`~pai_lang.syntax.pack` and links the nodes.
+    """
+    root, child = syntax.unpack(syntax.pack([fake_root_node, fake_child_node]))
+    assert is_root_node(root)
+    assert is_child_node(child)
+    assert root.child is child
+    assert child.parent is root
+
+
+def test_frozen_nodes_compare_structurally(fake_child_node, fake_root_node):
+    """
+    Assert that :class:`~pai_lang.syntax.FrozenNode` instances with equal values and parents are equal and hash the
+    same.
+    """
+    first = syntax.freeze([fake_root_node, fake_child_node])
+    second = syntax.freeze(syntax.pack([fake_root_node, fake_child_node]))
+    assert first == second
+    assert hash(first) == hash(second)
+    assert len({first, second}) == 1
+
+
+def test_frozen_nodes_with_different_parents_are_not_equal(fake_child_node_input):
+    """
+    Assert that :class:`~pai_lang.syntax.FrozenNode` instances with equal values but different parents are not equal.
+    """
+    first = syntax.freeze([('a', 'b', 'c'), fake_child_node_input + (None,)])
+    second = syntax.freeze([('a', 'b', 'd'), fake_child_node_input + (None,)])
+    assert first[1] != second[1]
+    assert first[0] != second[0]
+
+
+def test_acyclic_child_creates_weak_child_link(fake_child_node_input, fake_root_node_input):
+    """
+    Assert that :func:`~pai_lang.syntax.child` with :class:`~pai_lang.syntax.AcyclicNode` links the parent to the
+    child without keeping it alive.
+    """
+    root = syntax.root(*fake_root_node_input, cls=syntax.AcyclicNode)
+    child = syntax.child(*fake_child_node_input, parent=root, cls=syntax.AcyclicNode)
+    assert is_root_node(root)
+    assert is_child_node(child)
+    assert root.child is child
+    assert child.parent is root
+    del child
+    assert root.child is None
+
+
+def test_acyclic_chain_is_freed_without_garbage_collector(fake_child_node_input, fake_root_node_input):
+    """
+    Assert that a chain of :class:`~pai_lang.syntax.AcyclicNode` instances is freed by reference counting alone.
+    """
+    import gc
+    import weakref
+
+    gc.disable()
+    try:
+        root = syntax.root(*fake_root_node_input, cls=syntax.AcyclicNode)
+        child = syntax.child(*fake_child_node_input, parent=root, cls=syntax.AcyclicNode)
+        ref = weakref.ref(root)
+        del root, child
+        assert ref() is None
+    finally:
+        gc.enable()
+
+
+def test_dialect_defaults_to_module_settings():
+    """
+    Assert that :class:`~pai_lang.syntax.Dialect` defaults to the module level delimiter and direction.
+    """
+    assert syntax.Dialect() == syntax.DEFAULT_DIALECT == (syntax.DELIMITER, syntax.RTL)
+    assert syntax.Dialect('::', False) == ('::', False)
+
+
+@pytest.mark.parametrize('delimiter, rtl', [
+    ('', True),
+    (b':', True),
+    (':', 1)
+])
+def test_dialect_raises_on_invalid_settings(delimiter, rtl):
+    """
+    Assert that :class:`~pai_lang.syntax.Dialect` raises a :class:`~ValueError` for invalid settings.
+    """
+    with pytest.raises(ValueError):
+        syntax.Dialect(delimiter, rtl)
+
+
+def test_chain_links_chain_nodes(fake_child_node_input, fake_root_node_input):
+    """
+    Assert that :class:`~pai_lang.syntax.Chain` gives O(1) access to its nodes and sets the chain and position of
+    each :class:`~pai_lang.syntax.ChainNode`.
+    """
+    root = syntax.root(*fake_root_node_input, cls=syntax.ChainNode)
+    child = syntax.child(*fake_child_node_input, parent=root, cls=syntax.ChainNode)
+    assert root.chain is None and root.position is None
+
+    chain = syntax.Chain([root, child])
+    assert len(chain) == 2
+    assert chain.root is chain[0] is root
+    assert chain.leaf is chain[-1] is child
+    assert chain[1:] == (child,)
+    assert list(chain) == [root, child]
+    assert [(node.chain, node.position) for node in chain] == [(chain, 0), (chain, 1)]
+    assert child.parent is root and root.child is child
+
+
+def test_chain_holds_other_nodes_as_is(fake_child_node, fake_root_node):
+    """
+    Assert that :class:`~pai_lang.syntax.Chain` holds nodes that are not a :class:`~pai_lang.syntax.ChainNode`.
+    """
+    chain = syntax.Chain([fake_root_node, fake_child_node])
+    assert chain.root is fake_root_node
+    assert chain.leaf is fake_child_node
+    assert syntax.Chain().root is syntax.Chain().leaf is None
+
+
+def test_chain_survives_pickling(fake_child_node_input, fake_root_node_input):
+    """
+    Assert that an unpickled :class:`~pai_lang.syntax.Chain` links its nodes to itself.
+    """
+    root = syntax.root(*fake_root_node_input, cls=syntax.ChainNode)
+    chain = syntax.Chain([root, syntax.child(*fake_child_node_input, parent=root, cls=syntax.ChainNode)])
+
+    copy = pickle.loads(pickle.dumps(chain))
+    assert type(copy) is syntax.Chain
+    assert syntax.pack(copy) == syntax.pack(chain)
+    assert [(node.chain, node.position) for node in copy] == [(copy, 0), (copy, 1)]
+    assert copy[1].parent is copy[0] and copy[0].child is copy[1]
+
+
+def test_limits_default_to_no_limits():
+    """
+    Assert that :class:`~pai_lang.syntax.Limits` disables every limit by default.
+    """
+    assert syntax.Limits() == (None, None, None)
+    assert syntax.Limits(max_hops=4) == (None, 4, None)
+    assert issubclass(syntax.LimitExceeded, syntax.SyntaxError)
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'max_length': 0},
+    {'max_hops': -1},
+    {'max_token_length': 1.5},
+    {'max_length': True}
+])
+def test_limits_raise_on_invalid_settings(kwargs):
+    """
+    Assert that :class:`~pai_lang.syntax.Limits` raises a :class:`~ValueError` for values that are not positive
+    ints.
+    """
+    with pytest.raises(ValueError):
+        syntax.Limits(**kwargs)
@@ -0,0 +1,166 @@
+"""
+    test_vectorized
+    ~~~~~~~~~~~~~~~
+
+    Tests for the :mod:`~pai_lang.vectorized` module.
+"""
+
+import pytest
+
+from pai_lang import parser, store, syntax, vectorized
+
+
+ITEMS = [
+    '',
+    ':',
+    'a:b:c',
+    ':a:b:c:',
+    'a::b:::c',
+    'workspace:any:user:email:foo@bar.com',
+    'settings:any:workspace:any:user:email:foo@bar.com',
+    'with space:edge\n:prop\t',
+    '"a:b":c:d',
+    'user:émail:foo@bär.com',
+    'user:email:\udcff',
+    b'x:y:z'
+]
+
+MALFORMED_ITEMS = ['a', 'a:b', 'x:a:b:c', 'v:w:x:y:z:a:b:c']
+
+
+def expected_packed(items):
+    """
+    Pack the non-empty chains parsed one at a time from the given items.
+    """
+    return [syntax.pack(nodes) for nodes in parser.parse_many(items, errors=parser.ERRORS_SKIP) if nodes]
+
+
+def stored_packed(chain_store):
+    """
+    Pack every chain of the given store.
+    """
+    return [chain_store.packed(i) for i in range(len(chain_store))]
+
+
+@pytest.fixture(scope='function', params=[True, False])
+def has_numpy(request, mocker):
+    """
+    Fixture that runs a test with NumPy, when installed, and without it.
+    """
+    if request.param:
+        pytest.importorskip('numpy')
+    else:
+        mocker.patch.object(vectorized, 'numpy', None)
+    return request.param
+
+
+def test_extend_store_matches_parse_many(has_numpy):
+    """
+    Assert that :func:`~pai_lang.vectorized.extend_store` stores the same chains as
+    :func:`~pai_lang.parser.parse_many`, in order.
+    """
+    chain_store = store.ChainStore([parser.parse('p:q:r')])
+    assert vectorized.extend_store(chain_store, ITEMS) == len(expected_packed(ITEMS))
+    assert stored_packed(chain_store) == expected_packed(['p:q:r'] + ITEMS)
+    assert chain_store.chain(-1)[0].parent is syntax.ROOT_SENTINEL
+
+
+def test_extend_store_skips_malformed_items(has_numpy):
+    """
+    Assert that :func:`~pai_lang.vectorized.extend_store` skips malformed items with the "skip" policy.
+    """
+    items = ITEMS + MALFORMED_ITEMS + ITEMS
+    chain_store = store.ChainStore()
+    vectorized.extend_store(chain_store, items, errors=parser.ERRORS_SKIP)
+    assert stored_packed(chain_store) == expected_packed(items)
+    assert 'v' not in chain_store.string_ids
+
+
+@pytest.mark.parametrize('malformed', MALFORMED_ITEMS)
+def test_extend_store_raises_on_malformed_item(has_numpy, malformed):
+    """
+    Assert that :func:`~pai_lang.vectorized.extend_store` raises the same error as :func:`~pai_lang.parser.parse`.
+    """
+    with pytest.raises(syntax.SyntaxError) as parse_error:
+        parser.parse(malformed)
+    with pytest.raises(syntax.SyntaxError) as store_error:
+        vectorized.extend_store(store.ChainStore(), ['a:b:c', malformed])
+    assert str(store_error.value) == str(parse_error.value)
+
+
+@pytest.mark.parametrize('batchsize', [1, 2, 5, 64])
+def test_extend_store_keeps_chains_before_malformed_item(has_numpy, batchsize):
+    """
+    Assert that :func:`~pai_lang.vectorized.extend_store` stores every chain before a malformed item, regardless of
+    `batchsize`, when it raises.
+    """
+    valid = ITEMS + ['a:b:c', '', 'w:any:a:b:c']
+    chain_store = store.ChainStore()
+    with pytest.raises(syntax.SyntaxError):
+        vectorized.extend_store(chain_store, valid + ['x:a:b:c', 'p:q:r'], batchsize=batchsize)
+    assert stored_packed(chain_store) == expected_packed(valid)
+
+
+@pytest.mark.parametrize('batchsize', [1, 2, 5])
+def test_extend_store_tokenizes_in_batches(has_numpy, batchsize, mocker):
+    """
+    Assert that :func:`~pai_lang.vectorized.extend_store` tokenizes at most `batchsize` data strings at once and
+    stores the same chains as :func:`~pai_lang.parser.parse_many`.
+    """
+    items = ITEMS * 3
+    if has_numpy:
+        tokenize_batch = mocker.spy(vectorized, 'tokenize_batch')
+    chain_store = store.ChainStore()
+    vectorized.extend_store(chain_store, iter(items), batchsize=batchsize)
+    assert stored_packed(chain_store) == expected_packed(items)
+    if has_numpy:
+        assert max(len(call.args[0]) for call in tokenize_batch.call_args_list) <= batchsize
+
+
+def test_extend_store_applies_limits(has_numpy):
+    """
+    Assert that :func:`~pai_lang.vectorized.extend_store` handles data strings that exceed the limits with the
+    `errors` policy, like :func:`~pai_lang.parser.parse_many`.
+    """
+    limits = syntax.Limits(max_length=40, max_hops=2)
+    items = ['a:b:c', 'w:any:a:b:c', 'x:any:w:any:a:b:c', 'a:b:' + 'c' * 64, '"a":b:c']
+    chain_store = store.ChainStore()
+    assert vectorized.extend_store(chain_store, items, errors=parser.ERRORS_SKIP, limits=limits) == 3
+    assert stored_packed(chain_store) == expected_packed(['a:b:c', 'w:any:a:b:c', '"a":b:c'])
+
+    chain_store = store.ChainStore()
+    with pytest.raises(syntax.LimitExceeded):
+        vectorized.extend_store(chain_store, items, limits=limits)
+    assert stored_packed(chain_store) == expected_packed(items[:2])
+
+
+def test_extend_store_raises_on_unknown_error_policy():
+    """
+    Assert that :func:`~pai_lang.vectorized.extend_store` raises a :class:`~ValueError` for an unknown policy.
+    """
+    with pytest.raises(ValueError):
+        vectorized.extend_store(store.ChainStore(), [], errors=parser.ERRORS_YIELD)
+
+
+def test_tokenize_batch_counts_and_validates_tokens():
+    """
+    Assert that :func:`~pai_lang.vectorized.tokenize_batch` finds the tokens of each data string.
+    """
+    pytest.importorskip('numpy')
+    texts = ['', 'a::b:c', 'x:a:b:c', 'bé:x:a:b:c:', '"ab"']
+    tokens = vectorized.tokenize_batch(texts)
+    assert tokens.counts.tolist() == [0, 3, 4, 5, 1]
+    assert tokens.offsets.tolist() == [0, 0, 3, 7, 12, 13]
+    assert tokens.expected.tolist() == [0, 0, 2, 0, 3]
+    assert tokens.special.tolist() == [False, False, False, False, True]
+    values = [tokens.source[s:e] for s, e in zip(tokens.starts.tolist(), tokens.ends.tolist())]
+    assert values == ['a', 'b', 'c', 'x', 'a', 'b', 'c', 'bé', 'x', 'a', 'b', 'c', '"ab"']
+
+
+def test_tokenize_batch_requires_numpy(mocker):
+    """
+    Assert that :func:`~pai_lang.vectorized.tokenize_batch` raises a :class:`~RuntimeError` without NumPy.
+    """
+    mocker.patch.object(vectorized, 'numpy', None)
+    with pytest.raises(RuntimeError):
+        vectorized.tokenize_batch(['a:b:c'])
@@ -202,3 +202,54 @@ def test_visit_returns_none_child_node_on_empty_tokens_iterable(valid_visit_root
     """
     root = visitor.visit(*valid_visit_root_node_params, parent=None)
     assert visitor.visit(*empty_tokens_visit_params, parent=root) is None
+
+
+def test_visit_root_interns_node_and_edge_values(fake_root_node_input, mocker):
+    """
+    Assert that :func:`~pai_lang.visitor.visit_root` passes the "node" and "edge" values through `intern`.
+    """
+    intern = mocker.Mock(side_effect=lambda value: value)
+    root = visitor.visit_root(reversed(fake_root_node_input), intern=intern)
+    node, edge, _ = fake_root_node_input
+    assert root.node == node
+    intern.assert_has_calls([mocker.call(node), mocker.call(edge)])
+    assert intern.call_count == 2
+
+
+def test_visitor_calls_given_stage_functions(mocker):
+    """
+    Assert that :class:`~pai_lang.visitor.Visitor` creates the same nodes as :func:`~pai_lang.visitor.visit`
+    through the functions it was given.
+    """
+    visit_node = mocker.Mock(side_effect=visitor.visit_node)
+    root = mocker.Mock(side_effect=syntax.root)
+    child = mocker.Mock(side_effect=syntax.child)
+    hooked = visitor.Visitor(visit_node=visit_node, root=root, child=child)
+    assert hooked.supports(syntax.GROUP_SIZE, syntax.RTL)
+
+    tokens = reversed('x:any:a:b:c'.split(':'))
+    parent = hooked.visit(tokens, syntax.GROUP_SIZE, syntax.RTL)
+    node = hooked.visit(tokens, syntax.GROUP_SIZE, syntax.RTL, parent)
+    assert hooked.visit(tokens, syntax.GROUP_SIZE, syntax.RTL, node) is None
+    assert (parent.node, parent.edge, parent.property) == ('a', 'b', 'c')
+    assert (node.node, node.edge, node.parent) == ('x', 'any', parent)
+    assert visit_node.call_count == 3
+    assert root.call_count == child.call_count == 1
+
+
+@pytest.mark.parametrize('count', range(12))
+def test_check_token_count_matches_visit(count):
+    """
+    Assert that :func:`~pai_lang.visitor.check_token_count` reports the same outcome as visiting the tokens.
+    """
+    tokens = iter([str(i) for i in range(count)])
+    consumed, expected = 0, 0
+    try:
+        node = visitor.visit(tokens, syntax.GROUP_SIZE, syntax.RTL)
+        while node:
+            consumed += syntax.ROOT_NODE_SIZE if node.is_root else syntax.CHILD_NODE_SIZE
+            node = visitor.visit(tokens, syntax.GROUP_SIZE, syntax.RTL, node)
+    except syntax.SyntaxError as e:
+        expected = int(str(e).rsplit(' ', 1)[-1])
+
+    assert visitor.check_token_count(count) == (expected, consumed if expected else count)